@@ -1,60 +1,190 @@
-from typing import Dict, Optional
+import os
+import re
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Optional
 from enum import Enum
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlsplit, urlunsplit
 
 class AffiliateProvider(Enum):
     BOOKING = "booking"
     GETYOURGUIDE = "getyourguide"
     VIATOR = "viator"
 
+# Provider by registered domain; subdomains (www., m., de.) match too
+PROVIDER_DOMAINS = {
+    "booking.com": AffiliateProvider.BOOKING,
+    "getyourguide.com": AffiliateProvider.GETYOURGUIDE,
+    "viator.com": AffiliateProvider.VIATOR
+}
+
+# One pass over the HTML finds every provider URL
+PROVIDER_URL = re.compile(
+    r"https?://(?:[\w-]+\.)*(booking\.com|getyourguide\.com|viator\.com)"
+    r"(?=[/?#:\"'\s<>]|[.,;!?)]+(?:[\s\"'<>]|$)|$)[^\s\"'<>]*",
+    re.IGNORECASE
+)
+
+# Sentence punctuation that ends a bare URL in text rather than belonging to it
+TRAILING_PUNCTUATION = ".,;:!?)"
+
+class LinkTemplate:
+    """Precompiled tracking rules for one provider"""
+
+    def __init__(self, provider: AffiliateProvider, base_url: str, param: str, tracking_id: str, search: str,
+                 subid: str):
+        self.provider = provider
+        self.base_url = base_url
+        self.param = param
+        self.tracking_id = tracking_id
+        self.tracking = f"{param}={quote_plus(tracking_id)}"
+        # Home page link with tracking, and the prefix of a free-text search link
+        self.home = f"{base_url}{'?' if urlsplit(base_url).path else '/?'}{self.tracking}"
+        self.search = search
+        # Per-click reference the provider echoes back in its conversion reports
+        self.subid = subid
+        self._existing = re.compile(rf"(?:^|&){re.escape(param)}=[^&]*")
+
+    def tag(self, url: str) -> str:
+        """Set our tracking id on a provider URL, replacing any other"""
+        scheme, netloc, path, query, fragment = urlsplit(url)
+        query = self._existing.sub("", query).lstrip("&")
+        query = f"{query}&{self.tracking}" if query else self.tracking
+        return urlunsplit((scheme or "https", netloc, path or "/", query, fragment))
+
+    def search_link(self, text: str) -> str:
+        return f"{self.search}{quote_plus(text)}&{self.tracking}"
+
+    def with_click(self, url: str, click_id: str) -> str:
+        """Append a click reference to an already tracked link"""
+        return f"{url}{'&' if '?' in url else '?'}{self.subid}={click_id}"
+
+def link_id(url: str) -> str:
+    """Short stable id for a link, used in /go/ redirect paths"""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+
 class AffiliateService:
-    def __init__(self):
+    def __init__(self, cache_size: int = None):
         # Affiliate IDs
         self.affiliate_ids = {
             AffiliateProvider.BOOKING: "7777439",
             AffiliateProvider.GETYOURGUIDE: "OYSNX2E",
             AffiliateProvider.VIATOR: "P00275646"
         }
-        
+
         # Base URLs for each provider
         self.base_urls = {
             AffiliateProvider.BOOKING: "https://www.booking.com/index.html",
             AffiliateProvider.GETYOURGUIDE: "https://www.getyourguide.com",
             AffiliateProvider.VIATOR: "https://www.viator.com"
         }
-    
+
+        self.templates = {
+            AffiliateProvider.BOOKING: LinkTemplate(
+                AffiliateProvider.BOOKING, self.base_urls[AffiliateProvider.BOOKING],
+                "aid", self.affiliate_ids[AffiliateProvider.BOOKING],
+                "https://www.booking.com/searchresults.html?ss=", "label"
+            ),
+            AffiliateProvider.GETYOURGUIDE: LinkTemplate(
+                AffiliateProvider.GETYOURGUIDE, self.base_urls[AffiliateProvider.GETYOURGUIDE],
+                "partner_id", self.affiliate_ids[AffiliateProvider.GETYOURGUIDE],
+                "https://www.getyourguide.com/s/?q=", "cmp"
+            ),
+            AffiliateProvider.VIATOR: LinkTemplate(
+                AffiliateProvider.VIATOR, self.base_urls[AffiliateProvider.VIATOR],
+                "pid", self.affiliate_ids[AffiliateProvider.VIATOR],
+                "https://www.viator.com/searchResults/all?text=", "mcid"
+            )
+        }
+
+        # The same hotel and tour links recur across posts
+        self.rewrite_url = lru_cache(maxsize=cache_size or int(os.getenv("AFFILIATE_LINK_CACHE_SIZE", "4096")))(
+            self._rewrite_url
+        )
+
     def generate_booking_link(self, destination: Optional[str] = None) -> str:
         """Generate a Booking.com affiliate link."""
-        params = {
-            "aid": self.affiliate_ids[AffiliateProvider.BOOKING]
-        }
+        link = self.templates[AffiliateProvider.BOOKING].home
         if destination:
-            params["city"] = destination
-            
-        return f"{self.base_urls[AffiliateProvider.BOOKING]}?{urlencode(params)}"
-    
+            return f"{link}&city={quote_plus(destination)}"
+        return link
+
     def generate_getyourguide_link(self, activity_id: Optional[str] = None) -> str:
         """Generate a GetYourGuide affiliate link."""
-        partner_id = self.affiliate_ids[AffiliateProvider.GETYOURGUIDE]
-        base = f"{self.base_urls[AffiliateProvider.GETYOURGUIDE]}/?partner_id={partner_id}"
-        
+        link = self.templates[AffiliateProvider.GETYOURGUIDE].home
         if activity_id:
-            return f"{base}&activity_id={activity_id}"
-        return base
-    
+            return f"{link}&activity_id={activity_id}"
+        return link
+
     def generate_viator_link(self, tour_id: Optional[str] = None) -> str:
         """Generate a Viator affiliate link."""
-        partner_id = self.affiliate_ids[AffiliateProvider.VIATOR]
-        base = f"{self.base_urls[AffiliateProvider.VIATOR]}/?pid={partner_id}"
-        
+        link = self.templates[AffiliateProvider.VIATOR].home
         if tour_id:
-            return f"{base}&tour_id={tour_id}"
-        return base
-    
+            return f"{link}&tour_id={tour_id}"
+        return link
+
     def get_tracking_code(self, provider: AffiliateProvider) -> str:
         """Get the tracking code for a specific provider."""
         return self.affiliate_ids[provider]
-    
+
     def get_all_tracking_codes(self) -> Dict[str, str]:
         """Get all affiliate tracking codes."""
         return {provider.value: self.affiliate_ids[provider] for provider in AffiliateProvider}
+
+    @staticmethod
+    def provider_for(text: str) -> Optional[AffiliateProvider]:
+        """Provider named by a URL or a platform label such as "booking.com" or "Viator"."""
+        text = (text or "").lower()
+        for domain, provider in PROVIDER_DOMAINS.items():
+            if domain.split(".")[0] in text:
+                return provider
+        return None
+
+    def _rewrite_url(self, url: str) -> str:
+        match = PROVIDER_URL.match(url)
+        if not match:
+            return url
+        provider = PROVIDER_DOMAINS[match.group(1).lower()]
+        return self.templates[provider].tag(url)
+
+    def rewrite_html(self, html: str) -> str:
+        """Tag every Booking.com, GetYourGuide and Viator URL in the HTML in one pass."""
+        if not html:
+            return html
+
+        def replace(match) -> str:
+            raw = match.group(0)
+            stripped = raw.rstrip(TRAILING_PUNCTUATION)
+            trailing = raw[len(stripped):]
+            # Attribute values escape & as &amp;; rewrite the real URL, then escape it back
+            escaped = "&amp;" in stripped
+            url = stripped.replace("&amp;", "&") if escaped else stripped
+            tagged = self.rewrite_url(url)
+            if escaped:
+                tagged = tagged.replace("&", "&amp;")
+            return tagged + trailing
+
+        return PROVIDER_URL.sub(replace, html)
+
+    def rewrite_suggestions(self, suggestions: List[Dict]) -> List[Dict]:
+        """
+        Give every generated affiliate suggestion a tracked link.
+
+        Provider URLs are tagged; links the model made up (or left out) are
+        replaced with a tracked search for the suggestion's name. Each
+        suggestion gets an `id` for its /go/ redirect.
+        """
+        rewritten = []
+        for suggestion in suggestions or []:
+            suggestion = dict(suggestion)
+            link = suggestion.get("link") or ""
+            if PROVIDER_URL.match(link):
+                suggestion["link"] = self.rewrite_url(link)
+            else:
+                provider = self.provider_for(suggestion.get("platform")) or self.provider_for(link)
+                if provider and suggestion.get("name"):
+                    suggestion["link"] = self.templates[provider].search_link(suggestion["name"])
+            if PROVIDER_URL.match(suggestion.get("link") or ""):
+                suggestion["id"] = link_id(suggestion["link"])
+            rewritten.append(suggestion)
+        return rewritten
@@ -0,0 +1,104 @@
+# ============================================================================
+# FILE: backend/services/ai_clients.py
+# ============================================================================
+"""
+Location: backend/services/ai_clients.py
+Purpose: Process-wide, lazily created async clients for the AI providers
+"""
+
+import os
+import logging
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class AIClientRegistry:
+    """
+    Holds one long-lived async client per provider.
+
+    Clients are built on first use and reused by every engine, so their
+    connection pools (and TLS sessions) survive across generations.
+    SDKs are imported only when their client is first needed.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, object] = {}
+        self._gemini_models: Dict[str, object] = {}
+        self._gemini_configured = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _http_client():
+        """Pooled keep-alive HTTP client handed to the SDKs that accept one"""
+        import httpx
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("AI_HTTP_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=int(os.getenv("AI_HTTP_MAX_KEEPALIVE", "10")),
+                keepalive_expiry=float(os.getenv("AI_HTTP_KEEPALIVE_EXPIRY", "60"))
+            ),
+            timeout=httpx.Timeout(float(os.getenv("AI_HTTP_TIMEOUT", "600")), connect=10.0)
+        )
+
+    @staticmethod
+    def _api_key(env_var: str) -> str:
+        api_key = os.getenv(env_var)
+        if not api_key:
+            raise ValueError(f"{env_var} not set in environment")
+        return api_key
+
+    def anthropic(self):
+        """Shared AsyncAnthropic client"""
+        with self._lock:
+            if "anthropic" not in self._clients:
+                import anthropic
+
+                self._clients["anthropic"] = anthropic.AsyncAnthropic(
+                    api_key=self._api_key("ANTHROPIC_API_KEY"),
+                    http_client=self._http_client()
+                )
+            return self._clients["anthropic"]
+
+    def openai(self):
+        """Shared AsyncOpenAI client"""
+        with self._lock:
+            if "openai" not in self._clients:
+                import openai
+
+                self._clients["openai"] = openai.AsyncOpenAI(
+                    api_key=self._api_key("OPENAI_API_KEY"),
+                    http_client=self._http_client()
+                )
+            return self._clients["openai"]
+
+    def gemini(self, model_name: str):
+        """Shared Gemini model; genai keeps one async gRPC channel behind all of them"""
+        with self._lock:
+            if model_name not in self._gemini_models:
+                import google.generativeai as genai
+
+                if not self._gemini_configured:
+                    genai.configure(api_key=self._api_key("GEMINI_API_KEY"))
+                    self._gemini_configured = True
+                self._gemini_models[model_name] = genai.GenerativeModel(model_name)
+            return self._gemini_models[model_name]
+
+    async def aclose(self) -> None:
+        """Close pooled connections; clients are rebuilt if used again"""
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+            self._gemini_models.clear()
+
+        for name, client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.error(f"Failed to close {name} client: {str(e)}")
+
+
+# The registry every content engine draws its clients from
+ai_clients = AIClientRegistry()
@@ -0,0 +1,221 @@
+# ============================================================================
+# FILE: backend/services/analytics_ingest.py
+# ============================================================================
+"""
+Location: backend/services/analytics_ingest.py
+Purpose: Beacon ingestion rolled up into one Analytics row per post per day
+"""
+
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, bindparam, tuple_
+
+from models import Analytics, BlogPost
+from .hyperloglog import HyperLogLog
+from .upsert import upsert_increment
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, datetime]
+
+
+class DailyAggregate:
+    """Pending totals for one post on one day"""
+
+    __slots__ = ("views", "bounces", "timed_views", "time_on_page_total", "visitors")
+
+    def __init__(self, precision: int):
+        self.views = 0
+        self.bounces = 0
+        self.timed_views = 0
+        self.time_on_page_total = 0
+        self.visitors = HyperLogLog(precision)
+
+    def merge(self, other: "DailyAggregate") -> None:
+        self.views += other.views
+        self.bounces += other.bounces
+        self.timed_views += other.timed_views
+        self.time_on_page_total += other.time_on_page_total
+        self.visitors.merge(other.visitors)
+
+
+def day_of(ts: Optional[float]) -> datetime:
+    """Midnight UTC of a client timestamp (epoch seconds), or of today"""
+    moment = datetime.utcfromtimestamp(ts) if ts else datetime.utcnow()
+    return datetime(moment.year, moment.month, moment.day)
+
+
+class AnalyticsIngest:
+    """
+    Aggregates page-view beacons in memory and upserts daily rollups.
+
+    Memory is bounded by `max_pending` (post, day) aggregates of fixed
+    size; when the buffer is full a flush is triggered early and events for
+    new posts are dropped (and counted) until it drains. Unique visitors
+    are HyperLogLog sketches stored with each row, so flushes from any
+    number of workers merge into the same daily estimate.
+    """
+
+    def __init__(self, session_factory, flush_interval: float = None, max_pending: int = None,
+                 precision: int = None, max_age_days: int = 2):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval or float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "10"))
+        self.max_pending = max_pending or int(os.getenv("ANALYTICS_MAX_PENDING", "5000"))
+        self.precision = precision or int(os.getenv("ANALYTICS_HLL_PRECISION", "12"))
+        self.max_age_days = max_age_days
+        self.dropped = 0
+        self._pending: Dict[Key, DailyAggregate] = {}
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, post_id: str, visitor_id: str, seconds: Optional[int] = None,
+               bounced: bool = False, ts: Optional[float] = None) -> bool:
+        """Count one page view; returns False if the event was dropped"""
+        day = day_of(ts)
+        today = day_of(None)
+        if day > today or day < today - timedelta(days=self.max_age_days):
+            # Clock skew or replayed beacons; not worth reopening old rows for
+            self.dropped += 1
+            return False
+
+        key = (post_id, day)
+        with self._lock:
+            agg = self._pending.get(key)
+            if agg is None:
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    self._full.set()
+                    return False
+                agg = self._pending[key] = DailyAggregate(self.precision)
+            agg.views += 1
+            agg.bounces += 1 if bounced else 0
+            if seconds is not None:
+                agg.timed_views += 1
+                agg.time_on_page_total += max(0, int(seconds))
+            agg.visitors.add(visitor_id)
+        return True
+
+    def pending(self) -> int:
+        """Views recorded in memory but not yet written to the database"""
+        with self._lock:
+            return sum(agg.views for agg in self._pending.values())
+
+    def _drain(self) -> Dict[Key, DailyAggregate]:
+        with self._lock:
+            drained, self._pending = self._pending, {}
+        self._full.clear()
+        return drained
+
+    def _restore(self, aggregates: Dict[Key, DailyAggregate]) -> None:
+        with self._lock:
+            for key, agg in aggregates.items():
+                if key in self._pending:
+                    agg.merge(self._pending[key])
+                self._pending[key] = agg
+
+    def _write(self, db, aggregates: Dict[Key, DailyAggregate]) -> None:
+        # Counters first, so every (post, day) row exists and is locked by this transaction
+        upsert_increment(
+            db, Analytics,
+            [
+                {
+                    "blog_post_id": post_id, "date": day, "views": agg.views, "bounces": agg.bounces,
+                    "timed_views": agg.timed_views, "time_on_page_total": agg.time_on_page_total
+                }
+                for (post_id, day), agg in aggregates.items()
+            ],
+            keys=("blog_post_id", "date"),
+            counters=("views", "bounces", "timed_views", "time_on_page_total")
+        )
+
+        rows = db.execute(
+            select(
+                Analytics.id, Analytics.blog_post_id, Analytics.date, Analytics.views, Analytics.bounces,
+                Analytics.timed_views, Analytics.time_on_page_total, Analytics.visitor_sketch
+            )
+            .where(tuple_(Analytics.blog_post_id, Analytics.date).in_(list(aggregates)))
+            .with_for_update()
+        ).all()
+
+        # Merge sketches and re-derive the rates from the running totals
+        updates = []
+        for row in rows:
+            sketch = aggregates[(row.blog_post_id, row.date)].visitors
+            if row.visitor_sketch and len(row.visitor_sketch) == sketch.size:
+                sketch.merge(HyperLogLog.from_bytes(row.visitor_sketch))
+            updates.append({
+                "b_id": row.id,
+                "b_sketch": sketch.to_bytes(),
+                "b_unique": sketch.count(),
+                "b_bounce_rate": row.bounces / row.views if row.views else 0,
+                "b_avg_time": row.time_on_page_total // row.timed_views if row.timed_views else 0
+            })
+
+        table = Analytics.__table__
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                visitor_sketch=bindparam("b_sketch"),
+                unique_visitors=bindparam("b_unique"),
+                bounce_rate=bindparam("b_bounce_rate"),
+                avg_time_on_page=bindparam("b_avg_time")
+            ),
+            updates
+        )
+
+    def flush(self) -> int:
+        """Upsert all pending rollups in one transaction; returns the views flushed"""
+        aggregates = self._drain()
+        if not aggregates:
+            return 0
+
+        db = self.session_factory()
+        try:
+            # Beacons are unauthenticated; ignore views of posts that don't exist
+            post_ids = {post_id for post_id, _ in aggregates}
+            known = set(db.scalars(select(BlogPost.id).where(BlogPost.id.in_(post_ids))))
+            aggregates = {key: agg for key, agg in aggregates.items() if key[0] in known}
+            if aggregates:
+                self._write(db, aggregates)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Put the aggregates back so the next flush retries them
+            self._restore(aggregates)
+            logger.error(f"Analytics flush failed, will retry: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+        return sum(agg.views for agg in aggregates.values())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Wake early when the buffer fills up
+            self._full.wait(self.flush_interval)
+            if not self._stop.is_set():
+                self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-ingest", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write out anything still pending"""
+        self._stop.set()
+        self._full.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,342 @@
+# ============================================================================
+# FILE: backend/services/batch_generation.py
+# ============================================================================
+"""
+Location: backend/services/batch_generation.py
+Purpose: Generate many posts at once with bounded parallelism and bulk inserts
+"""
+
+import os
+import re
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select
+
+from models import BlogPost, Monetization, ContentStrategy
+from .email_outbox import TokenBucket
+from .content_engine_composite import CompositeContentEngine
+from .post_processing import ContentPipeline
+
+logger = logging.getLogger(__name__)
+
+# One request budget per provider, shared by every batch in the process
+_provider_buckets: Dict[str, TokenBucket] = {}
+
+
+def provider_bucket(provider: str, rpm: float = None) -> TokenBucket:
+    """Token bucket enforcing the provider's requests-per-minute budget; `rpm` overrides the configured one"""
+    bucket = _provider_buckets.get(provider)
+    if bucket is None or (rpm and bucket.rate != rpm / 60.0):
+        rpm = rpm or float(os.getenv(f"{provider.upper()}_RPM", os.getenv("AI_RPM", "60")))
+        bucket = _provider_buckets[provider] = TokenBucket(rpm / 60.0)
+    return bucket
+
+
+class RateLimitedEngine:
+    """Content engine wrapper that waits for the provider's budget before each request"""
+
+    def __init__(self, engine, rpm: float = None):
+        self.engine = engine
+        self.provider = engine.provider
+        self.bucket = provider_bucket(engine.provider, rpm)
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
+
+    async def stream_blog_post(self, **kwargs):
+        await self.bucket.acquire_async()
+        async for event in self.engine.stream_blog_post(**kwargs):
+            yield event
+
+    async def generate_blog_post(self, **kwargs) -> Dict:
+        await self.bucket.acquire_async()
+        return await self.engine.generate_blog_post(**kwargs)
+
+
+def rate_limited(engine, rpm: float = None):
+    """Apply per-provider budgets, keeping failover (and its health stats) for composites"""
+    if isinstance(engine, CompositeContentEngine):
+        limited = CompositeContentEngine(
+            {name: RateLimitedEngine(e, rpm) for name, e in engine.engines.items()},
+            hedge=engine.hedge,
+            hedge_after=engine.hedge_after
+        )
+        limited.health = engine.health
+        return limited
+    return RateLimitedEngine(engine, rpm)
+
+
+content_pipeline = ContentPipeline()
+
+
+def post_slug(topic: str, post_data: Dict) -> str:
+    """
+    The generated slug reduced to [a-z0-9-], falling back to the topic.
+
+    Slugs become URL paths and static file paths, so model output is
+    never stored as-is.
+    """
+    for text in (post_data.get("slug"), topic):
+        slug = re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")[:200]
+        if slug:
+            return slug
+    return uuid.uuid4().hex[:12]
+
+
+def post_values(topic: str, post_data: Dict) -> Dict:
+    """Column values for a freshly generated (draft) post, with its body sanitized and analysed"""
+    processed = content_pipeline.process(post_data.get("content", ""))
+    return {
+        "id": str(uuid.uuid4()),
+        "title": post_data.get("title", "Untitled"),
+        "slug": post_slug(topic, post_data),
+        "content": processed["content"],
+        "excerpt": post_data.get("meta_description") or processed["summary"],
+        "seo_data": post_data.get("seo_data", {}),
+        "keywords": post_data.get("keywords", []),
+        "post_metadata": processed["metadata"],
+        "image_urls": processed["image_urls"],
+        "video_urls": processed["video_urls"],
+        "status": "draft"
+    }
+
+
+def monetization_values(post_id: str, post_data: Dict) -> Dict:
+    """Column values for a generated post's monetization record"""
+    return {
+        "id": str(uuid.uuid4()),
+        "blog_post_id": post_id,
+        "affiliate_links": post_data.get("affiliate_suggestions", [])
+    }
+
+
+def items_from_topics(topics: List[str], niche: str, target_market: str, region: str) -> List[Dict]:
+    return [
+        {"topic": t.strip(), "niche": niche, "target_market": target_market, "region": region}
+        for t in topics if t and t.strip()
+    ]
+
+
+def items_from_strategy(strategy: ContentStrategy) -> List[Dict]:
+    """Batch items for the topics listed in a strategy's parameters"""
+    topics = (strategy.parameters or {}).get("topics") or []
+    if not topics:
+        raise ValueError(f"Content strategy {strategy.id} has no topics in its parameters")
+    return items_from_topics(topics, strategy.niche, strategy.target_market, strategy.geo_region)
+
+
+class BatchReport:
+    """Progress and per-item outcome of one batch"""
+
+    def __init__(self, total: int):
+        self.id = str(uuid.uuid4())
+        self.total = total
+        self.status = "running"
+        self.generated = 0
+        self.post_ids: List[str] = []
+        self.failures: List[Dict] = []
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self._started = time.monotonic()
+        self._seconds: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return len(self.post_ids) + len(self.failures)
+
+    def fail(self, topic: str, error: Exception) -> None:
+        self.failures.append({"topic": topic, "error": str(error)})
+
+    def finish(self, status: str = "finished") -> None:
+        self.status = status
+        self.finished_at = datetime.utcnow()
+        self._seconds = time.monotonic() - self._started
+
+    def to_dict(self) -> Dict:
+        seconds = self._seconds if self._seconds is not None else time.monotonic() - self._started
+        return {
+            "id": self.id,
+            "status": self.status,
+            "total": self.total,
+            "generated": self.generated,
+            "completed": self.completed,
+            "succeeded": len(self.post_ids),
+            "failed": len(self.failures),
+            "post_ids": self.post_ids,
+            "failures": self.failures,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "seconds": round(seconds, 2)
+        }
+
+
+class BatchGenerator:
+    """Fans a list of topics out to the content engine and stores the posts in bulk"""
+
+    def __init__(
+        self,
+        engine,
+        session_factory,
+        concurrency: int = None,
+        batch_size: int = None,
+        bypass_cache: bool = False,
+        rpm: float = None
+    ):
+        self.engine = rate_limited(engine, rpm)
+        self.session_factory = session_factory
+        self.concurrency = concurrency or int(os.getenv("BATCH_CONCURRENCY", "4"))
+        # Generated posts are inserted this many at a time, in one transaction
+        self.batch_size = batch_size or int(os.getenv("BATCH_INSERT_SIZE", "20"))
+        self.bypass_cache = bypass_cache
+        # Stores run in a thread, one at a time so slug checks see earlier batches
+        self._store_lock = asyncio.Lock()
+
+    def _unique_slugs(self, db, rows: List[Dict]) -> None:
+        """Suffix slugs already taken in the database or earlier in the same insert"""
+        taken = set(db.scalars(
+            select(BlogPost.slug).where(BlogPost.slug.in_([r["slug"] for r in rows]))
+        ))
+        for row in rows:
+            if row["slug"] in taken:
+                row["slug"] = f"{row['slug']}-{uuid.uuid4().hex[:6]}"
+            taken.add(row["slug"])
+
+    def _store(self, generated: List[tuple], report: BatchReport) -> None:
+        """Insert posts and monetization rows in one transaction, isolating bad rows on failure"""
+        if not generated:
+            return
+        topics = [topic for topic, _ in generated]
+        posts = [post_values(topic, data) for topic, data in generated]
+        monetizations = [monetization_values(p["id"], data) for p, (_, data) in zip(posts, generated)]
+
+        db = self.session_factory()
+        try:
+            self._unique_slugs(db, posts)
+            try:
+                db.execute(insert(BlogPost), posts)
+                db.execute(insert(Monetization), monetizations)
+                db.commit()
+                report.post_ids.extend(p["id"] for p in posts)
+                return
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Bulk insert of {len(posts)} posts failed, retrying one by one: {str(e)}")
+
+            for topic, post, monetization in zip(topics, posts, monetizations):
+                try:
+                    db.execute(insert(BlogPost), [post])
+                    db.execute(insert(Monetization), [monetization])
+                    db.commit()
+                    report.post_ids.append(post["id"])
+                except Exception as e:
+                    db.rollback()
+                    report.fail(topic, e)
+        finally:
+            db.close()
+
+    async def run(self, items: List[Dict], progress: Callable[[BatchReport], None] = None,
+                  report: BatchReport = None) -> BatchReport:
+        """
+        Generate every item, at most `concurrency` at a time.
+
+        Args:
+            items: Dicts with topic, niche, target_market and region
+            progress: Called with the report after each item finishes
+            report: Report to fill in (a new one is created if omitted)
+
+        Returns:
+            BatchReport: Stored post ids and per-topic failures
+        """
+        report = report or BatchReport(len(items))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending: List[tuple] = []
+
+        async def flush():
+            batch = pending[:]
+            pending.clear()
+            async with self._store_lock:
+                try:
+                    # Bulk inserts and post processing are synchronous; keep them off the event loop
+                    await asyncio.to_thread(self._store, batch, report)
+                except Exception as e:
+                    # Nothing from a batch that failed outside the per-row retry was stored
+                    logger.error(f"Storing a batch of {len(batch)} posts failed: {str(e)}")
+                    for topic, _ in batch:
+                        report.fail(topic, e)
+
+        async def generate(item: Dict):
+            async with semaphore:
+                try:
+                    post_data = await self.engine.generate_blog_post(
+                        topic=item["topic"],
+                        niche=item["niche"],
+                        target_market=item["target_market"],
+                        region=item["region"],
+                        bypass_cache=self.bypass_cache
+                    )
+                except Exception as e:
+                    logger.error(f"Batch generation failed for '{item['topic']}': {str(e)}")
+                    report.fail(item["topic"], e)
+                else:
+                    report.generated += 1
+                    pending.append((item["topic"], post_data))
+                    if len(pending) >= self.batch_size:
+                        await flush()
+            if progress:
+                progress(report)
+
+        status = "failed"
+        try:
+            await asyncio.gather(*(generate(item) for item in items))
+            await flush()
+            status = "finished"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Batch {report.id} aborted: {str(e)}")
+        finally:
+            report.finish(status)
+            if progress:
+                progress(report)
+        return report
+
+
+class BatchRunner:
+    """Runs batches in the background and keeps recent reports for polling"""
+
+    def __init__(self, engine, session_factory, keep: int = 50):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.keep = keep
+        self._reports: "OrderedDict[str, BatchReport]" = OrderedDict()
+        self._tasks = set()
+
+    def submit(self, items: List[Dict], bypass_cache: bool = False) -> BatchReport:
+        """Start a batch on the running loop and return its live report"""
+        generator = BatchGenerator(self.engine, self.session_factory, bypass_cache=bypass_cache)
+        report = BatchReport(len(items))
+        self._reports[report.id] = report
+        while len(self._reports) > self.keep:
+            self._reports.popitem(last=False)
+
+        task = asyncio.create_task(generator.run(items, report=report))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return report
+
+    def get(self, batch_id: str) -> Optional[Dict]:
+        report = self._reports.get(batch_id)
+        return report.to_dict() if report else None
+
+    async def stop(self) -> None:
+        """Cancel running batches; posts already inserted stay stored"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,225 @@
+# ============================================================================
+# FILE: backend/services/click_tracker.py
+# ============================================================================
+"""
+Location: backend/services/click_tracker.py
+Purpose: Affiliate click redirects without a database write per click
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update, bindparam, case, select
+
+from models import AffiliateClick, BlogPost, Monetization
+from .affiliate_service import AffiliateService, AffiliateProvider, PROVIDER_DOMAINS, PROVIDER_URL
+from .upsert import upsert_increment
+
+logger = logging.getLogger(__name__)
+
+
+def click_path(post_id: str, link_id: str) -> str:
+    """The /go/ redirect for a link; CLICK_BASE_URL points it at the API when pages are served elsewhere"""
+    return f"{os.getenv('CLICK_BASE_URL', '').rstrip('/')}/go/{post_id}/{link_id}"
+
+
+class LinkDirectory:
+    """
+    Redirect targets by (post_id, link_id), loaded once per post and kept in an LRU.
+
+    Targets are the post's tracked affiliate suggestions and the affiliate
+    links found in its body at publish time. `session_factory` returns an
+    AsyncSession; lookups only touch the database on a cache miss, and
+    never write. Entries expire after `ttl` seconds, so workers that did not
+    do the publishing pick up new links; posts without links are not cached.
+    """
+
+    def __init__(self, session_factory, affiliates: AffiliateService = None, size: int = None, ttl: float = None):
+        self.session_factory = session_factory
+        self.affiliates = affiliates or AffiliateService()
+        self.size = size or int(os.getenv("CLICK_LINK_CACHE_SIZE", "2048"))
+        self.ttl = ttl if ttl is not None else float(os.getenv("CLICK_LINK_TTL", "300"))
+        self._posts: "OrderedDict[str, Tuple[float, Dict[str, Tuple[str, str]]]]" = OrderedDict()
+
+    def targets(self, suggestions: List[Dict], metadata: Dict = None) -> Dict[str, Tuple[str, str]]:
+        """link_id -> (url, provider) for the tracked links of one post"""
+        body_links = ((metadata or {}).get("links") or {}).get("affiliate") or []
+        links = {}
+        for link in list(suggestions or []) + [{"link": b.get("url"), "id": b.get("id")} for b in body_links]:
+            url = link.get("link")
+            match = PROVIDER_URL.match(url or "")
+            if not match or not link.get("id"):
+                continue
+            links[link["id"]] = (url, PROVIDER_DOMAINS[match.group(1).lower()].value)
+        return links
+
+    async def resolve(self, post_id: str, link_id: str) -> Optional[Tuple[str, str]]:
+        """(url, provider) for a link, or None if the post has no such link"""
+        entry = self._posts.get(post_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._posts.move_to_end(post_id)
+            return entry[1].get(link_id)
+
+        async with self.session_factory() as db:
+            row = (await db.execute(
+                select(BlogPost.post_metadata, Monetization.affiliate_links)
+                .outerjoin(Monetization, Monetization.blog_post_id == BlogPost.id)
+                .where(BlogPost.id == post_id)
+            )).first()
+        links = self.targets(row.affiliate_links, row.post_metadata) if row else {}
+        if links:
+            self._posts[post_id] = (time.monotonic() + self.ttl, links)
+            self._posts.move_to_end(post_id)
+            if len(self._posts) > self.size:
+                self._posts.popitem(last=False)
+        else:
+            self._posts.pop(post_id, None)
+        return links.get(link_id)
+
+    def click_url(self, url: str, provider: str, click_id: str) -> str:
+        """The link with this click's reference, so conversions can be joined back to it"""
+        return self.affiliates.templates[AffiliateProvider(provider)].with_click(url, click_id)
+
+    def invalidate(self, post_id: str) -> None:
+        """Forget a post's links, e.g. after it is republished"""
+        self._posts.pop(post_id, None)
+
+
+class ClickTracker:
+    """
+    Aggregates affiliate clicks in memory and flushes them periodically.
+
+    Each flush adds the per-post totals to Monetization.clicks, upserts the
+    per-provider totals into affiliate_clicks, and appends the raw click
+    events to a daily log file (one tab-separated line per click:
+    epoch ms, click id, post id, link id, provider) for joining against
+    provider conversion reports.
+    """
+
+    def __init__(self, session_factory, log_dir: str = None, flush_interval: float = None, shards: int = 16):
+        self.session_factory = session_factory
+        self.log_dir = log_dir or os.getenv("CLICK_LOG_DIR", "logs/clicks")
+        self.flush_interval = flush_interval or float(os.getenv("CLICK_FLUSH_INTERVAL", "5"))
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards: List[Dict[Tuple[str, str], int]] = [{} for _ in range(shards)]
+        self._events: List[str] = []
+        self._events_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, post_id: str, link_id: str, provider: str, click_id: str) -> None:
+        """Count one click; cheap enough to call inline in the redirect handler"""
+        key = (post_id, provider)
+        i = hash(key) % len(self._shards)
+        with self._locks[i]:
+            self._shards[i][key] = self._shards[i].get(key, 0) + 1
+        line = f"{int(time.time() * 1000)}\t{click_id}\t{post_id}\t{link_id}\t{provider}\n"
+        with self._events_lock:
+            self._events.append(line)
+
+    def pending(self) -> int:
+        """Clicks recorded in memory but not yet written to the database"""
+        total = 0
+        for i, lock in enumerate(self._locks):
+            with lock:
+                total += sum(self._shards[i].values())
+        return total
+
+    def _drain(self) -> Dict[Tuple[str, str], int]:
+        drained = {}
+        for i, lock in enumerate(self._locks):
+            with lock:
+                shard, self._shards[i] = self._shards[i], {}
+            drained.update(shard)
+        return drained
+
+    def _restore(self, counts: Dict[Tuple[str, str], int]) -> None:
+        for key, n in counts.items():
+            i = hash(key) % len(self._shards)
+            with self._locks[i]:
+                self._shards[i][key] = self._shards[i].get(key, 0) + n
+
+    def _write_log(self) -> None:
+        with self._events_lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            path = os.path.join(self.log_dir, f"clicks-{datetime.utcnow():%Y%m%d}.log")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(events))
+        except OSError as e:
+            with self._events_lock:
+                self._events[:0] = events
+            logger.error(f"Click log write failed, will retry: {str(e)}")
+
+    def flush(self) -> int:
+        """Write pending clicks in two batched statements; returns the clicks flushed"""
+        self._write_log()
+        counts = self._drain()
+        if not counts:
+            return 0
+
+        per_post: Dict[str, int] = {}
+        for (post_id, _), n in counts.items():
+            per_post[post_id] = per_post.get(post_id, 0) + n
+
+        table = Monetization.__table__
+        clicks = table.c.clicks + bindparam("b_clicks")
+        stmt = (
+            update(table)
+            .where(table.c.blog_post_id == bindparam("b_post_id"))
+            .values(
+                clicks=clicks,
+                conversion_rate=case((clicks > 0, table.c.conversions * 1.0 / clicks), else_=0),
+                updated_at=datetime.utcnow()
+            )
+        )
+
+        db = self.session_factory()
+        try:
+            db.execute(stmt, [{"b_post_id": post_id, "b_clicks": n} for post_id, n in per_post.items()])
+            upsert_increment(
+                db, AffiliateClick,
+                [{"blog_post_id": post_id, "provider": provider, "clicks": n}
+                 for (post_id, provider), n in counts.items()],
+                keys=("blog_post_id", "provider"),
+                counters=("clicks",)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Put the counts back so the next flush retries them
+            self._restore(counts)
+            logger.error(f"Click flush failed, will retry: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+        return sum(counts.values())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="click-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write out anything still pending"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
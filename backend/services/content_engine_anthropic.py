@@ -7,25 +7,44 @@ Purpose: Content generation using Anthropic Claude
 Install: pip install anthropic
 """
 
-import anthropic
 import os
-import json
-from typing import Dict
+from typing import AsyncIterator, Dict
+
+from .ai_clients import ai_clients
+from .generation_cache import GenerationCache
+from .response_parser import parse_post_response
+from .streaming import stream_post_events
 
 class ContentEngine:
     """Content generation using Anthropic Claude"""
     
-    def __init__(self):
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
+    provider = "anthropic"
+    model_name = "claude-3-sonnet-20240229"
+    
+    def __init__(self, cache: GenerationCache = None):
+        if not os.getenv("ANTHROPIC_API_KEY"):
             raise ValueError("ANTHROPIC_API_KEY not set in environment")
         
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.cache = cache or GenerationCache()
     
-    async def generate_blog_post(self, topic: str, niche: str, target_market: str, region: str) -> Dict:
-        """Generate complete blog post"""
-        
-        prompt = f"""
+    @property
+    def client(self):
+        """Process-wide AsyncAnthropic client, created on first use"""
+        return ai_clients.anthropic()
+    
+    async def _complete(self, prompt: str) -> str:
+        """Run one completion and return its text"""
+        response = await self.client.messages.create(
+            model=self.model_name,
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response.content[0].text
+    
+    def _build_prompt(self, topic: str, niche: str, target_market: str, region: str) -> str:
+        return f"""
 Write a luxury travel blog post about {topic}.
 
 Target Market: {target_market}
@@ -55,28 +74,41 @@ Return as JSON with these fields:
     ]
 }}
 """
+    
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as Claude produces them"""
+        async with self.client.messages.stream(
+            model=self.model_name,
+            max_tokens=4000,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    def stream_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> AsyncIterator[Dict]:
+        """Stream the post as it is written; the last event carries the parsed post"""
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        return stream_post_events(self, prompt, bypass_cache)
+    
+    async def generate_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> Dict:
+        """Generate complete blog post, reusing a cached result for an identical prompt"""
+        
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        
+        if not bypass_cache:
+            cached = self.cache.get(self.provider, self.model_name, prompt)
+            if cached is not None:
+                return cached
         
         try:
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4000,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            
-            text = response.content[0].text
-            
-            # Remove markdown code blocks if present
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            post_data = json.loads(text)
+            text = await self._complete(prompt)
+            post_data = await parse_post_response(text, prompt, self._complete)
+            self.cache.set(self.provider, self.model_name, prompt, post_data)
             return post_data
             
-        except json.JSONDecodeError:
-            raise ValueError(f"Failed to parse Anthropic response as JSON: {text}")
+        except ValueError as e:
+            raise ValueError(f"Failed to parse Anthropic response: {str(e)}")
         except Exception as e:
             raise Exception(f"Content generation error: {str(e)}")
\ No newline at end of file
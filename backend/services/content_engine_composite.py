@@ -0,0 +1,286 @@
+# ============================================================================
+# FILE: backend/services/content_engine_composite.py
+# ============================================================================
+"""
+Location: backend/services/content_engine_composite.py
+Purpose: Health-aware failover and hedged requests across AI providers
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealth:
+    """Rolling latency and error stats plus a circuit breaker for one provider"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60, window: int = 50):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # Time to first token, in seconds
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        # When the single request allowed through a half-open circuit was sent
+        self.probe_started: Optional[float] = None
+
+    def record_first_token(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+
+    def record_success(self) -> None:
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started = None
+
+    def record_failure(self) -> None:
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self.probe_started = None
+        if self.consecutive_failures >= self.failure_threshold:
+            # (Re)open the circuit; a failed half-open probe restarts the timer
+            self.opened_at = time.monotonic()
+
+    def start_probe(self) -> None:
+        """Claim the half-open circuit's one request; no-op for a closed circuit"""
+        if self.state == "half_open":
+            self.probe_started = time.monotonic()
+
+    def end_probe(self) -> None:
+        """Free the probe slot of a request that ended without an outcome"""
+        self.probe_started = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    @property
+    def available(self) -> bool:
+        """Closed, or half-open with no probe in flight"""
+        state = self.state
+        if state != "half_open":
+            return state == "closed"
+        # A probe whose outcome never arrived stops blocking after another reset timeout
+        return self.probe_started is None or time.monotonic() - self.probe_started >= self.reset_timeout
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def snapshot(self) -> Dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "state": self.state,
+            "error_rate": round(self.error_rate, 3),
+            "p50_first_token": round(p50, 3) if p50 is not None else None,
+            "p95_first_token": round(p95, 3) if p95 is not None else None,
+            "samples": len(self.latencies)
+        }
+
+
+class CompositeContentEngine:
+    """Routes each generation to the healthiest provider, failing over and optionally hedging"""
+
+    provider = "composite"
+
+    def __init__(
+        self,
+        engines: Dict[str, object],
+        hedge: bool = None,
+        hedge_after: float = None,
+        failure_threshold: int = None,
+        reset_timeout: float = None
+    ):
+        if not engines:
+            raise ValueError("CompositeContentEngine needs at least one provider")
+        self.engines = dict(engines)
+        if hedge is None:
+            hedge = os.getenv("AI_HEDGE", "false").lower() == "true"
+        self.hedge = hedge
+        # Hedge deadline until enough latency samples exist for a p95
+        self.hedge_after = hedge_after or float(os.getenv("AI_HEDGE_AFTER", "10"))
+        failure_threshold = failure_threshold or int(os.getenv("AI_CIRCUIT_FAILURES", "3"))
+        reset_timeout = reset_timeout or float(os.getenv("AI_CIRCUIT_RESET", "60"))
+        self.health = {
+            name: ProviderHealth(failure_threshold, reset_timeout)
+            for name in self.engines
+        }
+
+    def ranked(self) -> List[str]:
+        """Providers in routing order: usable circuits first, then lowest error rate and latency"""
+        order = list(self.engines)
+
+        def score(name):
+            health = self.health[name]
+            p50 = health.percentile(0.5)
+            return (health.error_rate, p50 if p50 is not None else 0.0, order.index(name))
+
+        # Open circuits fail fast until their reset timeout lets one probe through
+        return sorted((n for n in order if self.health[n].available), key=score)
+
+    def _hedge_delay(self, name: str) -> float:
+        health = self.health[name]
+        if len(health.latencies) >= 5:
+            return max(0.5, health.percentile(0.95))
+        return self.hedge_after
+
+    @staticmethod
+    async def _close(stream) -> None:
+        try:
+            await stream.aclose()
+        except Exception:
+            pass
+
+    async def _discard(self, task: asyncio.Task, stream) -> None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await self._close(stream)
+
+    async def _start(self, kwargs: Dict, tried: Set[str]) -> Tuple[str, AsyncIterator[Dict], Dict]:
+        """
+        Open a stream on the best untried provider and wait for its first event.
+
+        If hedging is on and the first event is later than the provider's
+        p95, the runner-up is started too and whichever answers first wins.
+        Providers that fail are recorded and the next one is tried. Cached
+        answers are not provider latency and are left out of the stats.
+        """
+        pending: Dict[asyncio.Task, Tuple[str, AsyncIterator[Dict], float]] = {}
+        errors = []
+
+        def launch() -> bool:
+            for name in self.ranked():
+                if name not in tried:
+                    tried.add(name)
+                    self.health[name].start_probe()
+                    stream = self.engines[name].stream_blog_post(**kwargs)
+                    task = asyncio.ensure_future(stream.__anext__())
+                    pending[task] = (name, stream, time.monotonic())
+                    return True
+            return False
+
+        if not launch():
+            raise RuntimeError("No AI provider available: all circuits are open or already tried")
+
+        can_hedge = self.hedge
+        try:
+            while pending:
+                timeout = None
+                if can_hedge and len(pending) == 1:
+                    (name, _, started), = pending.values()
+                    timeout = max(0.0, self._hedge_delay(name) - (time.monotonic() - started))
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    can_hedge = False
+                    if launch():
+                        logger.info(f"Hedging generation after {timeout:.1f}s with a second provider")
+                    continue
+
+                for task in done:
+                    name, stream, started = pending.pop(task)
+                    try:
+                        event = task.result()
+                    except Exception as e:
+                        self.health[name].record_failure()
+                        errors.append(f"{name}: {str(e)}")
+                        logger.error(f"AI provider {name} failed: {str(e)}")
+                        await self._close(stream)
+                        continue
+
+                    if not event.get("cached"):
+                        self.health[name].record_first_token(time.monotonic() - started)
+                    for other in list(pending):
+                        other_name, other_stream, other_started = pending.pop(other)
+                        # The slower request only tells us its latency is at least this much
+                        self.health[other_name].record_first_token(time.monotonic() - other_started)
+                        self.health[other_name].end_probe()
+                        tried.discard(other_name)
+                        await self._discard(other, other_stream)
+                    return name, stream, event
+
+                if not pending and not launch():
+                    raise RuntimeError(f"All AI providers failed: {'; '.join(errors)}")
+
+            raise RuntimeError(f"All AI providers failed: {'; '.join(errors)}")
+        finally:
+            # Only left over if the caller was cancelled while waiting
+            for task, (name, stream, _) in list(pending.items()):
+                self.health[name].end_probe()
+                await self._discard(task, stream)
+
+    async def stream_blog_post(
+        self,
+        topic: str,
+        niche: str,
+        target_market: str,
+        region: str,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[Dict]:
+        """Stream from the first provider to answer; failures before the first token fail over"""
+        kwargs = dict(topic=topic, niche=niche, target_market=target_market, region=region, bypass_cache=bypass_cache)
+        name, stream, event = await self._start(kwargs, set())
+        cached = event.get("cached")
+        try:
+            yield event
+            async for event in stream:
+                yield event
+        except Exception:
+            self.health[name].record_failure()
+            raise
+        finally:
+            # Also runs when the consumer stops early, which leaves no outcome for a probe
+            self.health[name].end_probe()
+            await self._close(stream)
+        if not cached:
+            self.health[name].record_success()
+
+    async def generate_blog_post(
+        self,
+        topic: str,
+        niche: str,
+        target_market: str,
+        region: str,
+        bypass_cache: bool = False
+    ) -> Dict:
+        """Generate a complete post, failing over to the next provider on any error"""
+        kwargs = dict(topic=topic, niche=niche, target_market=target_market, region=region, bypass_cache=bypass_cache)
+        tried: Set[str] = set()
+        while True:
+            name, stream, event = await self._start(kwargs, tried)
+            try:
+                while event["type"] != "post":
+                    event = await stream.__anext__()
+            except Exception as e:
+                self.health[name].record_failure()
+                logger.error(f"AI provider {name} failed mid-generation: {str(e)}")
+                continue
+            finally:
+                self.health[name].end_probe()
+                await self._close(stream)
+            if not event.get("cached"):
+                self.health[name].record_success()
+            return event["post"]
+
+    def get_health(self) -> Dict[str, Dict]:
+        """Per-provider routing stats"""
+        return {name: health.snapshot() for name, health in self.health.items()}
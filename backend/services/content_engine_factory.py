@@ -7,7 +7,26 @@ Purpose: Factory to create content engines based on AI provider
 """
 
 import os
-from typing import Dict
+import logging
+import importlib.util
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# SDK each provider needs; imported by the shared client registry on first use
+PROVIDER_SDKS = {
+    "gemini": "google.generativeai",
+    "anthropic": "anthropic",
+    "openai": "openai"
+}
+
+
+def sdk_installed(provider: str) -> bool:
+    """Check the provider's SDK is importable without importing it"""
+    try:
+        return importlib.util.find_spec(PROVIDER_SDKS[provider]) is not None
+    except ModuleNotFoundError:
+        return False
 
 class ContentEngineFactory:
     """Factory to create content engines based on AI provider"""
@@ -19,8 +38,16 @@ class ContentEngineFactory:
         # Get provider from parameter or environment
         if not provider:
             provider = os.getenv("AI_PROVIDER", "gemini").lower()
+
+        # A comma-separated list (e.g. "gemini,anthropic") fails over between providers
+        if "," in provider:
+            return ContentEngineFactory.create_composite_engine(
+                [p.strip() for p in provider.split(",") if p.strip()]
+            )
         
         try:
+            if provider in PROVIDER_SDKS and not sdk_installed(provider):
+                raise ImportError(PROVIDER_SDKS[provider])
             if provider == "gemini":
                 from .content_engine_gemini import ContentEngine
                 return ContentEngine()
@@ -37,6 +64,24 @@ class ContentEngineFactory:
         except Exception as e:
             raise ValueError(f"Failed to initialize AI provider '{provider}': {str(e)}")
 
+    @staticmethod
+    def create_composite_engine(providers: List[str]):
+        """Wrap several providers in a failover engine, skipping any that fail to initialize"""
+        from .content_engine_composite import CompositeContentEngine
+
+        engines = {}
+        errors = []
+        for name in providers:
+            try:
+                engines[name] = ContentEngineFactory.create_content_engine(name)
+            except ValueError as e:
+                errors.append(str(e))
+                logger.warning(f"Skipping AI provider '{name}': {str(e)}")
+
+        if not engines:
+            raise ValueError(f"No AI provider could be initialized: {'; '.join(errors)}")
+        return CompositeContentEngine(engines)
+
     @staticmethod
     def get_available_providers() -> Dict[str, Dict]:
         """Get information about available AI providers"""
@@ -89,17 +134,16 @@ class ContentEngineFactory:
                 "setup_url": provider_info["signup_url"]
             }
         
-        try:
-            # Try to create the engine (will validate API key format/connection)
-            engine = ContentEngineFactory.create_content_engine(provider)
-            return {
-                "valid": True,
-                "provider": provider,
-                "message": f"{provider_info['name']} is properly configured"
-            }
-        except Exception as e:
+        if not sdk_installed(provider):
             return {
                 "valid": False,
-                "error": f"Configuration error: {str(e)}",
+                "error": f"Missing dependency: pip install {PROVIDER_SDKS[provider].replace('.', '-')}",
                 "setup_url": provider_info["signup_url"]
-            }
\ No newline at end of file
+            }
+        
+        # Clients are shared and built lazily, so no engine is constructed here
+        return {
+            "valid": True,
+            "provider": provider,
+            "message": f"{provider_info['name']} is properly configured"
+        }
@@ -0,0 +1,103 @@
+
+# ============================================================================
+# FILE 3: backend/services/content_engine_gemini.py
+# ============================================================================
+"""
+Location: backend/services/content_engine_gemini.py
+Purpose: Content generation using Google Gemini
+Install: pip install google-generativeai
+"""
+
+import os
+from typing import AsyncIterator, Dict
+
+from .ai_clients import ai_clients
+from .generation_cache import GenerationCache
+from .response_parser import parse_post_response
+from .streaming import stream_post_events
+
+class ContentEngine:
+    """Content generation using Google Gemini"""
+    
+    provider = "gemini"
+    model_name = "gemini-pro"
+    
+    def __init__(self, cache: GenerationCache = None):
+        if not os.getenv("GEMINI_API_KEY"):
+            raise ValueError("GEMINI_API_KEY not set in environment")
+        
+        self.cache = cache or GenerationCache()
+    
+    @property
+    def model(self):
+        """Process-wide Gemini model, configured on first use"""
+        return ai_clients.gemini(self.model_name)
+    
+    async def _complete(self, prompt: str) -> str:
+        """Run one completion and return its text"""
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+    
+    def _build_prompt(self, topic: str, niche: str, target_market: str, region: str) -> str:
+        return f"""
+Write a luxury travel blog post about {topic}.
+
+Target Market: {target_market}
+Region: {region}
+Niche: {niche}
+
+Requirements:
+1. Length: 2000-2500 words
+2. SEO optimized with H2/H3 headers
+3. Engaging introduction and conclusion
+4. Include 5-7 naturally integrated affiliate recommendations for:
+    - Hotels/accommodation (Booking.com or other accommodation platforms)
+   - Tours/activities (GetYourGuide or Viator)
+5. Include practical information and insider tips
+6. Professional tone for luxury audience
+
+Return as JSON with these fields:
+{{
+    "title": "Post title",
+    "slug": "url-slug",
+    "meta_description": "SEO description (max 155 chars)",
+    "content": "Full post content with HTML headers",
+    "keywords": ["keyword1", "keyword2", ...],
+    "affiliate_suggestions": [
+        {{"type": "hotel", "name": "Hotel Name", "platform": "booking.com", "link": "..."}},
+        ...
+    ]
+}}
+"""
+    
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as Gemini produces them"""
+        response = await self.model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            yield chunk.text
+    
+    def stream_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> AsyncIterator[Dict]:
+        """Stream the post as it is written; the last event carries the parsed post"""
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        return stream_post_events(self, prompt, bypass_cache)
+    
+    async def generate_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> Dict:
+        """Generate complete blog post, reusing a cached result for an identical prompt"""
+        
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        
+        if not bypass_cache:
+            cached = self.cache.get(self.provider, self.model_name, prompt)
+            if cached is not None:
+                return cached
+        
+        try:
+            text = await self._complete(prompt)
+            post_data = await parse_post_response(text, prompt, self._complete)
+            self.cache.set(self.provider, self.model_name, prompt, post_data)
+            return post_data
+            
+        except ValueError as e:
+            raise ValueError(f"Failed to parse Gemini response: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Content generation error: {str(e)}")
@@ -7,25 +7,46 @@ Purpose: Content generation using OpenAI GPT-4
 Install: pip install openai
 """
 
-import openai
 import os
-import json
-from typing import Dict
+from typing import AsyncIterator, Dict
+
+from .ai_clients import ai_clients
+from .generation_cache import GenerationCache
+from .response_parser import parse_post_response
+from .streaming import stream_post_events
 
 class ContentEngine:
     """Content generation using OpenAI GPT-4"""
     
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+    provider = "openai"
+    model_name = "gpt-4-turbo-preview"
+    
+    def __init__(self, cache: GenerationCache = None):
+        if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY not set in environment")
         
-        self.client = openai.OpenAI(api_key=api_key)
+        self.cache = cache or GenerationCache()
     
-    async def generate_blog_post(self, topic: str, niche: str, target_market: str, region: str) -> Dict:
-        """Generate complete blog post"""
-        
-        prompt = f"""
+    @property
+    def client(self):
+        """Process-wide AsyncOpenAI client, created on first use"""
+        return ai_clients.openai()
+    
+    async def _complete(self, prompt: str) -> str:
+        """Run one completion and return its text"""
+        response = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are a professional travel writer specializing in luxury travel content and SEO optimization."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=4000,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+    
+    def _build_prompt(self, topic: str, niche: str, target_market: str, region: str) -> str:
+        return f"""
 Write a luxury travel blog post about {topic}.
 
 Target Market: {target_market}
@@ -55,30 +76,45 @@ Return as JSON with these fields:
     ]
 }}
 """
+    
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield text chunks as GPT-4 produces them"""
+        stream = await self.client.chat.completions.create(
+            model=self.model_name,
+            messages=[
+                {"role": "system", "content": "You are a professional travel writer specializing in luxury travel content and SEO optimization."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=4000,
+            temperature=0.7,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+    
+    def stream_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> AsyncIterator[Dict]:
+        """Stream the post as it is written; the last event carries the parsed post"""
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        return stream_post_events(self, prompt, bypass_cache)
+    
+    async def generate_blog_post(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> Dict:
+        """Generate complete blog post, reusing a cached result for an identical prompt"""
+        
+        prompt = self._build_prompt(topic, niche, target_market, region)
+        
+        if not bypass_cache:
+            cached = self.cache.get(self.provider, self.model_name, prompt)
+            if cached is not None:
+                return cached
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
-                messages=[
-                    {"role": "system", "content": "You are a professional travel writer specializing in luxury travel content and SEO optimization."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=4000,
-                temperature=0.7
-            )
-            
-            text = response.choices[0].message.content
-            
-            # Remove markdown code blocks if present
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
-            
-            post_data = json.loads(text)
+            text = await self._complete(prompt)
+            post_data = await parse_post_response(text, prompt, self._complete)
+            self.cache.set(self.provider, self.model_name, prompt, post_data)
             return post_data
             
-        except json.JSONDecodeError:
-            raise ValueError(f"Failed to parse OpenAI response as JSON: {text}")
+        except ValueError as e:
+            raise ValueError(f"Failed to parse OpenAI response: {str(e)}")
         except Exception as e:
             raise Exception(f"Content generation error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,305 @@
+# ============================================================================
+# FILE: backend/services/email_outbox.py
+# ============================================================================
+"""
+Location: backend/services/email_outbox.py
+Purpose: Durable, rate-limited email outbox built on EmailCampaign
+"""
+
+import os
+import time
+import asyncio
+import random
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, func, and_, or_, text
+
+from models import EmailCampaign, EmailDelivery
+
+logger = logging.getLogger(__name__)
+
+# Postgres advisory lock key held by whichever process is currently sending
+SENDER_LOCK_KEY = 0x0E3A11
+
+
+class TokenBucket:
+    """Allows `rate` operations per second with bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available, else return how long to wait for one"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait for a token without blocking the event loop"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """5xx rejections will not succeed on retry; everything else might"""
+    import smtplib
+
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailOutbox:
+    """
+    Queues one delivery row per recipient and drains them at the provider's pace.
+
+    The token bucket lives in the process, so the provider quota only holds
+    if one process sends at a time. On Postgres each drain takes an advisory
+    lock first and the other web workers skip their turn while it is held.
+    Other databases are single-host; run one worker there (WEB_CONCURRENCY=1).
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        email_service,
+        rate: float = None,
+        burst: int = None,
+        max_attempts: int = None,
+        retry_delay: float = None,
+        batch_size: int = 500
+    ):
+        self.session_factory = session_factory
+        self.email_service = email_service
+        self.bucket = TokenBucket(
+            rate or float(os.getenv("EMAIL_RATE_PER_SECOND", "5")),
+            burst or int(os.getenv("EMAIL_RATE_BURST", "10"))
+        )
+        self.max_attempts = max_attempts or int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+        # First retry waits this long; each further attempt doubles it
+        self.retry_delay = retry_delay or float(os.getenv("EMAIL_RETRY_DELAY", "60"))
+        self.batch_size = batch_size
+        # Claims older than this belong to a worker that died mid-send
+        self.lease = float(os.getenv("EMAIL_OUTBOX_LEASE", "300"))
+        # Claim no more than the bucket can send in half a lease, so live claims never look abandoned
+        self.claim_size = max(1, min(batch_size, int(self.bucket.rate * self.lease / 2)))
+        self.poll_interval = float(os.getenv("EMAIL_OUTBOX_POLL", "5"))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def create_campaign(self, name: str, subject: str, html_body: str, recipient_chunks: Iterable[List[str]]) -> str:
+        """
+        Store a campaign and a pending delivery per recipient.
+
+        Recipients arrive as chunks (see subscribers.stream_active_emails) and
+        each chunk is inserted as it comes, so memory stays flat however long
+        the list is. Addresses must be unique, as subscriber emails are.
+        """
+        db = self.session_factory()
+        try:
+            campaign = EmailCampaign(name=name, subject=subject, content=html_body, status="queued")
+            db.add(campaign)
+            db.flush()
+
+            total = 0
+            for chunk in recipient_chunks:
+                if chunk:
+                    total += self._insert_deliveries(db, [
+                        {"campaign_id": campaign.id, "email": email} for email in chunk
+                    ])
+
+            campaign.total_recipients = total
+            if not total:
+                campaign.status = "sent"
+                campaign.sent_at = datetime.utcnow()
+            db.commit()
+            return campaign.id
+        finally:
+            db.close()
+
+    @staticmethod
+    def _insert_deliveries(db, rows: List[Dict]) -> int:
+        # Column defaults fill in id, status, attempts and next_attempt_at
+        db.execute(insert(EmailDelivery), rows)
+        return len(rows)
+
+    def _claim(self, db) -> List[EmailDelivery]:
+        """Lock a batch of due deliveries for this worker"""
+        now = datetime.utcnow()
+        query = db.query(EmailDelivery).filter(
+            or_(
+                and_(EmailDelivery.status == "pending", EmailDelivery.next_attempt_at <= now),
+                and_(EmailDelivery.status == "sending", EmailDelivery.claimed_at < now - timedelta(seconds=self.lease))
+            )
+        ).order_by(EmailDelivery.next_attempt_at).limit(self.claim_size)
+        if db.get_bind().dialect.name == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+
+        batch = query.all()
+        for delivery in batch:
+            delivery.status = "sending"
+            delivery.claimed_at = now
+        db.commit()
+        return batch
+
+    def _send(self, db, delivery: EmailDelivery, campaign: EmailCampaign) -> None:
+        self.bucket.acquire()
+        delivery.attempts += 1
+        try:
+            msg = self.email_service.build_message(
+                delivery.email,
+                {"subject": campaign.subject, "body_html": campaign.content or "", "body_text": None}
+            )
+            self.email_service.pool.deliver(delivery.email, msg)
+        except Exception as e:
+            delivery.last_error = str(e)
+            if is_permanent_failure(e) or delivery.attempts >= self.max_attempts:
+                delivery.status = "failed"
+            else:
+                delay = self.retry_delay * 2 ** (delivery.attempts - 1)
+                delivery.status = "pending"
+                delivery.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+        else:
+            delivery.status = "sent"
+            delivery.sent_at = datetime.utcnow()
+            delivery.last_error = None
+        # Commit per message so a crash can repeat at most the one in flight
+        db.commit()
+
+    @contextmanager
+    def _sender_lock(self, db):
+        """Yield whether this process may send; on Postgres one process at a time may"""
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            yield True
+            return
+        with bind.connect() as conn:
+            held = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SENDER_LOCK_KEY}).scalar()
+            conn.commit()
+            try:
+                yield held
+            finally:
+                if held:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SENDER_LOCK_KEY})
+                    conn.commit()
+
+    def drain(self) -> int:
+        """Send every delivery that is currently due; returns how many were attempted"""
+        attempted = 0
+        db = self.session_factory()
+        # Rows are committed one by one; don't reload the whole batch after each
+        db.expire_on_commit = False
+        try:
+            with self._sender_lock(db) as held:
+                while held and not self._stop.is_set():
+                    batch = self._claim(db)
+                    if not batch:
+                        break
+                    campaigns = {}
+                    for delivery in batch:
+                        if self._stop.is_set():
+                            # Hand unsent claims straight back instead of waiting for the lease
+                            delivery.status = "pending"
+                            continue
+                        if delivery.campaign_id not in campaigns:
+                            campaigns[delivery.campaign_id] = db.get(EmailCampaign, delivery.campaign_id)
+                        self._send(db, delivery, campaigns[delivery.campaign_id])
+                        attempted += 1
+                    db.commit()
+                    self._finish_campaigns(db, list(campaigns))
+                    db.expunge_all()
+        finally:
+            db.close()
+        return attempted
+
+    def _finish_campaigns(self, db, campaign_ids: List[str]) -> None:
+        """Update totals and close out campaigns with nothing left to send"""
+        for campaign_id in campaign_ids:
+            counts = dict(
+                db.query(EmailDelivery.status, func.count(EmailDelivery.id))
+                .filter(EmailDelivery.campaign_id == campaign_id)
+                .group_by(EmailDelivery.status)
+                .all()
+            )
+            campaign = db.get(EmailCampaign, campaign_id)
+            campaign.total_sent = counts.get("sent", 0)
+            campaign.total_failed = counts.get("failed", 0)
+            if not counts.get("pending") and not counts.get("sending"):
+                campaign.status = "sent"
+                campaign.sent_at = datetime.utcnow()
+            else:
+                campaign.status = "sending"
+        db.commit()
+
+    def campaign_status(self, campaign_id: str) -> Optional[Dict]:
+        """Delivery progress for a campaign"""
+        db = self.session_factory()
+        try:
+            campaign = db.get(EmailCampaign, campaign_id)
+            if not campaign:
+                return None
+            counts = dict(
+                db.query(EmailDelivery.status, func.count(EmailDelivery.id))
+                .filter(EmailDelivery.campaign_id == campaign_id)
+                .group_by(EmailDelivery.status)
+                .all()
+            )
+            return {
+                "id": campaign.id,
+                "name": campaign.name,
+                "status": campaign.status,
+                "total_recipients": campaign.total_recipients,
+                "deliveries": counts,
+                "sent_at": campaign.sent_at.isoformat() if campaign.sent_at else None
+            }
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"Email outbox drain failed: {str(e)}")
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        """Start the background drain thread; unfinished deliveries resume from the table"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop after the message in flight; claimed but unsent rows go back to pending"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
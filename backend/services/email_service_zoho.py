@@ -6,6 +6,8 @@ from email.mime.multipart import MIMEMultipart
 import smtplib
 from dotenv import load_dotenv
 
+from .smtp_pool import SMTPPool
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,6 +28,13 @@ class EmailService:
         load_dotenv()
         self.config = self._load_config()
         self._validate_config()
+        # Logged-in connections are reused across messages
+        self.pool = SMTPPool(
+            self.config['smtp_server'],
+            self.config['smtp_port'],
+            self.config['smtp_email'],
+            self.config['smtp_password']
+        )
 
     def _load_config(self) -> EmailConfig:
         """Load email configuration from environment variables."""
@@ -43,6 +52,19 @@ class EmailService:
         if missing_fields:
             raise ValueError(f"Missing required email configuration: {', '.join(missing_fields)}")
 
+    def build_message(self, to_email: str, content: EmailContent) -> MIMEMultipart:
+        """Build the MIME message for one recipient."""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = content['subject']
+        msg['From'] = self.config['smtp_email']
+        msg['To'] = to_email
+
+        # Add HTML and plain text versions
+        if content.get('body_text'):
+            msg.attach(MIMEText(content['body_text'], 'plain'))
+        msg.attach(MIMEText(content['body_html'], 'html'))
+        return msg
+
     def send_email(self, to_email: str, content: EmailContent) -> bool:
         """
         Send an email using the configured SMTP server.
@@ -54,28 +76,29 @@ class EmailService:
         Returns:
             bool: True if email was sent successfully, False otherwise
         """
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = content['subject']
-            msg['From'] = self.config['smtp_email']
-            msg['To'] = to_email
-
-            # Add HTML and plain text versions
-            if content.get('body_text'):
-                msg.attach(MIMEText(content['body_text'], 'plain'))
-            msg.attach(MIMEText(content['body_html'], 'html'))
-
-            with smtplib.SMTP(self.config['smtp_server'], self.config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.config['smtp_email'], self.config['smtp_password'])
-                server.send_message(msg)
-                
+        if self.pool.send(to_email, self.build_message(to_email, content)):
             logger.info(f"Email sent successfully to {to_email}")
             return True
+        return False
 
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {str(e)}")
-            return False
+    def send_bulk(self, to_emails: List[str], content: EmailContent, parallel: Optional[int] = None) -> Dict:
+        """
+        Send emails to multiple recipients over pooled, parallel connections.
+
+        Args:
+            to_emails: List of recipient email addresses
+            content: EmailContent containing subject and body
+            parallel: Number of concurrent SMTP connections (defaults to SMTP_POOL_SIZE)
+
+        Returns:
+            Dict: Per-recipient results, sent/failed totals and messages per second
+        """
+        report = self.pool.send_many(
+            ((email, self.build_message(email, content)) for email in to_emails),
+            parallel=parallel
+        )
+        logger.info(f"Bulk send: {report['sent']} sent, {report['failed']} failed ({report['per_second']}/s)")
+        return report
 
     def send_bulk_email(self, to_emails: List[str], content: EmailContent) -> Dict[str, bool]:
         """
@@ -88,10 +111,22 @@ class EmailService:
         Returns:
             Dict[str, bool]: Map of email addresses to success/failure status
         """
-        results = {}
-        for email in to_emails:
-            results[email] = self.send_email(email, content)
-        return results
+        return self.send_bulk(to_emails, content)['results']
+
+    def new_post_content(self, post_title: str, post_url: str) -> EmailContent:
+        """Build the new-post notification sent to subscribers."""
+        html = f"""
+        <html>
+            <body style="font-family: Arial, sans-serif; color: #333;">
+                <h2 style="color: #0066cc;">🌍 New Blog Post Published!</h2>
+                <h3>{post_title}</h3>
+                <p>Check out our latest article about luxury travel in South Africa.</p>
+                <p><a href="{post_url}" style="background: #0066cc; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px; display: inline-block;">Read Now</a></p>
+                <p>Best regards,<br>The Travel Blog Team</p>
+            </body>
+        </html>
+        """
+        return EmailContent(subject=f"New Blog Post: {post_title}", body_html=html, body_text=None)
 
     def test_connection(self) -> bool:
         """Test the email connection configuration."""
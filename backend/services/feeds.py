@@ -0,0 +1,294 @@
+# ============================================================================
+# FILE: backend/services/feeds.py
+# ============================================================================
+"""
+Location: backend/services/feeds.py
+Purpose: Sitemap and RSS XML, produced piece by piece from rows of posts
+"""
+
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from sqlalchemy import and_, func, or_, select
+
+from models import BlogPost
+
+# Most URLs a single sitemap file may list
+SITEMAP_LIMIT = 50000
+
+
+def site_url() -> str:
+    """Public origin of the blog, without a trailing slash"""
+    return (os.getenv("SITE_URL") or f"https://{os.getenv('DOMAIN', 'localhost')}").rstrip("/")
+
+
+def site_name() -> str:
+    return os.getenv("SITE_NAME", "Travel Blog")
+
+
+def post_path(slug: str) -> str:
+    return f"/posts/{slug}/"
+
+
+def sitemap_chunk_path(n: int) -> str:
+    return f"/sitemaps/posts-{n}.xml"
+
+
+def _w3c(moment: datetime) -> str:
+    return moment.replace(microsecond=0).isoformat() + "Z"
+
+
+def _rfc822(moment: datetime) -> str:
+    return format_datetime(moment.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+SITEMAP_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+SITEMAP_TAIL = "</urlset>\n"
+
+
+def sitemap_url(row, base_url: str) -> str:
+    modified = row.updated_at or row.published_at
+    lastmod = f"<lastmod>{_w3c(modified)}</lastmod>" if modified else ""
+    return f"<url><loc>{escape(base_url + post_path(row.slug))}</loc>{lastmod}</url>\n"
+
+
+def sitemap_urlset(rows: Iterable, base_url: str = None) -> Iterator[str]:
+    """<urlset> for posts with `slug` and `updated_at` (or `published_at`)"""
+    base_url = base_url or site_url()
+    yield SITEMAP_HEAD
+    for row in rows:
+        yield sitemap_url(row, base_url)
+    yield SITEMAP_TAIL
+
+
+def sitemap_index(chunks: Iterable[Tuple[int, Optional[datetime]]], base_url: str = None) -> Iterator[str]:
+    """<sitemapindex> over (chunk number, lastmod) pairs"""
+    base_url = base_url or site_url()
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for n, lastmod in chunks:
+        modified = f"<lastmod>{_w3c(lastmod)}</lastmod>" if lastmod else ""
+        yield f"<sitemap><loc>{escape(base_url + sitemap_chunk_path(n))}</loc>{modified}</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def rss_head(base_url: str, title: str, description: str = "") -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+        f"<title>{escape(title)}</title><link>{escape(base_url)}/</link>"
+        f"<description>{escape(description or title)}</description>\n"
+    )
+
+
+RSS_TAIL = "</channel></rss>\n"
+
+
+def rss_item(row, base_url: str) -> str:
+    link = escape(base_url + post_path(row.slug))
+    published = f"<pubDate>{_rfc822(row.published_at)}</pubDate>" if row.published_at else ""
+    return (
+        f"<item><title>{escape(row.title or '')}</title><link>{link}</link>"
+        f'<guid isPermaLink="true">{link}</guid>{published}'
+        f"<description>{escape(row.excerpt or '')}</description></item>\n"
+    )
+
+
+def rss_channel(rows: Iterable, base_url: str = None, title: str = None, description: str = "") -> Iterator[str]:
+    """RSS 2.0 feed for posts with `slug`, `title`, `excerpt` and `published_at`, newest first"""
+    base_url = base_url or site_url()
+    yield rss_head(base_url, title or site_name(), description)
+    for row in rows:
+        yield rss_item(row, base_url)
+    yield RSS_TAIL
+
+
+async def _buffered(pieces: AsyncIterator[str], size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Coalesce many small strings into network-sized chunks"""
+    buffer, length = [], 0
+    async for piece in pieces:
+        buffer.append(piece)
+        length += len(piece)
+        if length >= size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+async def _document(head: str, item: Callable, rows: AsyncIterator, tail: str, base_url: str) -> AsyncIterator[str]:
+    yield head
+    async for row in rows:
+        yield item(row, base_url)
+    yield tail
+
+
+class FeedService:
+    """
+    sitemap.xml, its chunk files and rss.xml, streamed from a server-side cursor.
+
+    The sitemap is an index of chunk files of at most `chunk_size` posts in
+    publish order, so new posts land in the last chunk. Each rendered chunk
+    is cached with a fingerprint (post count, latest updated_at and the sort
+    keys of its first and last post) and served from memory until a post in
+    it changes or the chunk's boundaries move; the RSS feed is cached
+    the same way. Fingerprints are themselves reused for `check_interval`
+    seconds, so a burst of crawler hits costs one aggregate query.
+    `session_factory` returns an AsyncSession.
+    """
+
+    def __init__(self, session_factory, chunk_size: int = None, feed_size: int = None, base_url: str = None,
+                 max_cached: int = 32, check_interval: float = None):
+        self.session_factory = session_factory
+        self.chunk_size = min(chunk_size or int(os.getenv("SITEMAP_CHUNK_SIZE", str(SITEMAP_LIMIT))), SITEMAP_LIMIT)
+        self.feed_size = feed_size or int(os.getenv("RSS_FEED_SIZE", "50"))
+        self.base_url = (base_url or site_url()).rstrip("/")
+        self.max_cached = max_cached
+        self.check_interval = check_interval if check_interval is not None else float(
+            os.getenv("FEED_CHECK_INTERVAL", "10")
+        )
+        self._cache: "OrderedDict[object, Tuple[tuple, bytes]]" = OrderedDict()
+        self._fingerprints: Dict[str, Tuple[float, object]] = {}
+
+    @staticmethod
+    def _published():
+        return (BlogPost.status == "published", BlogPost.published_at.isnot(None))
+
+    async def _fingerprint(self, name: str, query):
+        checked = self._fingerprints.get(name)
+        if checked and time.monotonic() - checked[0] < self.check_interval:
+            return checked[1]
+        async with self.session_factory() as db:
+            value = await query(db)
+        self._fingerprints[name] = (time.monotonic(), value)
+        return value
+
+    async def chunks(self, db) -> List[Tuple[int, int, Optional[datetime], tuple, tuple]]:
+        """
+        (chunk number, posts, latest updated_at, first key, last key) for every
+        sitemap chunk, in one query; keys are (published_at, id)
+        """
+        numbered = select(
+            (func.row_number().over(order_by=(BlogPost.published_at, BlogPost.id)) - 1).label("position"),
+            BlogPost.published_at,
+            BlogPost.id,
+            func.coalesce(BlogPost.updated_at, BlogPost.published_at).label("modified")
+        ).where(*self._published()).subquery()
+        chunk = numbered.c.position // self.chunk_size
+        chunked = select(
+            chunk.label("chunk"),
+            numbered.c.position,
+            numbered.c.published_at,
+            numbered.c.id,
+            func.count().over(partition_by=chunk).label("count"),
+            func.max(numbered.c.modified).over(partition_by=chunk).label("modified")
+        ).subquery()
+        # Only the first and last row of each chunk come back
+        offset = chunked.c.position % self.chunk_size
+        rows = await db.execute(
+            select(chunked)
+            .where(or_(offset == 0, offset == chunked.c.count - 1))
+            .order_by(chunked.c.position)
+        )
+
+        summary = []
+        for row in rows:
+            key = (row.published_at, row.id)
+            if row.position % self.chunk_size == 0:
+                summary.append([int(row.chunk) + 1, row.count, row.modified, key, key])
+            else:
+                summary[-1][4] = key
+        return [tuple(entry) for entry in summary]
+
+    def _cached(self, key, fingerprint: tuple) -> Optional[bytes]:
+        entry = self._cache.get(key)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, fingerprint: tuple, body: bytes) -> None:
+        self._cache[key] = (fingerprint, body)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    async def _render(self, key, fingerprint: tuple, pieces: AsyncIterator[str]) -> AsyncIterator[bytes]:
+        """Stream the document, and cache it once it has been produced in full"""
+        parts = []
+        async for chunk in _buffered(pieces):
+            parts.append(chunk)
+            yield chunk
+        self._store(key, fingerprint, b"".join(parts))
+
+    async def _totals(self, db) -> Tuple[int, Optional[datetime]]:
+        return tuple((await db.execute(
+            select(func.count(), func.max(func.coalesce(BlogPost.updated_at, BlogPost.published_at)))
+            .where(*self._published())
+        )).one())
+
+    async def sitemap_index(self) -> bytes:
+        chunks = await self._fingerprint("sitemap", self.chunks)
+        # An empty site still gets one (empty) chunk, so the index is never empty
+        entries = [(n, modified) for n, _, modified, _, _ in chunks] or [(1, None)]
+        return "".join(sitemap_index(entries, self.base_url)).encode("utf-8")
+
+    async def sitemap_chunk(self, n: int) -> Optional[Union[bytes, AsyncIterator[bytes]]]:
+        """Cached bytes, a stream of the chunk, or None if there is no such chunk"""
+        summary = await self._fingerprint("sitemap", self.chunks)
+        chunks = {entry[0]: entry[1:] for entry in summary}
+        if n not in chunks and not (n == 1 and not chunks):
+            return None
+        fingerprint = chunks.get(n, (0, None, None, None))
+        cached = self._cached(("sitemap", n), fingerprint)
+        if cached is not None:
+            return cached
+
+        async def rows():
+            if not fingerprint[0]:
+                return
+            (first_at, first_id), (last_at, last_id) = fingerprint[2], fingerprint[3]
+            async with self.session_factory() as db:
+                # Keyset bounds instead of OFFSET: the plain range lets the planner
+                # scan idx_published_at, the ORs break ties at either end
+                result = await db.stream(
+                    select(BlogPost.slug, BlogPost.updated_at, BlogPost.published_at)
+                    .where(
+                        *self._published(),
+                        BlogPost.published_at.between(first_at, last_at),
+                        or_(BlogPost.published_at > first_at, and_(BlogPost.published_at == first_at, BlogPost.id >= first_id)),
+                        or_(BlogPost.published_at < last_at, and_(BlogPost.published_at == last_at, BlogPost.id <= last_id))
+                    )
+                    .order_by(BlogPost.published_at, BlogPost.id)
+                    .limit(self.chunk_size)
+                    .execution_options(yield_per=1000)
+                )
+                async for row in result:
+                    yield row
+
+        return self._render(
+            ("sitemap", n), fingerprint, _document(SITEMAP_HEAD, sitemap_url, rows(), SITEMAP_TAIL, self.base_url)
+        )
+
+    async def rss(self) -> Union[bytes, AsyncIterator[bytes]]:
+        fingerprint = await self._fingerprint("rss", self._totals)
+        cached = self._cached("rss", fingerprint)
+        if cached is not None:
+            return cached
+
+        async def rows():
+            async with self.session_factory() as db:
+                result = await db.stream(
+                    select(BlogPost.slug, BlogPost.title, BlogPost.excerpt, BlogPost.published_at)
+                    .where(*self._published())
+                    .order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+                    .limit(self.feed_size)
+                )
+                async for row in result:
+                    yield row
+
+        head = rss_head(self.base_url, site_name())
+        return self._render("rss", fingerprint, _document(head, rss_item, rows(), RSS_TAIL, self.base_url))
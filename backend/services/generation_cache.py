@@ -0,0 +1,99 @@
+# ============================================================================
+# FILE: backend/services/generation_cache.py
+# ============================================================================
+"""
+Location: backend/services/generation_cache.py
+Purpose: Content-addressed on-disk cache of parsed LLM generations
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationCache:
+    """Caches parsed posts by (provider, model, prompt) with TTL and a size cap"""
+
+    def __init__(self, directory: str = None, ttl: float = None, max_bytes: int = None):
+        self.directory = directory or os.getenv(
+            "GENERATION_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "travel-blog-generation-cache")
+        )
+        self.ttl = ttl or float(os.getenv("GENERATION_CACHE_TTL", "86400"))
+        self.max_bytes = max_bytes or int(os.getenv("GENERATION_CACHE_MAX_MB", "100")) * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str) -> str:
+        raw = json.dumps([provider, model, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, provider: str, model: str, prompt: str) -> Optional[Dict]:
+        """Return the cached result, or None if missing or expired"""
+        path = self._path(self.key(provider, model, prompt))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("created_at", 0) + self.ttl < time.time():
+            self._remove(path)
+            return None
+
+        # mtime doubles as last access time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["result"]
+
+    def set(self, provider: str, model: str, prompt: str, result: Dict) -> None:
+        """Store a parsed result, then evict least recently used entries over the cap"""
+        path = self._path(self.key(provider, model, prompt))
+        entry = {"provider": provider, "model": model, "created_at": time.time(), "result": result}
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error(f"Failed to write generation cache entry: {str(e)}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
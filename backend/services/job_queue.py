@@ -0,0 +1,226 @@
+# ============================================================================
+# FILE: backend/services/job_queue.py
+# ============================================================================
+"""
+Location: backend/services/job_queue.py
+Purpose: Postgres-backed job queue for background post generation
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import update, or_, and_
+
+from models import GenerationJob
+
+logger = logging.getLogger(__name__)
+
+# Handler receives the claimed job (detached from any session), returns the new post id
+JobHandler = Callable[[GenerationJob], Awaitable[Optional[str]]]
+
+
+class GenerationQueue:
+    """
+    Runs generation jobs on a bounded pool of asyncio workers.
+
+    Job bookkeeping runs in threads with short-lived sessions, so no
+    database work blocks the event loop and no transaction stays open
+    while the handler waits on the model.
+    """
+
+    def __init__(self, session_factory, handler: JobHandler, workers: int = None, stale_after: float = None):
+        self.session_factory = session_factory
+        self.handler = handler
+        self.workers = workers or int(os.getenv("GENERATION_WORKERS", "2"))
+        # Jobs left "running" this long are assumed orphaned by a dead process
+        self.stale_after = stale_after or float(os.getenv("GENERATION_JOB_TIMEOUT", "600"))
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    def _create(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool) -> GenerationJob:
+        db = self.session_factory()
+        try:
+            job = GenerationJob(
+                topic=topic,
+                niche=niche,
+                target_market=target_market,
+                region=region,
+                bypass_cache=bypass_cache,
+                status="queued"
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def submit(self, topic: str, niche: str, target_market: str, region: str, bypass_cache: bool = False) -> GenerationJob:
+        """Persist a new job and queue it for the workers"""
+        job = self._create(topic, niche, target_market, region, bypass_cache)
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    async def submit_async(self, topic: str, niche: str, target_market: str, region: str,
+                           bypass_cache: bool = False) -> GenerationJob:
+        """submit() with the insert run off the event loop"""
+        job = await asyncio.to_thread(self._create, topic, niche, target_market, region, bypass_cache)
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job's current state"""
+        db = self.session_factory()
+        try:
+            job = db.get(GenerationJob, job_id)
+            if not job:
+                return None
+            return {
+                "id": job.id,
+                "topic": job.topic,
+                "status": job.status,
+                "attempts": job.attempts,
+                "post_id": job.blog_post_id,
+                "error": job.error,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None
+            }
+        finally:
+            db.close()
+
+    async def get_async(self, job_id: str) -> Optional[Dict]:
+        """get() run off the event loop"""
+        return await asyncio.to_thread(self.get, job_id)
+
+    def _recover(self) -> int:
+        """Queue jobs persisted as queued, and running jobs whose owner has died"""
+        stale = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        db = self.session_factory()
+        try:
+            jobs = db.query(GenerationJob.id).filter(
+                or_(
+                    GenerationJob.status == "queued",
+                    and_(GenerationJob.status == "running", GenerationJob.started_at < stale)
+                )
+            ).order_by(GenerationJob.created_at).all()
+            for (job_id,) in jobs:
+                self._queue.put_nowait(job_id)
+            return len(jobs)
+        finally:
+            db.close()
+
+    def _claim(self, db, job_id: str) -> bool:
+        """Atomically move a job to running so only one worker executes it"""
+        stale = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        result = db.execute(
+            update(GenerationJob)
+            .where(
+                GenerationJob.id == job_id,
+                or_(
+                    GenerationJob.status == "queued",
+                    and_(GenerationJob.status == "running", GenerationJob.started_at < stale)
+                )
+            )
+            .values(
+                status="running",
+                started_at=datetime.utcnow(),
+                attempts=GenerationJob.attempts + 1
+            )
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _start_job(self, job_id: str) -> Optional[GenerationJob]:
+        """Claim a job and return a detached copy, or None if another worker has it"""
+        db = self.session_factory()
+        try:
+            if not self._claim(db, job_id):
+                return None
+            job = db.get(GenerationJob, job_id)
+            db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _finish_job(self, job_id: str, post_id: Optional[str], error: Optional[Exception]) -> None:
+        db = self.session_factory()
+        try:
+            job = db.get(GenerationJob, job_id)
+            if error is not None:
+                job.status = "failed"
+                job.error = str(error)
+            else:
+                job.status = "succeeded"
+                job.blog_post_id = post_id
+                job.error = None
+            job.finished_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+
+    def _release_job(self, job_id: str) -> None:
+        """Put a job interrupted by shutdown back in the queue for the next start"""
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, GenerationJob.status == "running")
+                .values(status="queued", started_at=None)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    async def _run_job(self, job_id: str) -> None:
+        # Shielded so a claim that lands while we are being cancelled is still released
+        claim = asyncio.ensure_future(asyncio.to_thread(self._start_job, job_id))
+        try:
+            job = await asyncio.shield(claim)
+        except asyncio.CancelledError:
+            if await claim is not None:
+                await asyncio.to_thread(self._release_job, job_id)
+            raise
+        if job is None:
+            return
+        post_id, error = None, None
+        try:
+            post_id = await self.handler(job)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self._release_job, job_id)
+            raise
+        except Exception as e:
+            error = e
+            logger.error(f"Generation job {job_id} failed: {str(e)}")
+        await asyncio.to_thread(self._finish_job, job_id, post_id, error)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                logger.error(f"Generation worker error on job {job_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def start(self) -> None:
+        """Recover persisted jobs and start the workers on the running loop"""
+        self._queue = asyncio.Queue()
+        recovered = await asyncio.to_thread(self._recover)
+        if recovered:
+            logger.info(f"Recovered {recovered} generation jobs")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to queued for the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,44 @@
+# ============================================================================
+# FILE: backend/services/lazy.py
+# ============================================================================
+"""
+Location: backend/services/lazy.py
+Purpose: Defer building heavy services until they are first used
+"""
+
+import threading
+from typing import Callable
+
+
+class LazyService:
+    """
+    Stands in for a service and builds it on first attribute access.
+
+    Lets the API import and serve reads without loading provider SDKs or
+    SMTP code, or failing on missing keys, until a route needs them.
+    """
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self):
+        """The real service, built on the first call"""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def __class__(self):
+        # isinstance() checks see the real service
+        return self.get().__class__
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
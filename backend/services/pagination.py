@@ -0,0 +1,100 @@
+# ============================================================================
+# FILE: backend/services/pagination.py
+# ============================================================================
+"""
+Location: backend/services/pagination.py
+Purpose: Keyset (cursor) pagination over published posts
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import Select, and_, or_, select
+
+from models import BlogPost
+
+# Columns returned by the listing; content and JSON columns are never loaded
+LISTING_COLUMNS = (
+    BlogPost.id,
+    BlogPost.title,
+    BlogPost.slug,
+    BlogPost.excerpt,
+    BlogPost.views,
+    BlogPost.published_at,
+)
+
+
+def encode_cursor(published_at: datetime, post_id: str) -> str:
+    """Encode the sort key of the last row on a page"""
+    raw = json.dumps([published_at.isoformat(), post_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(published_at), str(post_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def published_page_query(cursor: Optional[str] = None, limit: int = 20) -> Select:
+    """Select one page of published posts ordered by (published_at, id) descending"""
+
+    query = select(*LISTING_COLUMNS).where(
+        BlogPost.status == "published",
+        BlogPost.published_at.isnot(None)
+    )
+
+    if cursor:
+        published_at, post_id = decode_cursor(cursor)
+        # The plain upper bound lets the planner range-scan idx_published_at;
+        # the OR breaks ties between posts published at the same instant
+        query = query.where(
+            BlogPost.published_at <= published_at,
+            or_(
+                BlogPost.published_at < published_at,
+                and_(BlogPost.published_at == published_at, BlogPost.id < post_id)
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(
+        BlogPost.published_at.desc(),
+        BlogPost.id.desc()
+    ).limit(limit + 1)
+
+
+def _page(rows, limit: int) -> Dict:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "posts": [
+            {
+                "id": r.id,
+                "title": r.title,
+                "slug": r.slug,
+                "excerpt": r.excerpt,
+                "views": r.views,
+                "published_at": r.published_at.isoformat()
+            }
+            for r in rows
+        ],
+        "next_cursor": encode_cursor(rows[-1].published_at, rows[-1].id) if has_more else None
+    }
+
+
+def published_page(db, cursor: Optional[str] = None, limit: int = 20) -> Dict:
+    """Fetch one page of published posts with a sync session"""
+    return _page(db.execute(published_page_query(cursor, limit)).all(), limit)
+
+
+async def published_page_async(db, cursor: Optional[str] = None, limit: int = 20) -> Dict:
+    """Fetch one page of published posts with an AsyncSession"""
+    result = await db.execute(published_page_query(cursor, limit))
+    return _page(result.all(), limit)
@@ -0,0 +1,164 @@
+# ============================================================================
+# FILE: backend/services/post_cache.py
+# ============================================================================
+"""
+Location: backend/services/post_cache.py
+Purpose: Read-through cache for blog posts and the published listing
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import attributes
+
+from models import BlogPost
+
+# Changes to these columns make a cached copy of the post stale
+WATCHED_FIELDS = ("status", "content", "updated_at")
+
+# Page sizes whose listing pages are cached; other limits always go to the database
+LISTING_LIMITS = (10, 20, 50, 100)
+
+
+class PostCache:
+    """
+    Size-bounded LRU caches with TTL for posts, keyed by slug, and listing pages.
+
+    Listing pages are keyed by client-supplied cursors, so they live in a
+    separate, smaller LRU and can never push posts out.
+    """
+
+    def __init__(self, max_size: int = None, ttl: float = None, max_listings: int = None):
+        self.max_size = max_size or int(os.getenv("POST_CACHE_SIZE", "500"))
+        self.max_listings = max_listings or int(os.getenv("POST_CACHE_LISTINGS", "50"))
+        self.ttl = ttl or float(os.getenv("POST_CACHE_TTL", "300"))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._listings: "OrderedDict[Tuple[Optional[str], int], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, entries: OrderedDict, key) -> Optional[object]:
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del entries[key]
+                self.misses += 1
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _set(self, entries: OrderedDict, key, value, max_size: int) -> None:
+        with self._lock:
+            entries[key] = (time.monotonic() + self.ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > max_size:
+                entries.popitem(last=False)
+
+    def get_post(self, slug: str, loader: Callable[[], Optional[Dict]]) -> Optional[Dict]:
+        """Return the cached post or load it; missing posts are not cached"""
+        value = self._get(self._entries, slug)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self._set(self._entries, slug, value, self.max_size)
+        return value
+
+    def get_listing(self, cursor: Optional[str], limit: int, loader: Callable[[], Dict]) -> Dict:
+        """Return a cached page of the published listing or load it"""
+        if limit not in LISTING_LIMITS:
+            return loader()
+        value = self._get(self._listings, (cursor, limit))
+        if value is None:
+            value = loader()
+            self._set(self._listings, (cursor, limit), value, self.max_listings)
+        return value
+
+    async def get_post_async(self, slug: str, loader: Callable[[], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        """get_post for an async loader"""
+        value = self._get(self._entries, slug)
+        if value is None:
+            value = await loader()
+            if value is not None:
+                self._set(self._entries, slug, value, self.max_size)
+        return value
+
+    async def get_listing_async(self, cursor: Optional[str], limit: int, loader: Callable[[], Awaitable[Dict]]) -> Dict:
+        """get_listing for an async loader"""
+        if limit not in LISTING_LIMITS:
+            return await loader()
+        value = self._get(self._listings, (cursor, limit))
+        if value is None:
+            value = await loader()
+            self._set(self._listings, (cursor, limit), value, self.max_listings)
+        return value
+
+    def invalidate(self, slug: str) -> None:
+        """Drop a post and every cached listing page"""
+        with self._lock:
+            self._entries.pop(slug, None)
+            self._listings.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._listings.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "listings": len(self._listings),
+                "max_listings": self.max_listings,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+    def watch(self, session_factory, on_invalidate: Callable[[], None] = None) -> None:
+        """
+        Invalidate posts whose watched fields change, once the change commits.
+
+        `on_invalidate` runs after each commit that invalidated something,
+        e.g. to keep the refills off lagging replicas.
+        """
+
+        @event.listens_for(session_factory, "after_flush")
+        def _collect(session, flush_context):
+            stale = session.info.setdefault("post_cache_stale", set())
+            for obj in session.new:
+                if isinstance(obj, BlogPost):
+                    stale.add(obj.slug)
+            for obj in session.deleted:
+                if isinstance(obj, BlogPost):
+                    stale.add(obj.slug)
+            for obj in session.dirty:
+                if not isinstance(obj, BlogPost):
+                    continue
+                if any(attributes.get_history(obj, f).has_changes() for f in WATCHED_FIELDS + ("slug",)):
+                    stale.add(obj.slug)
+                    # A slug change leaves the old key behind as well
+                    stale.update(attributes.get_history(obj, "slug").deleted or ())
+
+        @event.listens_for(session_factory, "after_commit")
+        def _invalidate(session):
+            stale = session.info.pop("post_cache_stale", ())
+            for slug in stale:
+                self.invalidate(slug)
+            if stale and on_invalidate:
+                on_invalidate()
+
+        @event.listens_for(session_factory, "after_rollback")
+        def _discard(session):
+            session.info.pop("post_cache_stale", None)
@@ -0,0 +1,146 @@
+# ============================================================================
+# FILE: backend/services/post_payload.py
+# ============================================================================
+"""
+Location: backend/services/post_payload.py
+Purpose: Pre-serialized, pre-compressed post responses with HTTP validators
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+from models import PostPayload
+
+CACHE_CONTROL = os.getenv("POST_CACHE_CONTROL", "public, max-age=60, s-maxage=300, stale-while-revalidate=600")
+
+# ETag suffix per content coding; each encoding is its own representation
+ENCODING_SUFFIX = {None: "", "gzip": "-gz", "br": "-br"}
+
+
+def post_document(post) -> Dict:
+    """The JSON body of GET /api/posts/{slug}; derived fields come precomputed from `post_metadata`"""
+    metadata = getattr(post, "post_metadata", None) or {}
+    return {
+        "id": post.id,
+        "title": post.title,
+        "slug": post.slug,
+        "content": post.content,
+        "reading_time": metadata.get("reading_time"),
+        "toc": metadata.get("toc", []),
+        "published_at": post.published_at.isoformat() if post.published_at else None
+    }
+
+
+def etag_base(post_id: str, updated_at: datetime) -> str:
+    return hashlib.sha1(f"{post_id}:{updated_at.isoformat()}".encode()).hexdigest()[:20]
+
+
+def preferred_encoding(accept_encoding: Optional[str], available) -> Optional[str]:
+    """br over gzip over identity, honouring q=0 exclusions"""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding] = q
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return None
+
+
+class RenderedPost:
+    """One post version's response bytes, per content coding"""
+
+    __slots__ = ("post_id", "slug", "updated_at", "etag", "bodies")
+
+    def __init__(self, post_id: str, slug: str, updated_at: datetime, etag: str, bodies: Dict[Optional[str], bytes]):
+        self.post_id = post_id
+        self.slug = slug
+        self.updated_at = updated_at
+        self.etag = etag
+        self.bodies = bodies
+
+    @classmethod
+    def render(cls, post, best: bool = True) -> "RenderedPost":
+        """Serialize and compress; `best` trades CPU for size, for one-off work at publish time"""
+        updated_at = post.updated_at or post.published_at or datetime.utcnow()
+        body = json.dumps(post_document(post), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        bodies = {None: body, "gzip": gzip.compress(body, compresslevel=9 if best else 6, mtime=0)}
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=11 if best else 5, mode=brotli.MODE_TEXT)
+        return cls(post.id, post.slug, updated_at, etag_base(post.id, updated_at), bodies)
+
+    @classmethod
+    def from_row(cls, row: PostPayload, slug: str) -> "RenderedPost":
+        bodies = {None: row.body, "gzip": row.body_gzip}
+        if row.body_br is not None:
+            bodies["br"] = row.body_br
+        return cls(row.blog_post_id, slug, row.source_updated_at, row.etag, bodies)
+
+    def to_row(self) -> PostPayload:
+        return PostPayload(
+            blog_post_id=self.post_id,
+            etag=self.etag,
+            source_updated_at=self.updated_at,
+            body=self.bodies[None],
+            body_gzip=self.bodies["gzip"],
+            body_br=self.bodies.get("br")
+        )
+
+    @property
+    def last_modified(self) -> str:
+        return format_datetime(self.updated_at.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+    def not_modified(self, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+        """Whether a conditional GET can be answered with 304"""
+        if if_none_match:
+            # Weak comparison, and any content coding of this version matches
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag == "*":
+                    return True
+                tag = tag.removeprefix("W/").strip('"')
+                if tag.split("-")[0] == self.etag:
+                    return True
+            return False
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            return self.updated_at.replace(microsecond=0) <= since
+        return False
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[bytes, Dict[str, str]]:
+        """Body and headers for the best encoding the client accepts"""
+        coding = preferred_encoding(accept_encoding, self.bodies)
+        headers = self.headers(coding)
+        if coding:
+            headers["Content-Encoding"] = coding
+        return self.bodies[coding], headers
+
+    def headers(self, coding: Optional[str] = None) -> Dict[str, str]:
+        return {
+            "ETag": f'"{self.etag}{ENCODING_SUFFIX[coding]}"',
+            "Last-Modified": self.last_modified,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding"
+        }
@@ -0,0 +1,414 @@
+# ============================================================================
+# FILE: backend/services/post_processing.py
+# ============================================================================
+"""
+Location: backend/services/post_processing.py
+Purpose: Sanitize post HTML and precompute derived fields in a single parse
+"""
+
+import math
+import re
+from datetime import datetime
+from html import escape
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from .affiliate_service import PROVIDER_DOMAINS, PROVIDER_URL, link_id
+
+PIPELINE_VERSION = 1
+
+WORDS_PER_MINUTE = 225
+
+VOID_TAGS = {"area", "br", "col", "hr", "img", "source", "track", "wbr"}
+
+ALLOWED_TAGS = {
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6", "strong", "b", "em", "i", "u", "s", "mark",
+    "small", "sub", "sup", "blockquote", "q", "cite", "ul", "ol", "li", "dl", "dt", "dd", "a", "img",
+    "figure", "figcaption", "picture", "source", "video", "iframe", "table", "thead", "tbody", "tfoot",
+    "tr", "th", "td", "caption", "code", "pre", "span", "div", "section", "article", "aside", "header",
+    "footer", "time", "abbr", "address"
+}
+
+# Dropped together with everything inside them
+DROPPED_WITH_CONTENT = {
+    "script", "style", "object", "embed", "form", "input", "button", "textarea", "select", "option",
+    "noscript", "template", "svg", "math", "head", "title", "meta", "link", "base", "applet", "frameset"
+}
+
+GLOBAL_ATTRS = {"id", "class", "title", "lang", "dir"}
+
+ALLOWED_ATTRS = {
+    "a": {"href", "rel", "target", "hreflang"},
+    "img": {"src", "alt", "width", "height", "loading", "srcset", "sizes", "decoding"},
+    "source": {"src", "srcset", "type", "media", "sizes"},
+    "video": {"src", "poster", "controls", "width", "height", "preload", "muted", "loop", "playsinline"},
+    "iframe": {"src", "width", "height", "allow", "allowfullscreen", "title", "loading", "frameborder"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan", "scope"},
+    "time": {"datetime"},
+    "ol": {"start", "reversed"},
+    "blockquote": {"cite"},
+    "q": {"cite"}
+}
+
+URL_ATTRS = {"href", "src", "poster", "cite"}
+SAFE_SCHEMES = {"", "http", "https", "mailto"}
+
+# Embeds we keep; any other iframe is dropped
+VIDEO_EMBED = re.compile(r"^https://(?:www\.)?(?:youtube(?:-nocookie)?\.com/embed/|player\.vimeo\.com/video/)")
+
+WORD = re.compile(r"\w+(?:['’]\w+)*")
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+
+
+def safe_url(url: str) -> bool:
+    scheme = urlsplit(url.strip()).scheme.lower() if url else ""
+    return scheme in SAFE_SCHEMES
+
+
+class Element:
+    """A start tag being processed; processors may edit `attrs` until the parse ends"""
+
+    __slots__ = ("tag", "attrs")
+
+    def __init__(self, tag: str, attrs: Dict[str, Optional[str]]):
+        self.tag = tag
+        self.attrs = attrs
+
+    def render(self) -> str:
+        parts = [self.tag]
+        for name, value in self.attrs.items():
+            parts.append(name if value is None else f'{name}="{escape(value, quote=True)}"')
+        return f"<{' '.join(parts)}>"
+
+
+class Processor:
+    """
+    Base class for a pipeline step.
+
+    Processors see the sanitized document only: start tags (as mutable
+    Elements), end tags and text, in document order. `finish` adds the
+    processor's results to the shared `result` dict.
+    """
+
+    def start(self, element: Element) -> None:
+        pass
+
+    def end(self, tag: str) -> None:
+        pass
+
+    def text(self, data: str) -> None:
+        pass
+
+    def finish(self, result: Dict) -> None:
+        pass
+
+
+class TableOfContents(Processor):
+    """h2/h3 headings, each given a stable anchor id"""
+
+    def __init__(self, levels: Sequence[str] = ("h2", "h3")):
+        self.levels = set(levels)
+        self.entries: List[Dict] = []
+        self._used = set()
+        self._open: Optional[Element] = None
+        self._text: List[str] = []
+
+    def start(self, element: Element) -> None:
+        if element.attrs.get("id"):
+            self._used.add(element.attrs["id"])
+        if element.tag in self.levels and self._open is None:
+            self._open, self._text = element, []
+
+    def text(self, data: str) -> None:
+        if self._open is not None:
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._open is None or tag != self._open.tag:
+            return
+        title = " ".join("".join(self._text).split())
+        anchor = self._open.attrs.get("id")
+        if not anchor:
+            base = anchor = slugify(title)
+            n = 2
+            while anchor in self._used:
+                anchor, n = f"{base}-{n}", n + 1
+            self._used.add(anchor)
+            self._open.attrs["id"] = anchor
+        if title:
+            self.entries.append({"level": int(tag[1]), "id": anchor, "title": title})
+        self._open = None
+
+    def finish(self, result: Dict) -> None:
+        result["metadata"]["toc"] = self.entries
+
+
+class ReadingStats(Processor):
+    """Word count and reading time"""
+
+    def __init__(self, words_per_minute: int = WORDS_PER_MINUTE):
+        self.words_per_minute = words_per_minute
+        self.words = 0
+
+    def text(self, data: str) -> None:
+        self.words += len(WORD.findall(data))
+
+    def finish(self, result: Dict) -> None:
+        result["metadata"]["word_count"] = self.words
+        result["metadata"]["reading_time"] = math.ceil(self.words / self.words_per_minute) if self.words else 0
+
+
+class Summary(Processor):
+    """Plain-text summary from the first paragraph, for posts without an excerpt"""
+
+    def __init__(self, length: int = 160):
+        self.length = length
+        self.summary = ""
+        self._in_paragraph = False
+        self._text: List[str] = []
+
+    def start(self, element: Element) -> None:
+        if element.tag == "p" and not self.summary:
+            self._in_paragraph, self._text = True, []
+
+    def text(self, data: str) -> None:
+        if self._in_paragraph:
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        if tag == "p" and self._in_paragraph:
+            self._in_paragraph = False
+            self.summary = " ".join("".join(self._text).split())
+
+    def finish(self, result: Dict) -> None:
+        summary = self.summary
+        if len(summary) > self.length:
+            summary = summary[:self.length].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
+        result["summary"] = summary
+
+
+class Media(Processor):
+    """Image and video URLs, in document order"""
+
+    def __init__(self):
+        self.images: List[str] = []
+        self.videos: List[str] = []
+        self._in_video = False
+
+    def start(self, element: Element) -> None:
+        src = element.attrs.get("src")
+        if element.tag == "video":
+            self._in_video = True
+        if not src:
+            return
+        if element.tag == "img":
+            self.images.append(src)
+        elif element.tag in ("iframe", "video") or (element.tag == "source" and self._in_video):
+            self.videos.append(src)
+
+    def end(self, tag: str) -> None:
+        if tag == "video":
+            self._in_video = False
+
+    def finish(self, result: Dict) -> None:
+        result["image_urls"] = list(dict.fromkeys(self.images))
+        result["video_urls"] = list(dict.fromkeys(self.videos))
+
+
+class Links(Processor):
+    """
+    Outbound and affiliate links; affiliate anchors are marked rel="sponsored".
+
+    With `redirect` (link id -> href), affiliate anchors are pointed at it
+    instead of the provider; `tracked` maps hrefs already redirected on an
+    earlier run back to their affiliate entries.
+    """
+
+    def __init__(self, redirect: Callable[[str], str] = None, tracked: Dict[str, Dict] = None):
+        self.redirect = redirect
+        self.tracked = tracked or {}
+        self.outbound: List[str] = []
+        self.affiliate: List[Dict] = []
+        self.internal = 0
+        self._open: Optional[Dict] = None
+
+    def start(self, element: Element) -> None:
+        if element.tag != "a" or not element.attrs.get("href"):
+            return
+        href = element.attrs["href"]
+        match = PROVIDER_URL.match(href)
+        if match:
+            self._open = {
+                "id": link_id(href), "url": href, "provider": PROVIDER_DOMAINS[match.group(1).lower()].value
+            }
+        elif href in self.tracked:
+            self._open = {key: self.tracked[href][key] for key in ("id", "url", "provider")}
+        elif urlsplit(href).scheme in ("http", "https"):
+            self.outbound.append(href)
+            return
+        else:
+            self.internal += 1
+            return
+
+        rel = set((element.attrs.get("rel") or "").split()) | {"sponsored", "noopener"}
+        element.attrs["rel"] = " ".join(sorted(rel))
+        if self.redirect:
+            element.attrs["href"] = self.redirect(self._open["id"])
+        self._open["text"] = ""
+        self.affiliate.append(self._open)
+
+    def text(self, data: str) -> None:
+        if self._open is not None:
+            self._open["text"] += data
+
+    def end(self, tag: str) -> None:
+        if tag == "a" and self._open is not None:
+            self._open["text"] = " ".join(self._open["text"].split())
+            self._open = None
+
+    def finish(self, result: Dict) -> None:
+        result["metadata"]["links"] = {
+            "internal": self.internal,
+            "outbound": list(dict.fromkeys(self.outbound)),
+            "affiliate": self.affiliate
+        }
+
+
+def default_processors(redirect: Callable[[str], str] = None, tracked: Dict[str, Dict] = None) -> List[Processor]:
+    return [TableOfContents(), ReadingStats(), Summary(), Media(), Links(redirect, tracked)]
+
+
+class _Parser(HTMLParser):
+    """Sanitizes while parsing and feeds the kept document to the processors"""
+
+    def __init__(self, processors: List[Processor]):
+        super().__init__(convert_charrefs=True)
+        self.processors = processors
+        self.out: List = []
+        # (tag, emitted) for each open element; skipped elements hide their content
+        self.stack: List[tuple] = []
+        self.skipping = 0
+
+    def _clean_attrs(self, tag: str, attrs) -> Optional[Dict[str, Optional[str]]]:
+        allowed = GLOBAL_ATTRS | ALLOWED_ATTRS.get(tag, set())
+        clean = {}
+        for name, value in attrs:
+            name = name.lower()
+            if name not in allowed or name.startswith("on"):
+                continue
+            if name in URL_ATTRS and not safe_url(value or ""):
+                continue
+            if name == "srcset" and "javascript:" in (value or "").lower():
+                continue
+            clean[name] = value
+        if tag == "iframe" and not VIDEO_EMBED.match(clean.get("src") or ""):
+            return None
+        return clean
+
+    def _open(self, tag: str, attrs, void: bool) -> None:
+        if self.skipping:
+            if not void and tag not in VOID_TAGS:
+                self.stack.append((tag, False))
+                self.skipping += 1
+            return
+
+        attrs = self._clean_attrs(tag, attrs) if tag in ALLOWED_TAGS else None
+        if tag in DROPPED_WITH_CONTENT or (tag == "iframe" and attrs is None):
+            if not void and tag not in VOID_TAGS:
+                self.stack.append((tag, False))
+                self.skipping += 1
+            return
+
+        emitted = tag in ALLOWED_TAGS
+        if emitted:
+            element = Element(tag, attrs)
+            self.out.append(element)
+            for p in self.processors:
+                p.start(element)
+        if not void and tag not in VOID_TAGS:
+            self.stack.append((tag, emitted))
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs, void=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs, void=True)
+        if tag not in VOID_TAGS and not self.skipping and tag in ALLOWED_TAGS:
+            self._close(tag, True)
+
+    def _close(self, tag: str, emitted: bool) -> None:
+        if emitted:
+            self.out.append(f"</{tag}>")
+            for p in self.processors:
+                p.end(tag)
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _ in self.stack):
+            return
+        # Close anything left open inside this element too
+        while self.stack:
+            open_tag, emitted = self.stack.pop()
+            if self.skipping:
+                self.skipping -= 1
+            else:
+                self._close(open_tag, emitted)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skipping:
+            return
+        self.out.append(escape(data, quote=False))
+        for p in self.processors:
+            p.text(data)
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.handle_endtag(self.stack[-1][0])
+
+
+class ContentPipeline:
+    """
+    Runs sanitization and every processor over a post's HTML in one parse.
+
+    Pass `processors` to plug in other steps; a factory is used so each
+    run gets fresh processor state, and receives the keyword arguments
+    given to `process` (see `default_processors`).
+    """
+
+    def __init__(self, processors=default_processors):
+        self.processors = processors
+
+    def process(self, html: str, **options) -> Dict:
+        """Sanitized content plus derived fields, keyed for the BlogPost columns"""
+        processors = self.processors(**options)
+        parser = _Parser(processors)
+        parser.feed(html or "")
+        parser.close()
+
+        result = {
+            "content": "".join(part.render() if isinstance(part, Element) else part for part in parser.out),
+            "metadata": {"pipeline_version": PIPELINE_VERSION, "processed_at": datetime.utcnow().isoformat()},
+            "summary": "",
+            "image_urls": [],
+            "video_urls": []
+        }
+        for p in processors:
+            p.finish(result)
+        return result
+
+    def apply(self, post, **options) -> None:
+        """Process a BlogPost in place"""
+        result = self.process(post.content, **options)
+        post.content = result["content"]
+        post.post_metadata = {**(post.post_metadata or {}), **result["metadata"]}
+        post.image_urls = result["image_urls"]
+        post.video_urls = result["video_urls"]
+        if not post.excerpt:
+            post.excerpt = result["summary"]
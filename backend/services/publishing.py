@@ -0,0 +1,61 @@
+# ============================================================================
+# FILE: backend/services/publishing.py
+# ============================================================================
+"""
+Location: backend/services/publishing.py
+Purpose: One-time work done to a post when it is published
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from models import BlogPost, Monetization
+from .affiliate_service import AffiliateService
+from .click_tracker import click_path
+from .post_payload import RenderedPost
+from .post_processing import ContentPipeline
+
+
+class Publisher:
+    """Publishes drafts, doing expensive content work once instead of per request"""
+
+    def __init__(self, affiliates: AffiliateService = None, pipeline: ContentPipeline = None):
+        self.affiliates = affiliates or AffiliateService()
+        self.pipeline = pipeline or ContentPipeline()
+
+    def prepare(self, post: BlogPost, monetization: Optional[Monetization]) -> None:
+        """
+        Tag affiliate links, then sanitize the body and recompute its derived fields.
+
+        Affiliate links in the body are pointed at their /go/ redirects, and
+        each tracked suggestion gets its `click_url`, so clicks are counted.
+        """
+        post.content = self.affiliates.rewrite_html(post.content)
+        # Links redirected on an earlier publish keep their entries
+        previous = ((post.post_metadata or {}).get("links") or {}).get("affiliate") or []
+        tracked = {click_path(post.id, link["id"]): link for link in previous if link.get("id")}
+        self.pipeline.apply(post, redirect=lambda link_id: click_path(post.id, link_id), tracked=tracked)
+        if monetization is not None:
+            suggestions = self.affiliates.rewrite_suggestions(monetization.affiliate_links)
+            for suggestion in suggestions:
+                if suggestion.get("id"):
+                    suggestion["click_url"] = click_path(post.id, suggestion["id"])
+            monetization.affiliate_links = suggestions
+
+    def publish(self, db, post_id: str) -> Optional[BlogPost]:
+        """Prepare, publish and pre-render a post; returns None if it does not exist"""
+        post = db.get(BlogPost, post_id)
+        if post is None:
+            return None
+
+        monetization = db.query(Monetization).filter(Monetization.blog_post_id == post.id).first()
+        self.prepare(post, monetization)
+
+        post.status = "published"
+        post.published_at = post.published_at or datetime.utcnow()
+        # Set explicitly so the stored payload's ETag matches the committed row
+        post.updated_at = datetime.utcnow()
+        db.merge(RenderedPost.render(post).to_row())
+        db.commit()
+        db.refresh(post)
+        return post
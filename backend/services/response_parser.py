@@ -0,0 +1,206 @@
+# ============================================================================
+# FILE: backend/services/response_parser.py
+# ============================================================================
+"""
+Location: backend/services/response_parser.py
+Purpose: Shared, fault-tolerant parsing of generated posts from LLM output
+"""
+
+import json
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+# Fields the generation prompt asks for, in prompt order
+POST_FIELDS = ("title", "slug", "meta_description", "content", "keywords", "affiliate_suggestions")
+
+_decoder = json.JSONDecoder()
+
+
+class AffiliateSuggestion(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    type: str = ""
+    name: str = ""
+    platform: str = ""
+    link: Optional[str] = None
+
+
+class GeneratedPost(BaseModel):
+    """Schema of a generated post as returned by the content engines"""
+    model_config = ConfigDict(extra="allow")
+
+    title: str = Field(min_length=1)
+    slug: str = Field(min_length=1)
+    meta_description: str = ""
+    content: str = Field(min_length=1)
+    keywords: List[str] = []
+    affiliate_suggestions: List[AffiliateSuggestion] = []
+
+    @field_validator("affiliate_suggestions", mode="before")
+    @classmethod
+    def drop_malformed_suggestions(cls, value):
+        """Suggestions are optional extras: skip bad ones rather than fail the post"""
+        if not isinstance(value, list):
+            return []
+        kept = []
+        for item in value:
+            try:
+                kept.append(AffiliateSuggestion.model_validate(item))
+            except ValidationError:
+                continue
+        return kept
+
+
+class JSONObjectScanner:
+    """
+    Incrementally locates the first top-level JSON object in a text stream.
+
+    Braces are only counted outside JSON strings, so code fences, prose or
+    braces inside the post content do not confuse it.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self.end is not None
+
+    @property
+    def text(self) -> str:
+        """The object seen so far (complete or truncated)"""
+        if self.start is None:
+            return ""
+        return self.buffer[self.start:self.end]
+
+    def feed(self, chunk: str) -> bool:
+        """Consume more text; returns True once the object has closed"""
+        offset = len(self.buffer)
+        self.buffer += chunk
+        if self.complete:
+            return True
+
+        for i, ch in enumerate(chunk, offset):
+            if self.start is None:
+                if ch == "{":
+                    self.start = i
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = i + 1
+                    return True
+        return False
+
+
+def _skip_ws(text: str, i: int) -> int:
+    while i < len(text) and text[i] in " \t\r\n":
+        i += 1
+    return i
+
+
+def salvage_fields(text: str, start: int) -> Dict:
+    """Decode top-level fields one by one, keeping every field that is complete"""
+    fields = {}
+    i = _skip_ws(text, start + 1)
+    while i < len(text):
+        if text[i] == "}":
+            break
+        try:
+            key, i = _decoder.raw_decode(text, i)
+            i = _skip_ws(text, i)
+            if text[i] != ":":
+                break
+            value, i = _decoder.raw_decode(text, _skip_ws(text, i + 1))
+        except (ValueError, IndexError):
+            # Truncated or malformed from here on
+            break
+        fields[key] = value
+        i = _skip_ws(text, i)
+        if i < len(text) and text[i] == ",":
+            i = _skip_ws(text, i + 1)
+    return fields
+
+
+def extract_post_fields(text: str) -> Dict:
+    """Find the post object in model output and return whatever fields are usable"""
+    scanner = JSONObjectScanner()
+    scanner.feed(text)
+    if scanner.start is None:
+        return {}
+    if scanner.complete:
+        try:
+            data = json.loads(scanner.text)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
+    return salvage_fields(text, scanner.start)
+
+
+def missing_fields(fields: Dict) -> List[str]:
+    return [f for f in POST_FIELDS if f not in fields]
+
+
+def missing_fields_prompt(prompt: str, fields: Dict, missing: List[str]) -> str:
+    """Follow-up prompt asking only for the fields the first response lacked"""
+    title = fields.get("title")
+    about = f' titled "{title}"' if title else ""
+    return (
+        f"{prompt}\n\n"
+        f"You already returned the post{about} with these fields: {', '.join(fields)}.\n"
+        f"Return ONLY a JSON object containing the remaining fields: {', '.join(missing)}."
+    )
+
+
+def validate_post(fields: Dict) -> Dict:
+    """Validate against GeneratedPost; raises ValueError with the schema errors"""
+    try:
+        return GeneratedPost.model_validate(fields).model_dump()
+    except ValidationError as e:
+        raise ValueError(f"Generated post failed validation: {e}")
+
+
+async def parse_post_response(
+    text: str,
+    prompt: str,
+    complete: Callable[[str], Awaitable[str]]
+) -> Dict:
+    """
+    Parse a generated post, asking the model once for any missing fields.
+
+    Args:
+        text: Raw model output
+        prompt: The prompt that produced it
+        complete: Coroutine that runs a prompt and returns the model's text
+
+    Returns:
+        Dict: The validated post fields
+    """
+    fields = extract_post_fields(text)
+    missing = missing_fields(fields)
+
+    # Only top up a partial answer; an answer with nothing usable is a plain failure
+    if fields and missing:
+        more = extract_post_fields(await complete(missing_fields_prompt(prompt, fields, missing)))
+        fields.update({k: v for k, v in more.items() if k in missing})
+
+    return validate_post(fields)
@@ -0,0 +1,219 @@
+# ============================================================================
+# FILE: backend/services/search.py
+# ============================================================================
+"""
+Location: backend/services/search.py
+Purpose: Ranked full-text search over published posts
+"""
+
+import heapq
+import math
+import re
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import Select, func, literal_column, select
+
+from models import BlogPost
+
+# Inlined rather than bound, so the planner sees the same config as the index expression
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+# Weight of each field, matching Postgres' default ts_rank weights for labels A-D
+FIELD_WEIGHTS = {"title": 1.0, "keywords": 0.4, "excerpt": 0.2, "content": 0.1}
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=30, MinWords=12, FragmentDelimiter= … "
+
+# Maintained by Postgres itself (see database.ensure_search_index)
+SEARCH_VECTOR = literal_column("blog_posts.search_vector")
+
+TAG = re.compile(r"<[^>]+>")
+WORD = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def plain_text(html: Optional[str]) -> str:
+    return TAG.sub(" ", html or "")
+
+
+def keyword_text(keywords) -> str:
+    """Flatten the keywords JSON (normally a list of strings) into text"""
+    if isinstance(keywords, dict):
+        keywords = list(keywords.values())
+    if isinstance(keywords, (list, tuple)):
+        return " ".join(keyword_text(k) for k in keywords)
+    return keywords if isinstance(keywords, str) else ""
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def search_query(q: str, limit: int = 20) -> Select:
+    """
+    Postgres: rank published posts matching a web-style query.
+
+    Ranking runs over the GIN-indexed tsvector; snippets are only
+    generated for the `limit` rows that make the cut.
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(SEARCH_VECTOR, query, 32).label("rank")
+    top = (
+        select(BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.excerpt, BlogPost.published_at,
+               BlogPost.content, rank)
+        .where(BlogPost.status == "published", SEARCH_VECTOR.op("@@")(query))
+        .order_by(rank.desc(), BlogPost.published_at.desc())
+        .limit(limit)
+        .subquery()
+    )
+    snippet = func.ts_headline(
+        SEARCH_CONFIG, func.regexp_replace(top.c.content, "<[^>]+>", " ", "g"), query, HEADLINE_OPTIONS
+    )
+    return (
+        select(top.c.id, top.c.slug, top.c.title, top.c.excerpt, top.c.published_at, top.c.rank,
+               snippet.label("snippet"))
+        .order_by(top.c.rank.desc(), top.c.published_at.desc())
+    )
+
+
+class InvertedIndex:
+    """
+    In-process stand-in for the tsvector index, for SQLite setups.
+
+    Terms are lowercased words without stemming. Scores weight term
+    frequency by field and by inverse document frequency; every query term
+    must match. The index catches up with the database on each search by
+    loading posts updated since the last refresh.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.docs: Dict[str, Dict] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._versions: Dict[str, datetime] = {}
+        self._watermark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    def remove(self, post_id: str) -> None:
+        for term in self._terms.pop(post_id, ()):
+            postings = self.postings[term]
+            postings.pop(post_id, None)
+            if not postings:
+                del self.postings[term]
+        self.docs.pop(post_id, None)
+
+    def add(self, post) -> None:
+        """Index (or re-index) one post; unpublished posts are just removed"""
+        self.remove(post.id)
+        if post.status != "published":
+            return
+
+        text = plain_text(post.content)
+        fields = {
+            "title": post.title or "",
+            "keywords": keyword_text(post.keywords),
+            "excerpt": post.excerpt or "",
+            "content": text
+        }
+        weights: Dict[str, float] = {}
+        for field, value in fields.items():
+            for term in tokenize(value):
+                weights[term] = weights.get(term, 0.0) + FIELD_WEIGHTS[field]
+
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[post.id] = weight
+        self._terms[post.id] = set(weights)
+        self.docs[post.id] = {
+            "id": post.id,
+            "slug": post.slug,
+            "title": post.title,
+            "excerpt": post.excerpt,
+            "published_at": post.published_at,
+            "text": text
+        }
+
+    async def refresh_async(self, db) -> None:
+        """Index posts created or changed since the last refresh"""
+        async with self._lock:
+            stmt = select(
+                BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.excerpt, BlogPost.content,
+                BlogPost.keywords, BlogPost.status, BlogPost.published_at, BlogPost.updated_at
+            )
+            if self._watermark is not None:
+                # >= so rows sharing the watermark timestamp are not missed; re-adding is harmless
+                stmt = stmt.where(BlogPost.updated_at >= self._watermark)
+            for row in (await db.execute(stmt)).all():
+                if row.updated_at is None or self._versions.get(row.id) != row.updated_at:
+                    self.add(row)
+                    self._versions[row.id] = row.updated_at
+                if row.updated_at and (self._watermark is None or row.updated_at > self._watermark):
+                    self._watermark = row.updated_at
+
+    def search(self, terms: Iterable[str], limit: int = 20) -> List[Dict]:
+        terms = list(dict.fromkeys(terms))
+        if not terms or any(t not in self.postings for t in terms):
+            return []
+
+        # Intersect from the rarest term up
+        postings = sorted((self.postings[t] for t in terms), key=len)
+        matches = postings[0].keys()
+        for other in postings[1:]:
+            matches = matches & other.keys()
+            if not matches:
+                return []
+
+        total = len(self.docs)
+        weighted = [(p, math.log(1 + total / len(p))) for p in postings]
+        scores = {post_id: sum(p[post_id] * idf for p, idf in weighted) for post_id in matches}
+        top = heapq.nlargest(limit, scores, key=scores.__getitem__)
+
+        highlight = re.compile(r"\b(?:" + "|".join(map(re.escape, terms)) + r")\b", re.IGNORECASE)
+        return [
+            {
+                **{k: v for k, v in self.docs[post_id].items() if k != "text"},
+                "rank": scores[post_id] / (scores[post_id] + 1),
+                "snippet": self.snippet(post_id, highlight)
+            }
+            for post_id in top
+        ]
+
+    def snippet(self, post_id: str, highlight: re.Pattern, width: int = 200) -> str:
+        """Text around the first match, with matched words in <mark>"""
+        text = self.docs[post_id]["text"]
+        match = highlight.search(text)
+        start = max(0, match.start() - width // 3) if match else 0
+        # Widen to word boundaries and collapse the whitespace left by stripped tags
+        while 0 < start < len(text) and not text[start - 1].isspace():
+            start -= 1
+        end = start + width
+        while end < len(text) and not text[end].isspace():
+            end += 1
+        fragment = " ".join(text[start:end].split())
+        fragment = highlight.sub(lambda m: f"<mark>{m.group(0)}</mark>", fragment)
+        return ("… " if start else "") + fragment + (" …" if end < len(text) else "")
+
+
+class PostSearch:
+    """Full-text search: Postgres tsvector when available, the in-process index otherwise"""
+
+    def __init__(self, fallback: InvertedIndex = None):
+        self.fallback = fallback or InvertedIndex()
+
+    async def search(self, db, q: str, limit: int = 20) -> Dict:
+        q = q.strip()
+        if db.bind.dialect.name == "postgresql":
+            rows = (await db.execute(search_query(q, limit))).mappings().all()
+            results = [dict(r) for r in rows]
+        else:
+            await self.fallback.refresh_async(db)
+            results = self.fallback.search(tokenize(q), limit)
+
+        for result in results:
+            result["rank"] = round(float(result["rank"]), 6)
+            if result["published_at"]:
+                result["published_at"] = result["published_at"].isoformat()
+        return {"query": q, "results": results}
@@ -0,0 +1,193 @@
+# ============================================================================
+# FILE: backend/services/smtp_pool.py
+# ============================================================================
+"""
+Location: backend/services/smtp_pool.py
+Purpose: Pool of authenticated SMTP connections for bulk sending
+No additional installation needed (uses built-in smtplib)
+"""
+
+import os
+import time
+import queue
+import logging
+import smtplib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rejections of a single message; the session itself is still usable
+RECIPIENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+# Errors after which the connection can no longer be trusted (SMTPException is an OSError)
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+
+class SMTPPool:
+    """Reuses logged-in SMTP connections across many messages"""
+
+    def __init__(
+        self,
+        server: str,
+        port: int,
+        username: str,
+        password: str,
+        size: int = None,
+        starttls: bool = None,
+        max_messages_per_connection: int = None,
+        timeout: float = 30
+    ):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size or int(os.getenv("SMTP_POOL_SIZE", "4"))
+        if starttls is None:
+            starttls = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
+        self.starttls = starttls
+        # Providers drop long-lived sessions, so recycle after this many messages
+        self.max_messages_per_connection = max_messages_per_connection or int(
+            os.getenv("SMTP_MAX_PER_CONNECTION", "100")
+        )
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, int]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        if self.starttls:
+            conn.starttls()
+        if self.username:
+            conn.login(self.username, self.password)
+        return conn
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a [connection, messages_sent] holder, opening a connection if none is idle"""
+        self._slots.acquire()
+        holder = None
+        try:
+            try:
+                holder = list(self._idle.get_nowait())
+            except queue.Empty:
+                holder = [self._connect(), 0]
+            yield holder
+        except Exception:
+            if holder is not None:
+                self._close(holder[0])
+            raise
+        else:
+            if holder[1] >= self.max_messages_per_connection:
+                self._close(holder[0])
+            else:
+                self._idle.put((holder[0], holder[1]))
+        finally:
+            self._slots.release()
+
+    def _send_on(self, holder: list, msg: Message, to_email: str) -> None:
+        """Send one message on a borrowed connection, reconnecting once if it dropped"""
+        try:
+            holder[0].send_message(msg, to_addrs=[to_email])
+        except RECIPIENT_ERRORS:
+            raise
+        except CONNECTION_ERRORS:
+            self._close(holder[0])
+            holder[0], holder[1] = self._connect(), 0
+            holder[0].send_message(msg, to_addrs=[to_email])
+        holder[1] += 1
+
+    def deliver(self, to_email: str, msg: Message) -> None:
+        """Send a single message through the pool, raising on failure"""
+        with self.connection() as holder:
+            self._send_on(holder, msg, to_email)
+
+    def send(self, to_email: str, msg: Message) -> bool:
+        """Send a single message through the pool"""
+        try:
+            self.deliver(to_email, msg)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {str(e)}")
+            return False
+
+    def send_many(self, messages: Iterable[Tuple[str, Message]], parallel: Optional[int] = None) -> Dict:
+        """
+        Send messages over up to `parallel` connections.
+
+        Args:
+            messages: (recipient, message) pairs; may be a lazy iterator
+            parallel: Number of concurrent connections (defaults to pool size)
+
+        Returns:
+            Dict with per-recipient results, totals and throughput
+        """
+        parallel = min(parallel or self.size, self.size)
+        source = iter(messages)
+        source_lock = threading.Lock()
+        results: Dict[str, bool] = {}
+        results_lock = threading.Lock()
+
+        def next_message():
+            with source_lock:
+                return next(source, None)
+
+        def worker():
+            item = next_message()
+            while item is not None:
+                try:
+                    with self.connection() as holder:
+                        while item is not None:
+                            to_email, msg = item
+                            try:
+                                self._send_on(holder, msg, to_email)
+                                ok = True
+                            except RECIPIENT_ERRORS as e:
+                                # smtplib has already reset the session
+                                logger.error(f"Failed to send email to {to_email}: {str(e)}")
+                                ok = False
+                            with results_lock:
+                                results[to_email] = ok
+                            item = next_message()
+                            if holder[1] >= self.max_messages_per_connection:
+                                break
+                except Exception as e:
+                    # The reconnect also failed; record it and move on with a fresh connection
+                    logger.error(f"Failed to send email to {item[0]}: {str(e)}")
+                    with results_lock:
+                        results[item[0]] = False
+                    item = next_message()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="smtp") as executor:
+            for future in [executor.submit(worker) for _ in range(parallel)]:
+                future.result()
+        elapsed = time.perf_counter() - started
+
+        sent = sum(1 for ok in results.values() if ok)
+        return {
+            "results": results,
+            "sent": sent,
+            "failed": len(results) - sent,
+            "seconds": round(elapsed, 3),
+            "per_second": round(len(results) / elapsed, 1) if elapsed else 0.0
+        }
+
+    def close(self) -> None:
+        """Close all idle connections"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
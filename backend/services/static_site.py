@@ -0,0 +1,286 @@
+# ============================================================================
+# FILE: backend/services/static_site.py
+# ============================================================================
+"""
+Location: backend/services/static_site.py
+Purpose: Pre-render published posts, index pages, RSS and sitemap to static files
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from html import escape
+from typing import Dict, List
+
+from sqlalchemy import select
+
+from models import BlogPost
+from .feeds import (
+    SITEMAP_LIMIT, post_path, rss_channel, site_name, site_url, sitemap_chunk_path, sitemap_index, sitemap_urlset
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = ".manifest.json"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<meta name="description" content="{description}">
+<link rel="canonical" href="{canonical}">
+<link rel="alternate" type="application/rss+xml" title="{site}" href="{base_url}/rss.xml">
+</head>
+<body>
+<header><a href="{base_url}/">{site}</a></header>
+<main>
+{main}
+</main>
+</body>
+</html>
+"""
+
+
+def write_file(path: str, text: str) -> None:
+    """Write atomically, so the web server never serves a half-written page"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def post_dir(out_dir: str, slug: str) -> str:
+    """A post's directory under out_dir/posts; raises ValueError for slugs that would escape it"""
+    root = os.path.realpath(os.path.join(out_dir, "posts"))
+    path = os.path.realpath(os.path.join(root, slug or ""))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"Unsafe post slug: {slug!r}")
+    return path
+
+
+def render_post_page(doc: Dict, site: Dict) -> str:
+    published = doc["published_at"][:10] if doc["published_at"] else ""
+    main = (
+        f'<article><h1>{escape(doc["title"])}</h1>'
+        f'<time datetime="{published}">{published}</time>\n{doc["content"]}\n</article>'
+    )
+    return PAGE_TEMPLATE.format(
+        title=escape(f'{doc["title"]} | {site["name"]}'),
+        description=escape(doc["excerpt"] or ""),
+        canonical=escape(site["base_url"] + post_path(doc["slug"])),
+        site=escape(site["name"]),
+        base_url=escape(site["base_url"]),
+        main=main
+    )
+
+
+def render_index_page(rows: List, page: int, pages: int, site: Dict) -> str:
+    items = "\n".join(
+        f'<li><a href="{escape(post_path(r.slug))}">{escape(r.title)}</a>'
+        f'<p>{escape(r.excerpt or "")}</p></li>'
+        for r in rows
+    )
+    nav = []
+    if page > 1:
+        nav.append(f'<a rel="prev" href="{"/" if page == 2 else f"/page/{page - 1}/"}">Newer</a>')
+    if page < pages:
+        nav.append(f'<a rel="next" href="/page/{page + 1}/">Older</a>')
+    return PAGE_TEMPLATE.format(
+        title=escape(site["name"] if page == 1 else f'{site["name"]} - page {page}'),
+        description=escape(site["name"]),
+        canonical=escape(site["base_url"] + ("/" if page == 1 else f"/page/{page}/")),
+        site=escape(site["name"]),
+        base_url=escape(site["base_url"]),
+        main=f"<ul>\n{items}\n</ul>\n<nav>{' '.join(nav)}</nav>"
+    )
+
+
+def render_posts(out_dir: str, site: Dict, docs: List[Dict]) -> int:
+    """Process-pool worker: render and write a batch of post pages; posts with unsafe slugs are skipped"""
+    written = 0
+    for doc in docs:
+        try:
+            path = os.path.join(post_dir(out_dir, doc["slug"]), "index.html")
+        except ValueError as e:
+            logger.error(f"Not rendering post: {str(e)}")
+            continue
+        write_file(path, render_post_page(doc, site))
+        written += 1
+    return written
+
+
+class StaticSiteBuilder:
+    """
+    Writes the public site to `out_dir` for nginx or a CDN to serve.
+
+    A manifest maps each rendered post to the slug and updated_at it was
+    rendered from, so incremental builds only re-render changed posts and
+    remove pages of posts that were unpublished or renamed. Index pages,
+    rss.xml and the sitemap (an index plus 50k-URL chunk files) are
+    rewritten whenever anything changed; they only need titles and dates,
+    not post bodies.
+    """
+
+    def __init__(self, session_factory, out_dir: str = None, base_url: str = None, workers: int = None,
+                 batch_size: int = 100, page_size: int = 20, feed_size: int = 50):
+        self.session_factory = session_factory
+        self.out_dir = out_dir or os.getenv("STATIC_SITE_DIR", "site")
+        self.site = {"base_url": (base_url or site_url()).rstrip("/"), "name": site_name()}
+        self.workers = workers or int(os.getenv("STATIC_SITE_WORKERS", str(os.cpu_count() or 2)))
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.feed_size = feed_size
+        self._lock = threading.Lock()
+        self._schedule_lock = threading.Lock()
+        self._pending = False
+        self._thread = None
+
+    def _load_manifest(self) -> Dict[str, List[str]]:
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _render_changed(self, db, ids: List[str]) -> int:
+        columns = (BlogPost.slug, BlogPost.title, BlogPost.excerpt, BlogPost.content, BlogPost.published_at)
+
+        def batches():
+            for start in range(0, len(ids), self.batch_size):
+                chunk = ids[start:start + self.batch_size]
+                yield [
+                    {
+                        "slug": r.slug, "title": r.title, "excerpt": r.excerpt, "content": r.content,
+                        "published_at": r.published_at.isoformat() if r.published_at else None
+                    }
+                    for r in db.execute(select(*columns).where(BlogPost.id.in_(chunk)))
+                ]
+
+        if self.workers <= 1:
+            return sum(render_posts(self.out_dir, self.site, docs) for docs in batches())
+
+        rendered = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = set()
+            for docs in batches():
+                # Bound what is loaded ahead of the workers
+                if len(in_flight) >= self.workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    rendered += sum(f.result() for f in done)
+                in_flight.add(pool.submit(render_posts, self.out_dir, self.site, docs))
+            rendered += sum(f.result() for f in wait(in_flight).done)
+        return rendered
+
+    def _write_listings(self, rows: List) -> None:
+        pages = max(1, -(-len(rows) // self.page_size))
+        for page in range(1, pages + 1):
+            chunk = rows[(page - 1) * self.page_size:page * self.page_size]
+            path = "index.html" if page == 1 else os.path.join("page", str(page), "index.html")
+            write_file(os.path.join(self.out_dir, path), render_index_page(chunk, page, pages, self.site))
+
+        # Drop index pages left over from when there were more posts
+        page_dir = os.path.join(self.out_dir, "page")
+        if os.path.isdir(page_dir):
+            for name in os.listdir(page_dir):
+                if name.isdigit() and int(name) > pages:
+                    shutil.rmtree(os.path.join(page_dir, name), ignore_errors=True)
+
+        base_url = self.site["base_url"]
+        write_file(os.path.join(self.out_dir, "rss.xml"),
+                   "".join(rss_channel(rows[:self.feed_size], base_url, self.site["name"])))
+        self._write_sitemaps(rows)
+
+    def _write_sitemaps(self, rows: List) -> None:
+        """sitemap.xml as an index over chunk files of up to 50k posts, oldest first"""
+        oldest_first = rows[::-1]
+        chunks = []
+        for start in range(0, max(1, len(oldest_first)), SITEMAP_LIMIT):
+            chunk = oldest_first[start:start + SITEMAP_LIMIT]
+            n = len(chunks) + 1
+            write_file(self.out_dir + sitemap_chunk_path(n), "".join(sitemap_urlset(chunk, self.site["base_url"])))
+            chunks.append((n, max((r.updated_at or r.published_at for r in chunk), default=None)))
+
+        sitemap_dir = os.path.dirname(self.out_dir + sitemap_chunk_path(1))
+        for name in os.listdir(sitemap_dir):
+            number = name.removeprefix("posts-").removesuffix(".xml")
+            if number.isdigit() and int(number) > len(chunks):
+                os.remove(os.path.join(sitemap_dir, name))
+
+        write_file(os.path.join(self.out_dir, "sitemap.xml"), "".join(sitemap_index(chunks, self.site["base_url"])))
+
+    def build(self, full: bool = False) -> Dict:
+        """Render what changed since the last build (everything if `full`)"""
+        with self._lock:
+            start = time.perf_counter()
+            manifest = self._load_manifest()
+
+            db = self.session_factory()
+            try:
+                rows = db.execute(
+                    select(BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.excerpt,
+                           BlogPost.published_at, BlogPost.updated_at)
+                    .where(BlogPost.status == "published", BlogPost.published_at.isnot(None))
+                    .order_by(BlogPost.published_at.desc(), BlogPost.id.desc())
+                ).all()
+
+                current = {
+                    r.id: [r.slug, r.updated_at.isoformat() if r.updated_at else ""] for r in rows
+                }
+                changed = [
+                    post_id for post_id, entry in current.items() if full or manifest.get(post_id) != entry
+                ]
+                removed = [
+                    entry[0] for post_id, entry in manifest.items()
+                    if post_id not in current or current[post_id][0] != entry[0]
+                ]
+
+                # Before rendering, in case a renamed post's old slug now belongs to another
+                for slug in removed:
+                    try:
+                        shutil.rmtree(post_dir(self.out_dir, slug), ignore_errors=True)
+                    except ValueError as e:
+                        logger.error(f"Not removing post page: {str(e)}")
+                rendered = self._render_changed(db, changed)
+            finally:
+                db.close()
+
+            listings_missing = not os.path.exists(os.path.join(self.out_dir, "index.html"))
+            if changed or removed or listings_missing:
+                self._write_listings(rows)
+            write_file(os.path.join(self.out_dir, MANIFEST), json.dumps(current))
+
+            return {
+                "rendered": rendered,
+                "removed": len(removed),
+                "unchanged": len(current) - len(changed),
+                "seconds": round(time.perf_counter() - start, 3)
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._schedule_lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                self._pending = False
+            try:
+                report = self.build()
+                logger.info(f"Static site rebuilt: {report}")
+            except Exception as e:
+                logger.error(f"Static site build failed: {str(e)}")
+
+    def schedule(self) -> None:
+        """Rebuild in the background; requests made during a build coalesce into one more"""
+        with self._schedule_lock:
+            self._pending = True
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="static-site", daemon=True)
+            self._thread.start()
@@ -0,0 +1,157 @@
+# ============================================================================
+# FILE: backend/services/stats.py
+# ============================================================================
+"""
+Location: backend/services/stats.py
+Purpose: Dashboard statistics from a periodically refreshed rollup row
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import select, func, true
+from sqlalchemy.exc import IntegrityError
+
+from models import BlogPost, EmailSubscriber, Monetization, Analytics, StatsRollup
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_ID = "global"
+
+
+def _scalar(column, *criteria):
+    stmt = select(func.coalesce(column, 0))
+    if criteria:
+        stmt = stmt.where(*criteria)
+    return stmt.scalar_subquery()
+
+
+def compute_stats(db, days: int = 30) -> Dict:
+    """Aggregate every dashboard figure in a single round trip"""
+
+    published = BlogPost.status == "published"
+    totals = select(
+        _scalar(func.count(BlogPost.id), published).label("total_posts"),
+        _scalar(func.sum(BlogPost.views), published).label("total_views"),
+        _scalar(func.count(EmailSubscriber.id), EmailSubscriber.is_active == True).label("total_subscribers"),
+        _scalar(func.sum(Monetization.clicks)).label("affiliate_clicks"),
+        _scalar(func.sum(Monetization.conversions)).label("affiliate_conversions"),
+        _scalar(func.sum(Monetization.actual_revenue)).label("affiliate_revenue"),
+        _scalar(func.sum(Monetization.estimated_revenue)).label("estimated_revenue"),
+    ).subquery()
+
+    day = func.date(Analytics.date)
+    daily = select(
+        day.label("day"),
+        func.sum(Analytics.views).label("views")
+    ).where(
+        Analytics.date >= datetime.utcnow() - timedelta(days=days)
+    ).group_by(day).subquery()
+
+    # One totals row joined to one row per day (or a single row with NULL day)
+    rows = db.execute(
+        select(totals, daily.c.day, daily.c.views)
+        .select_from(totals.outerjoin(daily, true()))
+        .order_by(daily.c.day)
+    ).all()
+
+    first = rows[0]
+    return {
+        "total_posts": int(first.total_posts),
+        "total_views": int(first.total_views),
+        "total_subscribers": int(first.total_subscribers),
+        "affiliate_clicks": int(first.affiliate_clicks),
+        "affiliate_conversions": int(first.affiliate_conversions),
+        "affiliate_revenue": float(first.affiliate_revenue),
+        "estimated_revenue": float(first.estimated_revenue),
+        "daily_views": [
+            {"date": str(r.day), "views": int(r.views or 0)}
+            for r in rows if r.day is not None
+        ]
+    }
+
+
+class StatsService:
+    """Serves dashboard stats from the rollup row and refreshes it in the background"""
+
+    def __init__(self, session_factory, refresh_interval: float = None):
+        self.session_factory = session_factory
+        self.refresh_interval = refresh_interval or float(os.getenv("STATS_REFRESH_INTERVAL", "60"))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> Dict:
+        """Recompute the stats and store them with an as_of timestamp"""
+        db = self.session_factory()
+        try:
+            stats = compute_stats(db)
+            # Two first-time refreshes can both insert the row; the loser updates it instead
+            for attempt in range(2):
+                rollup = db.get(StatsRollup, ROLLUP_ID) or StatsRollup(id=ROLLUP_ID)
+                for key, value in stats.items():
+                    setattr(rollup, key, value)
+                rollup.as_of = datetime.utcnow()
+                db.add(rollup)
+                try:
+                    db.commit()
+                    break
+                except IntegrityError:
+                    db.rollback()
+                    if attempt:
+                        raise
+            return {**stats, "as_of": rollup.as_of.isoformat()}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _as_dict(rollup: StatsRollup) -> Dict:
+        return {
+            "total_posts": rollup.total_posts,
+            "total_views": rollup.total_views,
+            "total_subscribers": rollup.total_subscribers,
+            "affiliate_clicks": rollup.affiliate_clicks,
+            "affiliate_conversions": rollup.affiliate_conversions,
+            "affiliate_revenue": rollup.affiliate_revenue,
+            "estimated_revenue": rollup.estimated_revenue,
+            "daily_views": rollup.daily_views or [],
+            "as_of": rollup.as_of.isoformat()
+        }
+
+    def current(self, db) -> Dict:
+        """Read the rollup row, computing it on first use"""
+        rollup = db.get(StatsRollup, ROLLUP_ID)
+        if rollup is None:
+            return self.refresh()
+        return self._as_dict(rollup)
+
+    async def current_async(self, db) -> Dict:
+        """current() with an AsyncSession; a first-time refresh runs off the loop"""
+        rollup = await db.get(StatsRollup, ROLLUP_ID)
+        if rollup is None:
+            return await asyncio.to_thread(self.refresh)
+        return self._as_dict(rollup)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Stats refresh failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start the periodic refresh thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stats-rollup", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,37 @@
+# ============================================================================
+# FILE: backend/services/streaming.py
+# ============================================================================
+"""
+Location: backend/services/streaming.py
+Purpose: Token streaming shared by the content engines
+"""
+
+from typing import AsyncIterator, Dict
+
+from .response_parser import parse_post_response
+
+
+async def stream_post_events(engine, prompt: str, bypass_cache: bool = False) -> AsyncIterator[Dict]:
+    """
+    Stream a generation as events for any content engine.
+
+    Yields {"type": "token", "text": ...} as text arrives, then a final
+    {"type": "post", "post": {...}} with the parsed and validated post.
+    A cached result is returned at once as the final event, marked
+    "cached" so callers do not mistake it for provider latency.
+    """
+    if not bypass_cache:
+        cached = engine.cache.get(engine.provider, engine.model_name, prompt)
+        if cached is not None:
+            yield {"type": "post", "post": cached, "cached": True}
+            return
+
+    parts = []
+    async for text in engine._stream(prompt):
+        if text:
+            parts.append(text)
+            yield {"type": "token", "text": text}
+
+    post_data = await parse_post_response("".join(parts), prompt, engine._complete)
+    engine.cache.set(engine.provider, engine.model_name, prompt, post_data)
+    yield {"type": "post", "post": post_data}
@@ -0,0 +1,30 @@
+# ============================================================================
+# FILE: backend/services/subscribers.py
+# ============================================================================
+"""
+Location: backend/services/subscribers.py
+Purpose: Constant-memory streaming of subscriber emails for mass mailings
+"""
+
+from typing import Iterator, List
+
+from sqlalchemy import select
+
+from models import EmailSubscriber
+
+
+def stream_active_emails(db, chunk_size: int = 1000) -> Iterator[List[str]]:
+    """
+    Yield active subscriber emails in chunks of up to chunk_size.
+
+    Only the email column is selected, and rows come from a server-side
+    cursor, so memory use does not grow with the size of the list. The
+    session must stay open until the generator is exhausted.
+    """
+    result = db.execute(
+        select(EmailSubscriber.email)
+        .where(EmailSubscriber.is_active == True)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    for chunk in result.scalars().partitions():
+        yield list(chunk)
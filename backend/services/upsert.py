@@ -0,0 +1,70 @@
+# ============================================================================
+# FILE: backend/services/upsert.py
+# ============================================================================
+"""
+Location: backend/services/upsert.py
+Purpose: Insert-or-increment counters in one statement on Postgres and SQLite
+"""
+
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+from sqlalchemy import and_, bindparam, insert as portable_insert, update
+from sqlalchemy.exc import IntegrityError
+
+
+def _dialect_insert(db):
+    """The dialect's ON CONFLICT insert, or None where there is none"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _update_then_insert(db, table, rows: List[Dict], keys: Sequence[str], counters: Sequence[str]) -> None:
+    """
+    Portable fallback: increment each row, inserting the ones that did not exist.
+
+    An insert that loses a race with another flusher hits the unique
+    constraint; its savepoint is rolled back and the increment retried.
+    """
+    values = {c: table.c[c] + bindparam(f"b_{c}") for c in counters}
+    if "updated_at" in table.c:
+        values["updated_at"] = datetime.utcnow()
+    stmt = update(table).where(and_(*(table.c[k] == bindparam(f"b_{k}") for k in keys))).values(values)
+    for row in rows:
+        params = {f"b_{k}": v for k, v in row.items()}
+        if db.execute(stmt, params).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(portable_insert(table), row)
+        except IntegrityError:
+            db.execute(stmt, params)
+
+
+def upsert_increment(db, model, rows: List[Dict], keys: Sequence[str], counters: Sequence[str]) -> None:
+    """
+    Insert each row, or add its counters to the row already holding its keys.
+
+    `keys` must be covered by a unique constraint. On Postgres and SQLite
+    rows are sent as one executemany, so concurrent flushers never lose each
+    other's increments; other databases update then insert row by row.
+    """
+    if not rows:
+        return
+    table = model.__table__
+    insert = _dialect_insert(db)
+    if insert is None:
+        _update_then_insert(db, table, rows, keys, counters)
+        return
+
+    stmt = insert(table)
+    updates = {c: table.c[c] + stmt.excluded[c] for c in counters}
+    if "updated_at" in table.c:
+        updates["updated_at"] = datetime.utcnow()
+    db.execute(stmt.on_conflict_do_update(index_elements=list(keys), set_=updates), rows)
@@ -0,0 +1,139 @@
+# ============================================================================
+# FILE: backend/services/view_counter.py
+# ============================================================================
+"""
+Location: backend/services/view_counter.py
+Purpose: Buffered, batched view counting for blog posts
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List
+
+from sqlalchemy import update, bindparam
+
+from models import BlogPost
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Aggregates post views in memory and flushes them as atomic increments.
+
+    Counts being flushed stay visible until their commit is folded into the
+    stored totals seen through `observe`, so `total` never goes backwards.
+    """
+
+    def __init__(self, session_factory, flush_interval: float = None, shards: int = 16):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval or float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards: List[Dict[str, int]] = [{} for _ in range(shards)]
+        # Guards _stored and _inflight; taken before any shard lock
+        self._flush_lock = threading.Lock()
+        self._stored: Dict[str, int] = {}
+        self._inflight: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _shard(self, slug: str) -> int:
+        return hash(slug) % len(self._shards)
+
+    def increment(self, slug: str, n: int = 1) -> None:
+        """Record n views for a post"""
+        i = self._shard(slug)
+        with self._locks[i]:
+            self._shards[i][slug] = self._shards[i].get(slug, 0) + n
+
+    def pending(self, slug: str) -> int:
+        """Views recorded in memory but not yet written to the database"""
+        i = self._shard(slug)
+        with self._locks[i]:
+            return self._shards[i].get(slug, 0)
+
+    def observe(self, slug: str, views: int) -> None:
+        """Record a post's stored view count, as read from the database"""
+        with self._flush_lock:
+            # Mid-flush the row may or may not include the in-flight views; keep what we have
+            if slug in self._inflight and slug in self._stored:
+                return
+            # A lagging replica may return less than we have already written
+            self._stored[slug] = max(self._stored.get(slug, 0), views)
+
+    def total(self, slug: str) -> int:
+        """Stored views plus those being flushed and those still pending"""
+        with self._flush_lock:
+            return self._stored.get(slug, 0) + self._inflight.get(slug, 0) + self.pending(slug)
+
+    def _drain(self) -> Dict[str, int]:
+        drained = {}
+        with self._flush_lock:
+            for i, lock in enumerate(self._locks):
+                with lock:
+                    shard, self._shards[i] = self._shards[i], {}
+                drained.update(shard)
+            self._inflight = dict(drained)
+        return drained
+
+    def _settle(self, counts: Dict[str, int], committed: bool) -> None:
+        with self._flush_lock:
+            self._inflight = {}
+            for slug, n in counts.items():
+                if not committed:
+                    self.increment(slug, n)
+                elif slug in self._stored:
+                    self._stored[slug] += n
+
+    def flush(self) -> int:
+        """Write all pending views in one batched UPDATE; returns the views flushed"""
+        counts = self._drain()
+        if not counts:
+            return 0
+
+        table = BlogPost.__table__
+        # Pin updated_at: a view is not an edit, and its onupdate would
+        # otherwise invalidate the post's payload, ETag and sitemap lastmod
+        stmt = (
+            update(table)
+            .where(table.c.slug == bindparam("b_slug"))
+            .values(views=table.c.views + bindparam("b_views"), updated_at=table.c.updated_at)
+        )
+        rows = [{"b_slug": slug, "b_views": n} for slug, n in counts.items()]
+
+        db = self.session_factory()
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Put the counts back so the next flush retries them
+            self._settle(counts, committed=False)
+            logger.error(f"View flush failed, will retry: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+        self._settle(counts, committed=True)
+        return sum(counts.values())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write out anything still pending"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: affiliate link rewriting over a 2,500-word post
+Run: python bench_affiliate_links.py [iterations]
+"""
+
+import os
+import sys
+import time
+import random
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from services.affiliate_service import AffiliateService
+
+LINKS = [
+    '<a href="https://www.booking.com/hotel/za/the-silo.html?aid=123&amp;label=gen">The Silo</a>',
+    '<a href="https://www.booking.com/hotel/za/ellerman-house.html">Ellerman House</a>',
+    '<a href="https://www.getyourguide.com/cape-town-l1/table-mountain-t1234/">Table Mountain tour</a>',
+    '<a href="https://www.viator.com/tours/Cape-Town/Winelands/d318-5678?pid=OLD">Winelands day trip</a>',
+    'book at https://www.getyourguide.com/cape-town-l1/shark-cage-t99/.',
+]
+WORDS = "luxury safari lodge vineyard ocean sunset private chef suite spa mountain harbour".split()
+
+
+def make_post(words: int = 2500, links: int = 40) -> str:
+    rng = random.Random(42)
+    paragraphs = []
+    per_paragraph = words // links
+    for i in range(links):
+        text = " ".join(rng.choice(WORDS) for _ in range(per_paragraph))
+        paragraphs.append(f"<h2>Section {i}</h2><p>{text} {LINKS[i % len(LINKS)]}</p>")
+    return "\n".join(paragraphs)
+
+
+def run(label: str, service: AffiliateService, html: str, iterations: int, cold: bool) -> None:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            service.rewrite_url.cache_clear()
+        service.rewrite_html(html)
+    seconds = time.perf_counter() - start
+    mb = len(html.encode()) * iterations / 1e6
+    print(f"  {label:<22} {iterations / seconds:>8.0f} posts/s  {mb / seconds:>7.1f} MB/s  "
+          f"{seconds / iterations * 1e6:>7.0f} us/post")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    html = make_post()
+    service = AffiliateService()
+    print(f"🔗 Rewriting a {len(html.split())}-word post ({len(html) // 1024} KB, 40 links) {iterations} times\n")
+    run("cold link cache", service, html, iterations, cold=True)
+    run("warm link cache", service, html, iterations, cold=False)
+    print(f"\n  {service.rewrite_url.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
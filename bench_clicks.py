@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: affiliate click redirects (lookup + in-memory count) and the batched flush
+Install: pip install aiosqlite
+Run: python bench_clicks.py [--clicks 100000] [--posts 500]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import secrets
+import tempfile
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+from sqlalchemy import insert
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from models import BlogPost, Monetization
+from services.affiliate_service import AffiliateService
+from services.click_tracker import ClickTracker, LinkDirectory
+
+
+def seed(posts: int) -> list:
+    links = AffiliateService().rewrite_suggestions([
+        {"type": "hotel", "name": "Silo", "platform": "booking.com", "link": "https://www.booking.com/hotel/za/silo.html"},
+        {"type": "tour", "name": "Winelands", "platform": "Viator", "link": "https://www.viator.com/tours/x"},
+        {"type": "activity", "name": "Table Mountain", "platform": "GetYourGuide", "link": ""},
+    ])
+    db = SessionLocal()
+    try:
+        db.execute(insert(BlogPost), [
+            {"id": f"p{i}", "title": f"Post {i}", "slug": f"post-{i}", "content": "<p>Body</p>"} for i in range(posts)
+        ])
+        db.execute(insert(Monetization), [
+            {"blog_post_id": f"p{i}", "affiliate_links": links} for i in range(posts)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return [link["id"] for link in links]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Measure click redirect and flush throughput")
+    parser.add_argument("--clicks", type=int, default=100000)
+    parser.add_argument("--posts", type=int, default=500)
+    args = parser.parse_args()
+
+    init_db()
+    link_ids = seed(args.posts)
+    directory = LinkDirectory(AsyncSessionLocal)
+    tracker = ClickTracker(SessionLocal, log_dir=os.path.join(workdir, "clicks"))
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.clicks):
+        t = time.perf_counter()
+        post_id, link_id = f"p{i % args.posts}", link_ids[i % len(link_ids)]
+        url, provider = await directory.resolve(post_id, link_id)
+        click_id = secrets.token_hex(6)
+        tracker.record(post_id, link_id, provider, click_id)
+        directory.click_url(url, provider, click_id)
+        latencies.append(time.perf_counter() - t)
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"🔗 {args.clicks} redirects over {args.posts} posts: {args.clicks / seconds:,.0f} clicks/s  "
+          f"p50 {p50:.1f} µs  p99 {p99:.1f} µs (first hit per post reads the DB)")
+
+    start = time.perf_counter()
+    flushed = tracker.flush()
+    print(f"💾 Flushed {flushed} clicks ({args.posts} posts x {len(link_ids)} providers) "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
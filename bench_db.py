@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sync sessions vs AsyncSession for the read endpoints under concurrent load
+Install: pip install aiosqlite asyncpg
+Run: python bench_db.py [--readers 50] [--requests 20] [--url postgresql://...]
+Without --url a temporary SQLite file stands in for Postgres.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare sync and async DB sessions under load")
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--readers", type=int, default=50, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per client")
+    return parser.parse_args()
+
+
+args = parse_args()
+if args.url:
+    os.environ["DATABASE_URL"] = args.url
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from sqlalchemy import insert, select, func
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from models import BlogPost
+from services.pagination import published_page, published_page_async
+
+
+def seed(count: int) -> None:
+    db = SessionLocal()
+    try:
+        if db.scalar(select(func.count(BlogPost.id))) >= count:
+            return
+        now = datetime.utcnow()
+        db.execute(insert(BlogPost), [
+            {
+                "id": f"bench-{i:06d}",
+                "title": f"Bench post {i}",
+                "slug": f"bench-post-{i}",
+                "content": "<p>Body</p>" * 200,
+                "status": "published",
+                "published_at": now - timedelta(minutes=i)
+            }
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def watch_loop(stop: asyncio.Event, lags: list) -> None:
+    """Record how late a 5ms timer fires; a blocked loop shows up as lag"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lags.append(time.perf_counter() - start - 0.005)
+
+
+def sync_request(i: int) -> None:
+    # What the handlers did before: a sync session inside an async def
+    db = SessionLocal()
+    try:
+        published_page(db, limit=20)
+        db.execute(select(BlogPost.content).where(BlogPost.slug == f"bench-post-{i % args.posts}")).first()
+    finally:
+        db.close()
+
+
+async def async_request(i: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await published_page_async(db, limit=20)
+        (await db.execute(select(BlogPost.content).where(BlogPost.slug == f"bench-post-{i % args.posts}"))).first()
+
+
+async def run(label: str, request) -> None:
+    stop = asyncio.Event()
+    lags = []
+    watcher = asyncio.create_task(watch_loop(stop, lags))
+
+    async def client(n: int):
+        for r in range(args.requests):
+            result = request(n * args.requests + r)
+            if asyncio.iscoroutine(result):
+                await result
+            else:
+                await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(args.readers)))
+    seconds = time.perf_counter() - start
+    stop.set()
+    await watcher
+
+    total = args.readers * args.requests
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] * 1000 if lags else 0
+    worst = lags[-1] * 1000 if lags else 0
+    print(f"  {label:<16} {total / seconds:>8.0f} req/s  {seconds:>6.2f}s   loop lag p99 {p99:>7.1f} ms  max {worst:>7.1f} ms")
+
+
+async def main():
+    init_db()
+    seed(args.posts)
+    print(f"🗄️  {args.readers} concurrent readers x {args.requests} requests "
+          f"against {async_engine.url.get_backend_name()} ({args.posts} posts)\n")
+
+    # Warm both pools first
+    sync_request(0)
+    await async_request(0)
+
+    await run("sync Session", sync_request)
+    await run("AsyncSession", async_request)
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-message SMTP sessions vs pooled, parallel connections
+Install: pip install aiosmtpd
+Run: python bench_email_pool.py [recipients]
+"""
+
+import os
+import sys
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from local_smtp_server import LocalSMTPServer
+from test_email_pool import free_port, make_pool, message
+
+
+def run(label: str, port: int, emails, **pool_kwargs) -> None:
+    parallel = pool_kwargs.pop("parallel")
+    pool = make_pool(port, **pool_kwargs)
+    report = pool.send_many(((e, message(e)) for e in emails), parallel=parallel)
+    pool.close()
+    print(f"  {label:<32} {report['sent']:>6} sent  {report['seconds']:>7.2f}s  {report['per_second']:>8.1f} msg/s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    emails = [f"reader{i}@example.com" for i in range(count)]
+    port = free_port()
+
+    print(f"📬 Sending {count} messages to a local SMTP server\n")
+    with LocalSMTPServer(port):
+        # One connect + login per message, as the service used to do
+        run("new session per message", port, emails, size=1, parallel=1, max_messages_per_connection=1)
+        run("pooled, 1 connection", port, emails, size=1, parallel=1, max_messages_per_connection=1000)
+        run("pooled, 4 connections", port, emails, size=4, parallel=4, max_messages_per_connection=1000)
+        run("pooled, 8 connections", port, emails, size=8, parallel=8, max_messages_per_connection=1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /api/posts/search query latency as the archive grows
+Install: pip install aiosqlite asyncpg
+Run: python bench_search.py [--posts 10000] [--url postgresql://...]
+Without --url a temporary SQLite file and the in-process index stand in for Postgres.
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure full-text search latency")
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=400, help="Words per post body")
+    parser.add_argument("--queries", type=int, default=200)
+    return parser.parse_args()
+
+
+args = parse_args()
+if args.url:
+    os.environ["DATABASE_URL"] = args.url
+else:
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+
+from sqlalchemy import insert, select, func
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from models import BlogPost
+from services.search import PostSearch
+
+PLACES = ["kruger", "cape", "durban", "drakensberg", "stellenbosch", "knysna", "soweto", "hermanus",
+          "karoo", "kalahari", "tsitsikamma", "pilanesberg", "franschhoek", "wilderness", "clarens"]
+THEMES = ["safari", "wine", "hiking", "beach", "whales", "food", "history", "road", "trip", "budget",
+          "luxury", "family", "camping", "birding", "surfing", "culture", "markets", "winter", "summer"]
+FILLER = [f"word{i}" for i in range(3000)]
+
+
+def seed(count: int) -> None:
+    db = SessionLocal()
+    try:
+        if db.scalar(select(func.count(BlogPost.id))) >= count:
+            return
+        rng = random.Random(1)
+        now = datetime.utcnow()
+        for start in range(0, count, 1000):
+            db.execute(insert(BlogPost), [
+                {
+                    "id": f"bench-{i:06d}",
+                    "title": f"{rng.choice(PLACES).title()} {rng.choice(THEMES)} guide {i}",
+                    "slug": f"bench-post-{i}",
+                    "content": "<p>" + " ".join(
+                        rng.choice(PLACES + THEMES) if rng.random() < 0.05 else rng.choice(FILLER)
+                        for _ in range(args.words)
+                    ) + "</p>",
+                    "keywords": rng.sample(THEMES, 3),
+                    "status": "published",
+                    "published_at": now - timedelta(minutes=i)
+                }
+                for i in range(start, min(start + 1000, count))
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def main():
+    init_db()
+    seed(args.posts)
+    search = PostSearch()
+    rng = random.Random(2)
+    queries = [f"{rng.choice(PLACES)} {rng.choice(THEMES)}" for _ in range(args.queries)]
+
+    async with AsyncSessionLocal() as db:
+        backend = db.bind.dialect.name
+        start = time.perf_counter()
+        await search.search(db, queries[0])
+        print(f"🔎 {args.posts} posts on {backend}; first search (index build on SQLite) "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+        latencies, hits = [], 0
+        for q in queries:
+            t = time.perf_counter()
+            found = await search.search(db, q)
+            latencies.append(time.perf_counter() - t)
+            hits += len(found["results"])
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    print(f"   {len(queries)} two-term queries: p50 {p50:.2f} ms  p99 {p99:.2f} ms  "
+          f"({hits / len(queries):.1f} results/query)")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
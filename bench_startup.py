@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: API cold-start import time, measured with python -X importtime
+Fails (exit 1) over the time budget or if the read path loads an LLM SDK or SMTP code
+Run: python bench_startup.py [--budget-ms 2000] [--runs 5]
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must only load when a generation or email actually happens
+DEFERRED_MODULES = (
+    "google.generativeai",
+    "anthropic",
+    "openai",
+    "smtplib",
+    "email.mime",
+    "services.email_service_zoho",
+    "services.smtp_pool",
+)
+
+
+def import_profile():
+    """Import main in a fresh interpreter; returns (total seconds, {module: cumulative us})"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([root_path, os.path.join(root_path, "backend")])
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_startup.db')}")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=root_path, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"❌ import main failed:\n{result.stderr[-2000:]}")
+
+    modules = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        modules[name.strip()] = int(cumulative)
+        # Top-level entries (not indented) add up to the whole import
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1e6, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API cold-start import time")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "2000")))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    print(f"🚀 Importing main {args.runs} times with -X importtime\n")
+    totals = []
+    for _ in range(args.runs):
+        total, modules = import_profile()
+        totals.append(total)
+
+    median_ms = statistics.median(totals) * 1000
+    print(f"  median {median_ms:.0f} ms   min {min(totals) * 1000:.0f} ms   max {max(totals) * 1000:.0f} ms")
+    print(f"  budget {args.budget_ms:.0f} ms\n")
+
+    print("  slowest imports (cumulative, last run):")
+    slowest = sorted(
+        ((us, name) for name, us in modules.items() if name.split(".")[0] != "main"),
+        reverse=True
+    )[:args.top]
+    for us, name in slowest:
+        print(f"    {us / 1000:>8.1f} ms  {name}")
+
+    failed = False
+    loaded = sorted(
+        name for name in modules
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    )
+    if loaded:
+        print(f"\n❌ Loaded at startup but should be lazy: {', '.join(loaded)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"\n❌ Cold-start import time {median_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("\n✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full and incremental static site builds
+Run: python bench_static_site.py [--posts 10000] [--changed 100] [--workers 8]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure static site build times")
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--changed", type=int, default=100, help="Posts edited before the incremental build")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    return parser.parse_args()
+
+
+args = parse_args()
+workdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+from sqlalchemy import insert, update
+
+from database import SessionLocal, init_db
+from models import BlogPost
+from services.static_site import StaticSiteBuilder
+
+PARAGRAPH = "<p>" + "The road from Cape Town winds through vineyards and over mountain passes. " * 12 + "</p>\n"
+
+
+def seed(count: int) -> None:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        for start in range(0, count, 1000):
+            db.execute(insert(BlogPost), [
+                {
+                    "id": f"bench-{i:06d}",
+                    "title": f"Bench post {i}",
+                    "slug": f"bench-post-{i}",
+                    "excerpt": "A short summary of the post.",
+                    "content": PARAGRAPH * 20,
+                    "status": "published",
+                    "published_at": now - timedelta(minutes=i),
+                    "updated_at": now - timedelta(minutes=i)
+                }
+                for i in range(start, min(start + 1000, count))
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def touch(count: int) -> None:
+    db = SessionLocal()
+    try:
+        ids = [f"bench-{i:06d}" for i in range(0, args.posts, max(1, args.posts // count))][:count]
+        db.execute(update(BlogPost).where(BlogPost.id.in_(ids)).values(updated_at=datetime.utcnow()))
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(label: str, builder: StaticSiteBuilder, full: bool = False) -> None:
+    report = builder.build(full=full)
+    print(f"  {label:<34} {report['seconds']:>7.2f}s   {report['rendered']:>6} rendered")
+
+
+def main():
+    init_db()
+    seed(args.posts)
+    print(f"🏗️  {args.posts} posts (~{len(PARAGRAPH) * 20 // 1024} KB each)\n")
+
+    serial = StaticSiteBuilder(SessionLocal, out_dir=os.path.join(workdir, "serial"), workers=1)
+    run("full build, 1 process", serial, full=True)
+
+    parallel = StaticSiteBuilder(SessionLocal, out_dir=os.path.join(workdir, "site"), workers=args.workers)
+    run(f"full build, {args.workers} processes", parallel, full=True)
+    run("incremental, nothing changed", parallel)
+    touch(args.changed)
+    run(f"incremental, {args.changed} posts changed", parallel)
+
+
+if __name__ == "__main__":
+    main()
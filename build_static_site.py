@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Pre-render published posts, index pages, RSS and sitemap to a static directory
+Run: python build_static_site.py [--out site] [--full] [--workers 8]
+"""
+
+import os
+import sys
+import argparse
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from database import SessionLocal, init_db
+from services.static_site import StaticSiteBuilder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the public site to static files")
+    parser.add_argument("--out", help="Output directory (default: STATIC_SITE_DIR or ./site)")
+    parser.add_argument("--base-url", help="Public origin (default: SITE_URL or https://DOMAIN)")
+    parser.add_argument("--workers", type=int, help="Render processes (default: CPU count)")
+    parser.add_argument("--full", action="store_true", help="Re-render every post, not just changed ones")
+    args = parser.parse_args()
+
+    init_db()
+    builder = StaticSiteBuilder(SessionLocal, out_dir=args.out, base_url=args.base_url, workers=args.workers)
+    report = builder.build(full=args.full)
+    print(
+        f"✅ {builder.out_dir}: {report['rendered']} rendered, {report['unchanged']} unchanged, "
+        f"{report['removed']} removed in {report['seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,25 +7,207 @@ Location: backend/database.py
 Purpose: Database connection and setup
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
-from models import Base
+import time
+import asyncio
+from datetime import datetime
+from models import Base, ReplicaHeartbeat
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Create engine
+# Async drivers for the sync URLs we are configured with
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def pool_settings(share: float = 1.0) -> dict:
+    """
+    Pool size for this process from the connection budget of the whole deployment.
+
+    DB_MAX_CONNECTIONS is split across WEB_CONCURRENCY worker processes;
+    `share` is the fraction of a worker's slice this engine may use.
+    """
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    budget = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+    per_engine = max(2, int(budget / workers * share))
+    pool_size = max(1, per_engine // 2)
+    return {"pool_size": pool_size, "max_overflow": per_engine - pool_size}
+
+def async_database_url(url: str):
+    """The async-driver equivalent of a sync database URL"""
+    url = make_url(url)
+    connect_args = {}
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    if drivername == "postgresql+asyncpg" and "sslmode" in url.query:
+        # asyncpg takes ssl as a connect argument rather than sslmode in the URL
+        connect_args["ssl"] = url.query["sslmode"]
+        url = url.difference_update_query(["sslmode"])
+    return url.set(drivername=drivername), connect_args
+
+# Create engine; it now only serves background workers and scripts
 engine = create_engine(
     DATABASE_URL,
     echo=False,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **pool_settings(share=0.25)
 )
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def build_async_engine(url: str):
+    """Async engine with a worker's share of the connection budget"""
+    async_url, connect_args = async_database_url(url)
+    return create_async_engine(
+        async_url,
+        echo=False,
+        pool_pre_ping=True,
+        connect_args=connect_args,
+        # aiosqlite defaults to no pooling; keep connections like the Postgres pool does
+        poolclass=AsyncAdaptedQueuePool if async_url.get_backend_name() == "sqlite" else None,
+        **pool_settings(share=0.75)
+    )
+
+# Async engine for request handlers, so DB waits don't block the event loop
+async_engine = build_async_engine(DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+class ReplicaRouter:
+    """
+    Sends read-only sessions to replicas that are caught up, else to the primary.
+
+    Lag is measured with a heartbeat row: the router writes the time to the
+    primary on a timer, then reads it back from each replica. A replica that
+    is unreachable or more than `max_lag` seconds behind gets no reads until
+    it catches up. For `max_lag` seconds after `prefer_primary` (called when
+    this process writes content that readers cache), reads go to the primary
+    so caches are not refilled with what the replicas still hold.
+    """
+
+    def __init__(self, primary, replicas: dict = None, max_lag: float = None, check_interval: float = None):
+        self.primary = primary
+        self.replicas = replicas or {}
+        self.max_lag = max_lag or float(os.getenv("REPLICA_MAX_LAG", "10"))
+        self.check_interval = check_interval or float(os.getenv("REPLICA_CHECK_INTERVAL", "2"))
+        self._sessions = {
+            name: async_sessionmaker(e, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            for name, e in [("primary", primary)] + list(self.replicas.items())
+        }
+        # Unknown until the first check, so replicas start out unused
+        self.lag = {name: None for name in self.replicas}
+        self.errors = {name: None for name in self.replicas}
+        self.routed = {name: 0 for name in self._sessions}
+        self.fallbacks = 0
+        self.after_write = 0
+        self._primary_until = 0.0
+        self._next = 0
+        self._task = None
+
+    def eligible(self) -> list:
+        return [n for n in self.replicas if self.lag[n] is not None and self.lag[n] <= self.max_lag]
+
+    def prefer_primary(self) -> None:
+        """Read from the primary until the replicas must have caught up with a write made now"""
+        self._primary_until = time.monotonic() + self.max_lag
+
+    def read_session(self) -> AsyncSession:
+        """A session on the next caught-up replica (round robin), or the primary"""
+        names = self.eligible()
+        if names and time.monotonic() < self._primary_until:
+            name = "primary"
+            self.after_write += 1
+        elif names:
+            name = names[self._next % len(names)]
+            self._next += 1
+        else:
+            name = "primary"
+            if self.replicas:
+                self.fallbacks += 1
+        self.routed[name] += 1
+        return self._sessions[name]()
+
+    async def check(self) -> None:
+        """Write a heartbeat to the primary and measure each replica against it"""
+        if not self.replicas:
+            return
+        beat = datetime.utcnow()
+        async with self._sessions["primary"]() as db:
+            await db.merge(ReplicaHeartbeat(id="primary", beat_at=beat))
+            await db.commit()
+
+        for name in self.replicas:
+            try:
+                async with self._sessions[name]() as db:
+                    seen = await db.scalar(select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == "primary"))
+                if seen is None:
+                    self.lag[name], self.errors[name] = None, "no heartbeat replicated yet"
+                else:
+                    self.lag[name], self.errors[name] = (beat - seen).total_seconds(), None
+            except Exception as e:
+                self.lag[name] = None
+                self.errors[name] = str(e)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"❌ Replica check failed: {str(e)}")
+            await asyncio.sleep(self.check_interval)
+
+    async def start(self) -> None:
+        if self.replicas:
+            await self.check()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for engine in self.replicas.values():
+            await engine.dispose()
+
+    def stats(self) -> dict:
+        """Routing counts, replica lag and pool usage per route"""
+        engines = [("primary", self.primary)] + list(self.replicas.items())
+        return {
+            name: {
+                "routed_reads": self.routed[name],
+                "lag_seconds": None if name == "primary" else self.lag[name],
+                "error": None if name == "primary" else self.errors[name],
+                "pool": pool_metrics(engine.pool)
+            }
+            for name, engine in engines
+        } | {"fallbacks_to_primary": self.fallbacks, "primary_after_write": self.after_write}
+
+def pool_metrics(pool) -> dict:
+    """Checkout stats for a connection pool (QueuePool-style pools only)"""
+    if not hasattr(pool, "checkedout"):
+        return {"class": type(pool).__name__}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow()
+    }
+
+def create_replica_engines() -> dict:
+    """Async engines for DATABASE_REPLICA_URLS (comma-separated)"""
+    urls = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    return {f"replica{i}": build_async_engine(url) for i, url in enumerate(urls, 1)}
+
+read_router = ReplicaRouter(async_engine, create_replica_engines())
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -34,9 +216,71 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """Get async session for read-only work; may be served by a replica"""
+    async with read_router.read_session() as db:
+        yield db
+
+# Weighted full-text vector over title (A), keywords (B), excerpt (C) and body text (D).
+# A generated column keeps it current on every write; the GIN index serves @@ lookups.
+SEARCH_DDL = (
+    """
+    ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(json_to_tsvector('english'::regconfig, coalesce(keywords, '[]'::json), '["string"]'), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(excerpt, '')), 'C') ||
+        setweight(to_tsvector('english'::regconfig, regexp_replace(coalesce(content, ''), '<[^>]+>', ' ', 'g')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_blog_posts_search ON blog_posts USING GIN (search_vector)",
+)
+
+def ensure_search_index(bind):
+    """Add the search column and index on Postgres; other databases search in process"""
+    if bind.dialect.name != "postgresql":
+        return
+    with bind.begin() as conn:
+        for statement in SEARCH_DDL:
+            conn.execute(text(statement))
+
+# Columns added to tables that existing databases already have; create_all
+# only creates missing tables. Every statement must be safe to run again.
+UPGRADE_DDL = (
+    "ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS status VARCHAR(50) DEFAULT 'draft'",
+    "ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS total_recipients INTEGER DEFAULT 0",
+    "ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS total_failed INTEGER DEFAULT 0",
+    "ALTER TABLE email_campaigns ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')",
+    "ALTER TABLE analytics ADD COLUMN IF NOT EXISTS bounces INTEGER DEFAULT 0",
+    "ALTER TABLE analytics ADD COLUMN IF NOT EXISTS timed_views INTEGER DEFAULT 0",
+    "ALTER TABLE analytics ADD COLUMN IF NOT EXISTS time_on_page_total INTEGER DEFAULT 0",
+    "ALTER TABLE analytics ADD COLUMN IF NOT EXISTS visitor_sketch BYTEA",
+    # Beacon flushes upsert on (post, day); fails while older duplicate rows remain
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_analytics_post_date ON analytics (blog_post_id, date)",
+)
+
+def ensure_upgrades(bind):
+    """Bring tables created by earlier releases up to the current models on Postgres"""
+    if bind.dialect.name != "postgresql":
+        return
+    for statement in UPGRADE_DDL:
+        # One transaction each, so a step that needs manual cleanup does not block the rest
+        try:
+            with bind.begin() as conn:
+                conn.execute(text(statement))
+        except Exception as e:
+            print(f"❌ Schema upgrade failed: {statement}: {str(e)}")
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    ensure_upgrades(engine)
+    ensure_search_index(engine)
     print("✅ Database tables created")
 
 
@@ -8,11 +8,12 @@ Purpose: Email sending via Zoho SMTP
 No additional installation needed (uses built-in smtplib)
 """
 
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-from typing import List
+from typing import Dict, List, Optional
+
+from services.smtp_pool import SMTPPool
 
 class EmailService:
     """Email service using Zoho Mail SMTP"""
@@ -25,43 +26,43 @@ class EmailService:
         
         if not self.sender_email or not self.app_password:
             raise ValueError("SMTP_EMAIL and SMTP_PASSWORD must be set")
-    
-    def send_email(self, to_email: str, subject: str, html_body: str) -> bool:
-        """Send single email"""
         
+        # Logged-in connections are reused across messages
+        self.pool = SMTPPool(
+            self.smtp_server,
+            self.smtp_port,
+            self.sender_email,
+            self.app_password
+        )
+    
+    def build_message(self, to_email: str, subject: str, html_body: str) -> MIMEMultipart:
         msg = MIMEMultipart('alternative')
         msg['Subject'] = subject
         msg['From'] = self.sender_email
         msg['To'] = to_email
         msg.attach(MIMEText(html_body, 'html'))
+        return msg
+    
+    def send_email(self, to_email: str, subject: str, html_body: str) -> bool:
+        """Send single email"""
         
-        try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.app_password)
-                server.send_message(msg)
-            
+        if self.pool.send(to_email, self.build_message(to_email, subject, html_body)):
             print(f"✅ Email sent to {to_email}")
             return True
-            
-        except Exception as e:
-            print(f"❌ Error sending email to {to_email}: {str(e)}")
-            return False
-    
-    def send_newsletter(self, subscriber_list: List[str], subject: str, html_body: str) -> Dict:
-        """Send newsletter to multiple subscribers"""
         
-        successful = 0
-        failed = 0
+        print(f"❌ Error sending email to {to_email}")
+        return False
+    
+    def send_newsletter(self, subscriber_list: List[str], subject: str, html_body: str, parallel: Optional[int] = None) -> Dict:
+        """Send newsletter to multiple subscribers over pooled connections"""
         
-        for email in subscriber_list:
-            if self.send_email(email, subject, html_body):
-                successful += 1
-            else:
-                failed += 1
+        report = self.pool.send_many(
+            ((email, self.build_message(email, subject, html_body)) for email in subscriber_list),
+            parallel=parallel
+        )
         
-        print(f"📊 Newsletter: {successful} sent, {failed} failed")
-        return {"sent": successful, "failed": failed}
+        print(f"📊 Newsletter: {report['sent']} sent, {report['failed']} failed ({report['per_second']}/s)")
+        return report
     
     def send_welcome_email(self, subscriber_email: str) -> bool:
         """Send welcome email to new subscriber"""
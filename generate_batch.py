@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Generate a batch of posts from the command line
+Run: python generate_batch.py "Topic one" "Topic two" ...
+     python generate_batch.py --file topics.txt --concurrency 8
+     python generate_batch.py --strategy <content_strategy_id>
+"""
+
+import os
+import sys
+import asyncio
+import argparse
+
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from database import SessionLocal, init_db
+from models import ContentStrategy
+from services.content_engine_factory import ContentEngineFactory
+from services.batch_generation import BatchGenerator, items_from_topics, items_from_strategy
+
+
+def load_items(args):
+    if args.strategy:
+        db = SessionLocal()
+        try:
+            strategy = db.get(ContentStrategy, args.strategy)
+            if not strategy:
+                sys.exit(f"❌ Content strategy {args.strategy} not found")
+            return items_from_strategy(strategy)
+        finally:
+            db.close()
+
+    topics = list(args.topics)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            topics.extend(line for line in f if not line.startswith("#"))
+    return items_from_topics(topics, args.niche, args.target_market, args.region)
+
+
+def print_progress(report) -> None:
+    print(
+        f"\r  {report.completed}/{report.total} done  "
+        f"{len(report.post_ids)} stored  {len(report.failures)} failed",
+        end="",
+        flush=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate many blog posts in one batch")
+    parser.add_argument("topics", nargs="*", help="Topics to write about")
+    parser.add_argument("--file", help="File with one topic per line")
+    parser.add_argument("--strategy", help="ContentStrategy id whose parameters list the topics")
+    parser.add_argument("--provider", help="AI provider, or a comma-separated list for failover")
+    parser.add_argument("--concurrency", type=int, help="Generations in flight at once")
+    parser.add_argument("--rpm", type=int, help="Requests per minute allowed per provider (overrides <PROVIDER>_RPM and AI_RPM)")
+    parser.add_argument("--regenerate", action="store_true", help="Skip the prompt cache")
+    parser.add_argument("--niche", default=os.getenv("NICHE", "luxury-resorts"))
+    parser.add_argument("--target-market", default=os.getenv("TARGET_MARKET", "US-millennial"))
+    parser.add_argument("--region", default=os.getenv("GEO_REGION", "Cape Town"))
+    args = parser.parse_args()
+
+    init_db()
+    items = load_items(args)
+    if not items:
+        sys.exit("❌ No topics given")
+
+    engine = ContentEngineFactory.create_content_engine(args.provider)
+    generator = BatchGenerator(
+        engine, SessionLocal, concurrency=args.concurrency, bypass_cache=args.regenerate, rpm=args.rpm
+    )
+
+    print(f"✍️  Generating {len(items)} posts\n")
+    report = asyncio.run(generator.run(items, progress=print_progress))
+    print()
+
+    summary = report.to_dict()
+    print(f"\n✅ {summary['succeeded']} posts stored in {summary['seconds']}s")
+    for failure in summary["failures"]:
+        print(f"❌ {failure['topic']}: {failure['error']}")
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Local stand-in SMTP server for email tests and benchmarks
+Install: pip install aiosmtpd
+Run: python local_smtp_server.py  (listens on localhost:8025 until Ctrl+C)
+"""
+
+import time
+import threading
+
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+
+class RecordingHandler:
+    """Counts delivered messages and connections; rejects selected recipients"""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.recipients = []
+        self.connections = 0
+        self.logins = 0
+        self._lock = threading.Lock()
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        with self._lock:
+            self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.reject:
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        with self._lock:
+            self.recipients.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+
+class LocalSMTPServer:
+    """Context manager running an aiosmtpd server on a background thread"""
+
+    def __init__(self, port: int = 8025, reject=()):
+        self.handler = RecordingHandler(reject)
+        self.port = port
+
+        def authenticate(server, session, envelope, mechanism, auth_data):
+            with self.handler._lock:
+                self.handler.logins += 1
+            return AuthResult(success=True)
+
+        self.controller = Controller(
+            self.handler,
+            hostname="127.0.0.1",
+            port=port,
+            authenticator=authenticate,
+            auth_require_tls=False
+        )
+
+    def __enter__(self):
+        self.controller.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.controller.stop()
+
+
+if __name__ == "__main__":
+    with LocalSMTPServer() as server:
+        print(f"📮 Local SMTP server on 127.0.0.1:{server.port} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(5)
+                print(f"  {len(server.handler.recipients)} messages, {server.handler.connections} connections")
+        except KeyboardInterrupt:
+            pass
@@ -7,15 +7,40 @@ Location: backend/main.py
 Purpose: FastAPI main application
 """
 
-from fastapi import FastAPI, BackgroundTasks, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, RedirectResponse, Response
 import os
+import asyncio
+import json
+import secrets
 from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, ValidationError
 
-from database import init_db, get_db, SessionLocal
-from services.content_engine_gemini import ContentEngine
-from services.email_service_zoho import EmailService
-from models import BlogPost, EmailSubscriber, Monetization
+from database import init_db, get_db, get_async_db, get_async_read_db, SessionLocal, async_engine, read_router
+from services.content_engine_factory import ContentEngineFactory
+from services.ai_clients import ai_clients
+from services.lazy import LazyService
+from services.view_counter import ViewCounter
+from services.post_cache import PostCache
+from services.pagination import published_page_async
+from services.job_queue import GenerationQueue
+from services.email_outbox import EmailOutbox
+from services.subscribers import stream_active_emails
+from services.stats import StatsService
+from services.publishing import Publisher
+from services.click_tracker import ClickTracker, LinkDirectory
+from services.analytics_ingest import AnalyticsIngest
+from services.search import PostSearch
+from services.post_payload import RenderedPost
+from services.static_site import StaticSiteBuilder
+from services.feeds import FeedService
+from services.batch_generation import (
+    BatchRunner, items_from_topics, items_from_strategy, post_values, monetization_values
+)
+from models import BlogPost, EmailSubscriber, Monetization, ContentStrategy, PostPayload
+from sqlalchemy import select
 import uuid
 
 # Initialize
@@ -32,16 +57,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-View-Count"],
 )
 
-# Initialize services
-content_engine = ContentEngine()
-email_service = EmailService()
+def create_email_service():
+    from services.email_service_zoho import EmailService
+    return EmailService()
+
+# Initialize services; the AI provider and SMTP stack load on first use
+content_engine = LazyService(ContentEngineFactory.create_content_engine)
+email_service = LazyService(create_email_service)
+view_counter = ViewCounter(SessionLocal)
+post_cache = PostCache()
+# Refills after a post changes read from the primary until the replicas catch up
+post_cache.watch(SessionLocal, on_invalidate=read_router.prefer_primary)
+email_outbox = EmailOutbox(SessionLocal, email_service)
+stats_service = StatsService(SessionLocal)
+batch_runner = BatchRunner(content_engine, SessionLocal)
+publisher = Publisher()
+click_tracker = ClickTracker(SessionLocal)
+link_directory = LinkDirectory(read_router.read_session, publisher.affiliates)
+analytics_ingest = AnalyticsIngest(SessionLocal)
+post_search = PostSearch()
+feeds = FeedService(read_router.read_session)
+# Static pre-rendering is opt-in: set STATIC_SITE_DIR to where nginx or the CDN serves from
+static_site = StaticSiteBuilder(SessionLocal) if os.getenv("STATIC_SITE_DIR") else None
 
 # Initialize database
 @app.on_event("startup")
-def startup():
+async def startup():
     init_db()
+    view_counter.start()
+    click_tracker.start()
+    analytics_ingest.start()
+    email_outbox.start()
+    stats_service.start()
+    await read_router.start()
+    await generation_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await generation_queue.stop()
+    await batch_runner.stop()
+    email_outbox.stop()
+    stats_service.stop()
+    view_counter.stop()
+    click_tracker.stop()
+    analytics_ingest.stop()
+    await ai_clients.aclose()
+    await read_router.stop()
+    await async_engine.dispose()
 
 # ============================================================================
 # HEALTH CHECK
@@ -57,129 +122,365 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "post_cache": post_cache.stats(),
+        "database": read_router.stats(),
+        "ai_providers": (
+            content_engine.get_health()
+            if content_engine.initialized and hasattr(content_engine, "get_health") else None
+        )
+    }
 
 # ============================================================================
 # CONTENT ENDPOINTS
 # ============================================================================
 
-@app.post("/api/posts/generate")
-async def generate_post(
-    topic: str,
-    background_tasks: BackgroundTasks,
-    db = Depends(get_db)
-):
-    """Generate a new blog post"""
+def store_generated_post(db, topic: str, post_data: dict) -> BlogPost:
+    """Persist a generated post and its monetization record in one transaction"""
+    
+    post = BlogPost(**post_values(topic, post_data))
+    db.add(post)
+    db.add(Monetization(**monetization_values(post.id, post_data)))
+    db.commit()
+    db.refresh(post)
     
-    niche = os.getenv("NICHE", "luxury-resorts")
-    target_market = os.getenv("TARGET_MARKET", "US-millennial")
-    region = os.getenv("GEO_REGION", "Cape Town")
+    return post
+
+def save_generated_post(topic: str, post_data: dict) -> BlogPost:
+    """store_generated_post with its own session, for running in a thread"""
     
+    db = SessionLocal()
     try:
-        # Generate content
-        post_data = await content_engine.generate_blog_post(
-            topic=topic,
-            niche=niche,
-            target_market=target_market,
-            region=region
-        )
-        
-        # Create blog post
-        post = BlogPost(
-            id=str(uuid.uuid4()),
-            title=post_data.get("title", "Untitled"),
-            slug=post_data.get("slug", topic.lower().replace(" ", "-")),
-            content=post_data.get("content", ""),
-            excerpt=post_data.get("meta_description", ""),
-            seo_data=post_data.get("seo_data", {}),
-            keywords=post_data.get("keywords", []),
-            status="draft"
-        )
-        
-        db.add(post)
-        db.commit()
-        db.refresh(post)
-        
-        # Create monetization record
-        monetization = Monetization(
-            id=str(uuid.uuid4()),
-            blog_post_id=post.id,
-            affiliate_links=post_data.get("affiliate_suggestions", [])
-        )
-        db.add(monetization)
-        db.commit()
-        
-        # Schedule email notification
-        background_tasks.add_task(
-            notify_subscribers_new_post,
-            post.id,
-            post.title
-        )
-        
-        return {
-            "status": "success",
-            "post_id": post.id,
-            "title": post.title,
-            "message": "Post generated successfully"
-        }
-        
+        return store_generated_post(db, topic, post_data)
+    finally:
+        db.close()
+
+async def announce_post(post: BlogPost):
+    """Notify subscribers; a failed mailing should not fail the generation"""
+    try:
+        await asyncio.to_thread(notify_subscribers_new_post, post.id, post.title)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"❌ Error notifying subscribers of {post.id}: {str(e)}")
 
-@app.get("/api/posts")
-async def list_posts(db = Depends(get_db)):
-    """List all blog posts"""
-    
-    posts = db.query(BlogPost).filter(
-        BlogPost.status == "published"
-    ).order_by(BlogPost.published_at.desc()).all()
-    
-    return [
-        {
-            "id": p.id,
-            "title": p.title,
-            "slug": p.slug,
-            "excerpt": p.excerpt,
-            "views": p.views,
-            "published_at": p.published_at.isoformat() if p.published_at else None
-        }
-        for p in posts
-    ]
+async def run_generation_job(job) -> str:
+    """Generate and store the post for a queued job; no session is held during generation"""
+    
+    post_data = await content_engine.generate_blog_post(
+        topic=job.topic,
+        niche=job.niche,
+        target_market=job.target_market,
+        region=job.region,
+        bypass_cache=bool(job.bypass_cache)
+    )
+    
+    post = await asyncio.to_thread(save_generated_post, job.topic, post_data)
+    await announce_post(post)
+    
+    return post.id
 
-@app.get("/api/posts/{slug}")
-async def get_post(slug: str, db = Depends(get_db)):
-    """Get single blog post"""
+generation_queue = GenerationQueue(SessionLocal, run_generation_job)
+
+@app.post("/api/posts/generate", status_code=202)
+async def generate_post(topic: str, regenerate: bool = False):
+    """Queue generation of a new blog post; regenerate skips the prompt cache"""
+    
+    job = await generation_queue.submit_async(
+        topic=topic,
+        niche=os.getenv("NICHE", "luxury-resorts"),
+        target_market=os.getenv("TARGET_MARKET", "US-millennial"),
+        region=os.getenv("GEO_REGION", "Cape Town"),
+        bypass_cache=regenerate
+    )
     
-    post = db.query(BlogPost).filter(BlogPost.slug == slug).first()
+    return {
+        "status": "queued",
+        "job_id": job.id,
+        "message": "Post generation queued"
+    }
+
+@app.get("/api/posts/generate/stream")
+async def generate_post_stream(topic: str, regenerate: bool = False):
+    """Generate a post and stream it as Server-Sent Events while it is written"""
+    
+    def sse(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    async def events():
+        try:
+            async for event in content_engine.stream_blog_post(
+                topic=topic,
+                niche=os.getenv("NICHE", "luxury-resorts"),
+                target_market=os.getenv("TARGET_MARKET", "US-millennial"),
+                region=os.getenv("GEO_REGION", "Cape Town"),
+                bypass_cache=regenerate
+            ):
+                if event["type"] == "token":
+                    yield sse("token", {"text": event["text"]})
+                    continue
+                
+                post = await asyncio.to_thread(save_generated_post, topic, event["post"])
+                yield sse("done", {"post_id": post.id, "title": post.title, "slug": post.slug})
+                await announce_post(post)
+        except Exception as e:
+            yield sse("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+class BatchRequest(BaseModel):
+    topics: List[str] = []
+    strategy_id: Optional[str] = None
+    regenerate: bool = False
+
+@app.post("/api/posts/generate/batch", status_code=202)
+async def generate_batch(request: BatchRequest, db = Depends(get_async_db)):
+    """Generate posts for a topic list or a content strategy as one batch"""
+    
+    if request.strategy_id:
+        strategy = await db.get(ContentStrategy, request.strategy_id)
+        if not strategy:
+            raise HTTPException(status_code=404, detail="Content strategy not found")
+        try:
+            items = items_from_strategy(strategy)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        items = items_from_topics(
+            request.topics,
+            niche=os.getenv("NICHE", "luxury-resorts"),
+            target_market=os.getenv("TARGET_MARKET", "US-millennial"),
+            region=os.getenv("GEO_REGION", "Cape Town")
+        )
+    
+    if not items:
+        raise HTTPException(status_code=400, detail="No topics to generate")
+    
+    report = batch_runner.submit(items, bypass_cache=request.regenerate)
+    
+    return {
+        "status": "running",
+        "batch_id": report.id,
+        "total": report.total
+    }
+
+@app.get("/api/posts/generate/batch/{batch_id}")
+async def get_batch(batch_id: str):
+    """Get progress and per-topic failures of a generation batch"""
+    
+    batch = batch_runner.get(batch_id)
+    
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    return batch
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a generation job"""
+    
+    job = await generation_queue.get_async(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+@app.post("/api/posts/{post_id}/publish")
+async def publish_post(post_id: str, db = Depends(get_db)):
+    """Publish a draft, tagging its affiliate links once for all later reads"""
+    
+    post = publisher.publish(db, post_id)
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    # Increment views
-    post.views += 1
-    db.commit()
+    link_directory.invalidate(post.id)
+    if static_site:
+        static_site.schedule()
     
     return {
-        "id": post.id,
-        "title": post.title,
+        "status": post.status,
+        "post_id": post.id,
         "slug": post.slug,
-        "content": post.content,
-        "views": post.views,
-        "published_at": post.published_at.isoformat() if post.published_at else None
+        "published_at": post.published_at.isoformat()
     }
 
+@app.get("/api/posts")
+async def list_posts(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db = Depends(get_async_read_db)
+):
+    """List published blog posts, newest first, one page at a time"""
+    
+    try:
+        return await post_cache.get_listing_async(
+            cursor, limit,
+            lambda: published_page_async(db, cursor=cursor, limit=limit)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/posts/search")
+async def search_posts(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    db = Depends(get_async_read_db)
+):
+    """Full-text search over published posts, best matches first, with highlighted snippets"""
+    
+    return await post_search.search(db, q, limit)
+
+@app.get("/api/posts/{slug}")
+async def get_post(slug: str, request: Request, db = Depends(get_async_read_db)):
+    """
+    Get single blog post, served from its pre-compressed payload with HTTP validators.
+    
+    The body has no `views` field: the live view count is sent in the
+    X-View-Count response header instead (exposed to CORS clients).
+    """
+    
+    async def load():
+        row = (await db.execute(
+            select(
+                BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.content, BlogPost.post_metadata,
+                BlogPost.views, BlogPost.published_at, BlogPost.updated_at, PostPayload
+            )
+            .outerjoin(PostPayload, PostPayload.blog_post_id == BlogPost.id)
+            .where(BlogPost.slug == slug)
+        )).first()
+        if not row:
+            return None
+        view_counter.observe(row.slug, row.views or 0)
+        payload = row.PostPayload
+        if payload is not None and payload.source_updated_at == row.updated_at:
+            return RenderedPost.from_row(payload, row.slug)
+        # Drafts, and posts edited since publishing, are rendered here instead
+        return RenderedPost.render(row, best=False)
+    
+    cached = await post_cache.get_post_async(slug, load)
+    
+    if not cached:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    # Count the view in memory; flushed to the database in batches.
+    # The count changes on every hit, so it travels in a header, not the cached body,
+    # and comes from the counter rather than the copy loaded with the post.
+    view_counter.increment(slug)
+    
+    body, headers = cached.select(request.headers.get("accept-encoding"))
+    headers["X-View-Count"] = str(view_counter.total(slug))
+    
+    if cached.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    
+    return Response(body, media_type="application/json", headers=headers)
+
+# ============================================================================
+# SITEMAP & RSS
+# ============================================================================
+
+FEED_CACHE_CONTROL = "public, max-age=600"
+
+def xml_response(body, media_type: str = "application/xml"):
+    """Cached feeds go out as one body; freshly rendered ones stream from the cursor"""
+    headers = {"Cache-Control": FEED_CACHE_CONTROL}
+    if isinstance(body, bytes):
+        return Response(body, media_type=media_type, headers=headers)
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+@app.get("/sitemap.xml")
+async def sitemap():
+    """Sitemap index over chunks of up to 50,000 posts"""
+    return xml_response(await feeds.sitemap_index())
+
+@app.get("/sitemaps/posts-{n}.xml")
+async def sitemap_chunk(n: int):
+    """One sitemap chunk, streamed from a server-side cursor or served from cache"""
+    
+    body = await feeds.sitemap_chunk(n)
+    
+    if body is None:
+        raise HTTPException(status_code=404, detail="Sitemap not found")
+    
+    return xml_response(body)
+
+@app.get("/rss.xml")
+async def rss_feed():
+    """RSS feed of the latest posts"""
+    return xml_response(await feeds.rss(), media_type="application/rss+xml")
+
+# ============================================================================
+# AFFILIATE REDIRECTS
+# ============================================================================
+
+@app.get("/go/{post_id}/{link_id}")
+async def affiliate_redirect(post_id: str, link_id: str):
+    """Redirect to an affiliate link, counting the click in memory"""
+    
+    target = await link_directory.resolve(post_id, link_id)
+    
+    if not target:
+        raise HTTPException(status_code=404, detail="Link not found")
+    
+    url, provider = target
+    click_id = secrets.token_hex(6)
+    click_tracker.record(post_id, link_id, provider, click_id)
+    
+    return RedirectResponse(link_directory.click_url(url, provider, click_id), status_code=302)
+
+# ============================================================================
+# ANALYTICS ENDPOINTS
+# ============================================================================
+
+class BeaconEvent(BaseModel):
+    post_id: str = Field(max_length=64)
+    visitor_id: str = Field(max_length=128)
+    seconds: Optional[int] = Field(None, ge=0, le=86400)
+    bounced: bool = False
+    ts: Optional[int] = None  # epoch milliseconds, as sent by Date.now()
+
+class BeaconBatch(BaseModel):
+    events: List[BeaconEvent] = Field(max_length=100)
+
+@app.post("/api/analytics/beacon", status_code=202)
+async def analytics_beacon(request: Request):
+    """Accept a batch of page-view events; aggregated in memory, flushed as daily rollups"""
+    
+    # navigator.sendBeacon posts text/plain, so parse the body ourselves
+    try:
+        batch = BeaconBatch.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False, include_input=False))
+    
+    accepted = sum(
+        analytics_ingest.record(
+            event.post_id, event.visitor_id, event.seconds, event.bounced,
+            event.ts / 1000 if event.ts else None
+        )
+        for event in batch.events
+    )
+    
+    return {"accepted": accepted, "dropped": len(batch.events) - accepted}
+
 # ============================================================================
 # EMAIL ENDPOINTS
 # ============================================================================
 
 @app.post("/api/email/subscribe")
-async def subscribe(email: str, db = Depends(get_db)):
+async def subscribe(email: str, db = Depends(get_async_db)):
     """Subscribe to newsletter"""
     
     # Check if already subscribed
-    existing = db.query(EmailSubscriber).filter(
-        EmailSubscriber.email == email
-    ).first()
+    existing = await db.scalar(
+        select(EmailSubscriber.id).where(EmailSubscriber.email == email)
+    )
     
     if existing:
         return {"status": "already_subscribed"}
@@ -191,7 +492,7 @@ async def subscribe(email: str, db = Depends(get_db)):
         name=email.split("@")[0]
     )
     db.add(subscriber)
-    db.commit()
+    await db.commit()
     
     # Send welcome email
     email_service.send_welcome_email(email)
@@ -199,75 +500,63 @@ async def subscribe(email: str, db = Depends(get_db)):
     return {"status": "subscribed", "email": email}
 
 @app.post("/api/email/send-newsletter")
-async def send_newsletter(subject: str, html_body: str, db = Depends(get_db)):
-    """Send newsletter to all subscribers"""
+async def send_newsletter(subject: str, html_body: str):
+    """Queue a newsletter to all subscribers in the email outbox"""
+    
+    # Streaming every subscriber into the outbox is synchronous; keep it off the event loop
+    campaign_id = await asyncio.to_thread(queue_campaign, f"Newsletter: {subject}", subject, html_body)
     
-    subscribers = db.query(EmailSubscriber).filter(
-        EmailSubscriber.is_active == True
-    ).all()
+    return {"status": "queued", "campaign_id": campaign_id}
+
+@app.get("/api/email/campaigns/{campaign_id}")
+async def get_campaign(campaign_id: str):
+    """Get delivery progress for an email campaign"""
     
-    subscriber_emails = [s.email for s in subscribers]
+    campaign = email_outbox.campaign_status(campaign_id)
     
-    result = email_service.send_newsletter(
-        subscriber_emails,
-        subject,
-        html_body
-    )
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
     
-    return result
+    return campaign
 
 # ============================================================================
 # DASHBOARD ENDPOINTS
 # ============================================================================
 
 @app.get("/api/dashboard/stats")
-async def get_stats(db = Depends(get_db)):
-    """Get blog statistics"""
+async def get_stats(db = Depends(get_async_read_db)):
+    """Get blog statistics as of the last rollup refresh"""
     
-    total_posts = db.query(BlogPost).filter(
-        BlogPost.status == "published"
-    ).count()
-    
-    total_views = db.query(BlogPost).filter(
-        BlogPost.status == "published"
-    ).count()
-    
-    total_subscribers = db.query(EmailSubscriber).filter(
-        EmailSubscriber.is_active == True
-    ).count()
+    return await stats_service.current_async(db)
+
+@app.post("/api/dashboard/stats/refresh")
+async def refresh_stats():
+    """Recompute the stats rollup now"""
     
-    return {
-        "total_posts": total_posts,
-        "total_views": total_views,
-        "total_subscribers": total_subscribers
-    }
+    # The aggregate queries are synchronous; keep them off the event loop
+    return await asyncio.to_thread(stats_service.refresh)
 
 # ============================================================================
 # BACKGROUND TASKS
 # ============================================================================
 
-async def notify_subscribers_new_post(post_id: str, post_title: str):
-    """Notify subscribers of new post"""
+def queue_campaign(name: str, subject: str, html_body: str) -> str:
+    """Queue an email to every active subscriber, reading them with a session of its own"""
     
     db = SessionLocal()
     
     try:
-        subscribers = db.query(EmailSubscriber).filter(
-            EmailSubscriber.is_active == True
-        ).all()
-        
-        subscriber_emails = [s.email for s in subscribers]
-        
-        post_url = f"https://yourblog.com/posts/{post_id}"
-        
-        email_service.send_new_post_notification(
-            subscriber_emails,
-            post_title,
-            post_url
-        )
-        
+        return email_outbox.create_campaign(name, subject, html_body, stream_active_emails(db))
     finally:
         db.close()
 
+def notify_subscribers_new_post(post_id: str, post_title: str):
+    """Notify subscribers of new post"""
+    
+    post_url = f"https://yourblog.com/posts/{post_id}"
+    content = email_service.new_post_content(post_title, post_url)
+    
+    queue_campaign(f"New post: {post_title}", content["subject"], content["body_html"])
+
 
 
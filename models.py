@@ -7,7 +7,7 @@ Location: backend/models.py
 Purpose: SQLAlchemy database models
 """
 
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, JSON, Boolean, ForeignKey, Index
+from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, Text, JSON, Boolean, ForeignKey, Index, UniqueConstraint, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -27,7 +27,8 @@ class BlogPost(Base):
     status = Column(String(50), default="draft")
     views = Column(Integer, default=0)
     
-    metadata = Column(JSON)
+    # "metadata" is reserved by the declarative API, so map it under another name
+    post_metadata = Column("metadata", JSON)
     seo_data = Column(JSON)
     keywords = Column(JSON)
     
@@ -46,6 +47,7 @@ class BlogPost(Base):
         Index('idx_slug', 'slug'),
         Index('idx_status', 'status'),
         Index('idx_published_at', 'published_at'),
+        Index('idx_updated_at', 'updated_at'),
     )
 
 class Monetization(Base):
@@ -67,6 +69,20 @@ class Monetization(Base):
     
     post = relationship("BlogPost", back_populates="monetization")
 
+class AffiliateClick(Base):
+    __tablename__ = "affiliate_clicks"
+    
+    # Running click total per post and affiliate provider
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    blog_post_id = Column(String, ForeignKey('blog_posts.id'), nullable=False)
+    provider = Column(String(50), nullable=False)
+    clicks = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint('blog_post_id', 'provider', name='uq_affiliate_clicks_post_provider'),
+    )
+
 class Analytics(Base):
     __tablename__ = "analytics"
     
@@ -79,9 +95,20 @@ class Analytics(Base):
     bounce_rate = Column(Float, default=0)
     avg_time_on_page = Column(Integer, default=0)
     
+    # Running totals the rates above are derived from, plus the HyperLogLog
+    # registers behind unique_visitors so later flushes can merge into them
+    bounces = Column(Integer, default=0)
+    timed_views = Column(Integer, default=0)
+    time_on_page_total = Column(Integer, default=0)
+    visitor_sketch = Column(LargeBinary, nullable=True)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     
     post = relationship("BlogPost", back_populates="analytics")
+    
+    __table_args__ = (
+        UniqueConstraint('blog_post_id', 'date', name='uq_analytics_post_date'),
+    )
 
 class EmailSubscriber(Base):
     __tablename__ = "email_subscribers"
@@ -104,6 +131,34 @@ class EmailCampaign(Base):
     total_sent = Column(Integer, default=0)
     opens = Column(Integer, default=0)
     clicks = Column(Integer, default=0)
+    
+    status = Column(String(50), default="draft")
+    total_recipients = Column(Integer, default=0)
+    total_failed = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    deliveries = relationship("EmailDelivery", back_populates="campaign")
+
+class EmailDelivery(Base):
+    __tablename__ = "email_deliveries"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    campaign_id = Column(String, ForeignKey('email_campaigns.id'), nullable=False)
+    email = Column(String(255), nullable=False)
+    
+    status = Column(String(50), default="pending")
+    attempts = Column(Integer, default=0)
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    
+    campaign = relationship("EmailCampaign", back_populates="deliveries")
+    
+    __table_args__ = (
+        UniqueConstraint('campaign_id', 'email', name='uq_delivery_campaign_email'),
+        Index('idx_delivery_due', 'status', 'next_attempt_at'),
+    )
 
 class AffiliateAccount(Base):
     __tablename__ = "affiliate_accounts"
@@ -125,5 +180,65 @@ class ContentStrategy(Base):
     monthly_posts = Column(Integer, default=4)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class StatsRollup(Base):
+    __tablename__ = "stats_rollup"
+    
+    id = Column(String, primary_key=True, default="global")
+    total_posts = Column(Integer, default=0)
+    total_views = Column(Integer, default=0)
+    total_subscribers = Column(Integer, default=0)
+    
+    affiliate_clicks = Column(Integer, default=0)
+    affiliate_conversions = Column(Integer, default=0)
+    affiliate_revenue = Column(Float, default=0)
+    estimated_revenue = Column(Float, default=0)
+    
+    daily_views = Column(JSON)
+    as_of = Column(DateTime, default=datetime.utcnow)
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    topic = Column(String(255), nullable=False)
+    niche = Column(String(100))
+    target_market = Column(String(100))
+    region = Column(String(100))
+    bypass_cache = Column(Boolean, default=False)
+    
+    status = Column(String(50), default="queued")
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    blog_post_id = Column(String, ForeignKey('blog_posts.id'), nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index('idx_generation_jobs_status', 'status', 'created_at'),
+    )
+
+class ReplicaHeartbeat(Base):
+    __tablename__ = "replica_heartbeat"
+    
+    # Written to the primary on a timer; how stale a replica's copy is measures its lag
+    id = Column(String, primary_key=True, default="primary")
+    beat_at = Column(DateTime, default=datetime.utcnow)
+
+class PostPayload(Base):
+    __tablename__ = "post_payloads"
+    
+    # The post's API response, serialized and compressed once at publish time
+    blog_post_id = Column(String, ForeignKey('blog_posts.id'), primary_key=True)
+    etag = Column(String(64), nullable=False)
+    # updated_at of the post this payload was rendered from
+    source_updated_at = Column(DateTime, nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    body_gzip = Column(LargeBinary, nullable=False)
+    body_br = Column(LargeBinary, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 
 
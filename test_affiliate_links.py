@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for affiliate link rewriting
+Run: python test_affiliate_links.py
+"""
+
+import os
+import sys
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from services.affiliate_service import AffiliateService
+
+
+def test_rewrites_provider_links_in_html():
+    html = (
+        '<a href="https://www.booking.com/hotel/za/silo.html?aid=1&amp;label=x">Silo</a> '
+        'Tour: https://www.getyourguide.com/cape-town-l1/. '
+        '<a href="https://example.com/?aid=1">Other</a> '
+        'https://booking.com.example.net/x'
+    )
+    rewritten = AffiliateService().rewrite_html(html)
+
+    assert 'href="https://www.booking.com/hotel/za/silo.html?label=x&amp;aid=7777439"' in rewritten
+    assert "Tour: https://www.getyourguide.com/cape-town-l1/?partner_id=OYSNX2E. " in rewritten
+    assert 'href="https://example.com/?aid=1"' in rewritten
+    assert "https://booking.com.example.net/x" in rewritten
+
+
+def test_rewrites_generated_suggestions():
+    suggestions = AffiliateService().rewrite_suggestions([
+        {"type": "tour", "name": "Winelands", "platform": "Viator", "link": "https://www.viator.com/tours/x?pid=OLD"},
+        {"type": "hotel", "name": "One&Only", "platform": "booking.com", "link": "..."},
+        {"type": "other", "name": "Cafe", "platform": "", "link": "https://example.com"},
+    ])
+
+    assert suggestions[0]["link"] == "https://www.viator.com/tours/x?pid=P00275646"
+    assert suggestions[1]["link"] == "https://www.booking.com/searchresults.html?ss=One%26Only&aid=7777439"
+    assert suggestions[2]["link"] == "https://example.com"
+
+
+def test_link_generators_keep_their_format():
+    service = AffiliateService()
+    assert service.generate_booking_link("Cape Town") == "https://www.booking.com/index.html?aid=7777439&city=Cape+Town"
+    assert service.generate_getyourguide_link() == "https://www.getyourguide.com/?partner_id=OYSNX2E"
+    assert service.generate_viator_link("42") == "https://www.viator.com/?pid=P00275646&tour_id=42"
+
+
+if __name__ == "__main__":
+    test_rewrites_provider_links_in_html()
+    test_rewrites_generated_suggestions()
+    test_link_generators_keep_their_format()
+    print("✅ Affiliate link tests passed!")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared AI provider clients
+Install: pip install openai anthropic
+Run: python test_ai_clients.py
+"""
+
+import os
+import sys
+import asyncio
+import threading
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+import pytest
+
+from services.ai_clients import AIClientRegistry
+
+# No request is ever sent; the clients only need a key to be built
+KEYS = {"OPENAI_API_KEY": "test-openai-key", "ANTHROPIC_API_KEY": "test-anthropic-key"}
+
+
+class RecordingRegistry(AIClientRegistry):
+    """Keeps the pooled HTTP clients it hands out so the test can check they get closed"""
+
+    def __init__(self):
+        super().__init__()
+        self.http_clients = []
+
+    def _http_client(self):
+        client = super()._http_client()
+        self.http_clients.append(client)
+        return client
+
+
+def with_keys(test):
+    """Run `test` with the provider keys set, restoring the environment afterwards"""
+    saved = {name: os.environ.get(name) for name in KEYS}
+    os.environ.update(KEYS)
+    try:
+        test()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def test_one_client_per_provider():
+    pytest.importorskip("openai")
+    pytest.importorskip("anthropic")
+
+    def run():
+        registry = RecordingRegistry()
+        clients = []
+
+        def build():
+            clients.append(registry.openai())
+
+        # Concurrent first use still builds a single client
+        threads = [threading.Thread(target=build) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert all(client is clients[0] for client in clients)
+
+        assert registry.anthropic() is registry.anthropic()
+        assert registry.anthropic() is not clients[0]
+        assert len(registry.http_clients) == 2
+        asyncio.run(registry.aclose())
+
+    with_keys(run)
+
+
+def test_engines_share_the_registry_client():
+    pytest.importorskip("openai")
+    from services.ai_clients import ai_clients
+    from services.content_engine_openai import ContentEngine
+
+    def run():
+        first, second = ContentEngine(), ContentEngine()
+        assert first.client is second.client is ai_clients.openai()
+        asyncio.run(ai_clients.aclose())
+
+    with_keys(run)
+
+
+def test_missing_key_builds_nothing():
+    pytest.importorskip("openai")
+    registry = RecordingRegistry()
+    saved = os.environ.pop("OPENAI_API_KEY", None)
+    try:
+        with pytest.raises(ValueError, match="OPENAI_API_KEY not set"):
+            registry.openai()
+    finally:
+        if saved is not None:
+            os.environ["OPENAI_API_KEY"] = saved
+    assert not registry._clients
+
+
+def test_clients_are_closed_on_shutdown():
+    pytest.importorskip("openai")
+    pytest.importorskip("anthropic")
+
+    def run():
+        registry = RecordingRegistry()
+        openai_client = registry.openai()
+        registry.anthropic()
+        assert not any(client.is_closed for client in registry.http_clients)
+
+        asyncio.run(registry.aclose())
+        assert len(registry.http_clients) == 2
+        assert all(client.is_closed for client in registry.http_clients)
+
+        # Used again after shutdown, a fresh client is built
+        assert registry.openai() is not openai_client
+        assert len(registry.http_clients) == 3
+        asyncio.run(registry.aclose())
+
+    with_keys(run)
+
+
+if __name__ == "__main__":
+    test_one_client_per_provider()
+    test_engines_share_the_registry_client()
+    test_missing_key_builds_nothing()
+    test_clients_are_closed_on_shutdown()
+    print("✅ AI client tests passed!")
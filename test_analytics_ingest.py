@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for beacon ingestion and daily Analytics rollups
+Run: python test_analytics_ingest.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy import select
+
+from database import SessionLocal, init_db
+from models import Analytics, BlogPost
+from services.analytics_ingest import AnalyticsIngest
+from services.hyperloglog import HyperLogLog
+
+
+def test_hyperloglog_merges_without_double_counting():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(5000):
+        a.add(f"v{i}")
+    for i in range(2500, 7500):
+        b.add(f"v{i}")
+    a.merge(HyperLogLog.from_bytes(b.to_bytes()))
+    assert abs(a.count() - 7500) < 7500 * 0.05
+
+
+def test_flushes_upsert_one_row_per_post_per_day():
+    init_db()
+    db = SessionLocal()
+    db.add(BlogPost(id="analytics-post", title="Garden Route", slug="garden-route", content="<p>Body</p>"))
+    db.commit()
+    db.close()
+
+    ingest = AnalyticsIngest(SessionLocal, max_pending=2)
+    for i in range(600):
+        ingest.record("analytics-post", f"visitor-{i % 300}", seconds=30, bounced=i % 4 == 0)
+    ingest.record("no-such-post", "visitor-1")
+    # Buffer holds two (post, day) keys; a third is dropped until the next flush
+    assert not ingest.record("another-post", "visitor-1")
+    assert ingest.dropped == 1
+    assert ingest.flush() == 600
+
+    # Second flush: 200 returning visitors and 200 new ones, no time reported
+    for i in range(200, 600):
+        ingest.record("analytics-post", f"visitor-{i}")
+    assert ingest.flush() == 400
+
+    db = SessionLocal()
+    try:
+        rows = db.scalars(select(Analytics).where(Analytics.blog_post_id == "analytics-post")).all()
+        assert len(rows) == 1
+        row = rows[0]
+        assert row.views == 1000
+        assert abs(row.unique_visitors - 600) < 600 * 0.05
+        assert abs(row.bounce_rate - 150 / 1000) < 1e-9
+        assert row.avg_time_on_page == 30
+        assert db.scalars(select(Analytics).where(Analytics.blog_post_id == "no-such-post")).all() == []
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_hyperloglog_merges_without_double_counting()
+    test_flushes_upsert_one_row_per_post_per_day()
+    print("✅ Analytics ingestion tests passed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for batch post generation against an in-memory database
+Run: python test_batch_generation.py
+"""
+
+import os
+import sys
+import asyncio
+from contextlib import contextmanager
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, BlogPost, Monetization
+from services import batch_generation
+from services.batch_generation import BatchGenerator, items_from_topics, provider_bucket
+
+
+@contextmanager
+def rpm_env(**env):
+    """Set provider RPM variables and start from fresh buckets, restoring both afterwards"""
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    batch_generation._provider_buckets.clear()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        batch_generation._provider_buckets.clear()
+
+
+class StubEngine:
+    """Writes a post per topic after a short delay; topics containing 'fail' raise"""
+
+    provider = "stub"
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_blog_post(self, topic, niche, target_market, region, bypass_cache=False):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if "fail" in topic:
+                raise Exception("provider error")
+            return {
+                "title": topic,
+                "slug": "same-slug" if "dup" in topic else topic.lower().replace(" ", "-"),
+                "content": "<p>Body</p>",
+                "affiliate_suggestions": [{"name": "Hotel", "platform": "booking"}]
+            }
+        finally:
+            self.in_flight -= 1
+
+
+def test_batch_stores_posts_in_bulk_and_reports_failures():
+    with rpm_env(AI_RPM="60000"):
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        stub = StubEngine()
+        topics = [f"Topic {i}" for i in range(25)] + ["will fail", "dup one", "dup two"]
+        items = items_from_topics(topics, "luxury", "US", "Cape Town")
+        updates = []
+
+        generator = BatchGenerator(stub, Session, concurrency=3, batch_size=10)
+        report = asyncio.run(generator.run(items, progress=lambda r: updates.append(r.completed)))
+        summary = report.to_dict()
+
+        assert summary["succeeded"] == 27
+        assert summary["failures"] == [{"topic": "will fail", "error": "provider error"}]
+        assert stub.max_in_flight <= 3
+        assert updates[-1] == 28
+
+        db = Session()
+        try:
+            assert db.query(BlogPost).count() == 27
+            assert db.query(Monetization).count() == 27
+            slugs = [s for (s,) in db.query(BlogPost.slug).filter(BlogPost.slug.like("same-slug%"))]
+            assert len(set(slugs)) == 2
+        finally:
+            db.close()
+
+
+def test_store_errors_fail_the_batch_not_the_run():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    topics = ["Store one", "Store two", "Store three"]
+    with rpm_env():
+        generator = BatchGenerator(StubEngine(), broken_session, concurrency=3, batch_size=2, rpm=60000)
+        report = asyncio.run(generator.run(items_from_topics(topics, "luxury", "US", "Cape Town")))
+    summary = report.to_dict()
+
+    assert summary["status"] == "finished" and summary["finished_at"]
+    assert summary["succeeded"] == 0 and summary["completed"] == 3
+    assert sorted(f["topic"] for f in summary["failures"]) == sorted(topics)
+    assert {f["error"] for f in summary["failures"]} == {"database unavailable"}
+
+
+def test_rpm_argument_overrides_provider_setting():
+    with rpm_env(STUB_RPM="600"):
+        generator = BatchGenerator(StubEngine(), None, rpm=30)
+        assert generator.engine.bucket.rate == 0.5
+        assert provider_bucket("stub") is generator.engine.bucket
+
+
+if __name__ == "__main__":
+    test_batch_stores_posts_in_bulk_and_reports_failures()
+    test_store_errors_fail_the_batch_not_the_run()
+    test_rpm_argument_overrides_provider_setting()
+    print("✅ Batch generation tests passed!")
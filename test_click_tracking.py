@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script for affiliate click redirects and buffered click counting
+Install: pip install aiosqlite
+Run: python test_click_tracking.py
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'app.db')}")
+
+from sqlalchemy import select
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from models import AffiliateClick, BlogPost, Monetization
+from services.affiliate_service import AffiliateService
+from services.click_tracker import ClickTracker, LinkDirectory, click_path
+from services.publishing import Publisher
+from services.upsert import _update_then_insert
+
+
+def seed_post(post_id: str) -> list:
+    links = AffiliateService().rewrite_suggestions([
+        {"type": "hotel", "name": "Silo", "platform": "booking.com", "link": "https://www.booking.com/hotel/za/silo.html"},
+        {"type": "tour", "name": "Winelands", "platform": "Viator", "link": "https://www.viator.com/tours/x"},
+    ])
+    db = SessionLocal()
+    try:
+        db.add(BlogPost(id=post_id, title="Cape Town", slug=f"cape-town-{post_id}", content="<p>Body</p>"))
+        db.add(Monetization(blog_post_id=post_id, affiliate_links=links, conversions=3))
+        db.commit()
+    finally:
+        db.close()
+    return links
+
+
+def test_clicks_are_counted_per_post_and_provider():
+    init_db()
+    links = seed_post("post-1")
+    directory = LinkDirectory(AsyncSessionLocal)
+    tracker = ClickTracker(SessionLocal, log_dir=os.path.join(workdir, "clicks"))
+
+    async def click(link_id: str, n: int):
+        for i in range(n):
+            url, provider = await directory.resolve("post-1", link_id)
+            tracker.record("post-1", link_id, provider, f"c{i}")
+        return directory.click_url(url, provider, "abc")
+
+    async def run():
+        booking_url = await click(links[0]["id"], 20)
+        await click(links[1]["id"], 10)
+        assert booking_url.endswith("aid=7777439&label=abc")
+        assert await directory.resolve("post-1", "missing") is None
+        assert tracker.pending() == 30
+
+        assert tracker.flush() == 30
+        await click(links[0]["id"], 5)
+        assert tracker.flush() == 5
+        assert tracker.pending() == 0
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+    db = SessionLocal()
+    try:
+        monetization = db.scalar(select(Monetization).where(Monetization.blog_post_id == "post-1"))
+        assert monetization.clicks == 35
+        assert abs(monetization.conversion_rate - 3 / 35) < 1e-9
+        by_provider = dict(db.execute(
+            select(AffiliateClick.provider, AffiliateClick.clicks).where(AffiliateClick.blog_post_id == "post-1")
+        ).all())
+        assert by_provider == {"booking": 25, "viator": 10}
+    finally:
+        db.close()
+
+    log_files = os.listdir(os.path.join(workdir, "clicks"))
+    with open(os.path.join(workdir, "clicks", log_files[0])) as f:
+        events = [line.rstrip("\n").split("\t") for line in f]
+    assert len(events) == 35
+    assert events[0][1:] == ["c0", "post-1", links[0]["id"], "booking"]
+
+
+def test_published_body_links_redirect_through_tracker():
+    db = SessionLocal()
+    try:
+        db.add(BlogPost(
+            id="post-2", title="Knysna", slug="knysna-post-2",
+            content='<p>Book <a href="https://www.booking.com/hotel/za/heads.html">the Heads lodge</a>.</p>'
+        ))
+        db.add(Monetization(blog_post_id="post-2", affiliate_links=[
+            {"name": "Oyster tour", "platform": "Viator", "link": "https://www.viator.com/tours/oysters"}
+        ]))
+        db.commit()
+        directory = LinkDirectory(AsyncSessionLocal)
+
+        async def resolve(link_id):
+            target = await directory.resolve("post-2", link_id)
+            await async_engine.dispose()
+            return target
+
+        # Nothing tracked before publishing, and that is not cached
+        assert asyncio.run(resolve("anything")) is None and "post-2" not in directory._posts
+
+        publisher = Publisher()
+        post = publisher.publish(db, "post-2")
+        body_link = post.post_metadata["links"]["affiliate"][0]
+        assert f'href="{click_path("post-2", body_link["id"])}"' in post.content
+        suggestion = db.scalar(select(Monetization).where(Monetization.blog_post_id == "post-2")).affiliate_links[0]
+        assert suggestion["click_url"] == click_path("post-2", suggestion["id"])
+
+        url, provider = asyncio.run(resolve(body_link["id"]))
+        assert provider == "booking" and url.startswith("https://www.booking.com/hotel/za/heads.html?aid=")
+        assert asyncio.run(resolve(suggestion["id"]))[1] == "viator"
+
+        # Publishing again keeps the already redirected link
+        post = publisher.publish(db, "post-2")
+        assert post.post_metadata["links"]["affiliate"][0]["id"] == body_link["id"]
+        assert f'href="{click_path("post-2", body_link["id"])}"' in post.content
+    finally:
+        db.close()
+
+
+def test_portable_upsert_fallback():
+    db = SessionLocal()
+    try:
+        rows = [{"blog_post_id": "post-1", "provider": "booking", "clicks": 2},
+                {"blog_post_id": "post-1", "provider": "getyourguide", "clicks": 4}]
+        _update_then_insert(db, AffiliateClick.__table__, rows, ("blog_post_id", "provider"), ("clicks",))
+        db.commit()
+        by_provider = dict(db.execute(
+            select(AffiliateClick.provider, AffiliateClick.clicks).where(AffiliateClick.blog_post_id == "post-1")
+        ).all())
+        assert by_provider == {"booking": 27, "viator": 10, "getyourguide": 4}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_clicks_are_counted_per_post_and_provider()
+    test_published_body_links_redirect_through_tracker()
+    test_portable_upsert_fallback()
+    print("✅ Click tracking tests passed!")
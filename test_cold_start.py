@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Test script for a lazy API cold start
+Run: python test_cold_start.py
+"""
+
+from bench_startup import DEFERRED_MODULES, import_profile
+
+
+def test_read_path_does_not_load_sdks_or_smtp():
+    """Importing the app leaves provider SDKs and the SMTP stack unloaded"""
+    _, modules = import_profile()
+
+    assert "main" in modules
+    loaded = [
+        name for name in modules
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES)
+    ]
+    assert loaded == []
+
+
+if __name__ == "__main__":
+    test_read_path_does_not_load_sdks_or_smtp()
+    print("✅ Cold start tests passed!")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for pooled SMTP sending against a local stand-in server
+Install: pip install aiosmtpd
+Run: python test_email_pool.py
+"""
+
+import os
+import sys
+import socket
+from email.mime.text import MIMEText
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from local_smtp_server import LocalSMTPServer
+from models import Base
+from services.email_outbox import EmailOutbox
+from services.smtp_pool import SMTPPool
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_pool(port: int, **kwargs) -> SMTPPool:
+    return SMTPPool("127.0.0.1", port, "blog@example.com", "secret", starttls=False, **kwargs)
+
+
+def message(to_email: str) -> MIMEText:
+    msg = MIMEText("<p>Hello</p>", "html")
+    msg["Subject"] = "Test"
+    msg["From"] = "blog@example.com"
+    msg["To"] = to_email
+    return msg
+
+
+def test_bulk_send_reuses_connections():
+    """Many messages go out over a handful of logged-in connections"""
+    port = free_port()
+    emails = [f"reader{i}@example.com" for i in range(200)]
+
+    with LocalSMTPServer(port) as server:
+        pool = make_pool(port, size=4, max_messages_per_connection=1000)
+        report = pool.send_many(((e, message(e)) for e in emails), parallel=4)
+        pool.close()
+
+    assert report["sent"] == 200 and report["failed"] == 0
+    assert sorted(server.handler.recipients) == sorted(emails)
+    assert server.handler.logins <= 4
+    assert report["per_second"] > 0
+
+
+def test_rejected_recipient_does_not_stop_batch():
+    """A refused recipient is reported failed and the session keeps going"""
+    port = free_port()
+    emails = ["a@example.com", "bounce@example.com", "c@example.com"]
+
+    with LocalSMTPServer(port, reject={"bounce@example.com"}) as server:
+        pool = make_pool(port, size=1)
+        report = pool.send_many((e, message(e)) for e in emails)
+        pool.close()
+
+    assert report["results"] == {"a@example.com": True, "bounce@example.com": False, "c@example.com": True}
+    assert server.handler.logins == 1
+
+
+def test_reconnects_after_dropped_connection():
+    """A connection the server dropped is replaced transparently"""
+    port = free_port()
+
+    with LocalSMTPServer(port) as server:
+        pool = make_pool(port, size=1)
+        assert pool.send("a@example.com", message("a@example.com"))
+        # Kill the idle pooled socket behind the pool's back
+        conn, _ = pool._idle.queue[0]
+        conn.sock.shutdown(socket.SHUT_RDWR)
+        assert pool.send("b@example.com", message("b@example.com"))
+        pool.close()
+
+    assert server.handler.recipients == ["a@example.com", "b@example.com"]
+    assert server.handler.logins == 2
+
+
+def test_outbox_claims_fit_inside_the_lease():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    os.environ["EMAIL_OUTBOX_LEASE"] = "60"
+    try:
+        outbox = EmailOutbox(Session, email_service=None, rate=1, burst=1)
+    finally:
+        os.environ.pop("EMAIL_OUTBOX_LEASE")
+    # One message a second for half a 60s lease, not the default 500
+    assert outbox.claim_size == 30
+
+    emails = [f"claim{i}@example.com" for i in range(45)]
+    outbox.create_campaign("Claims", "Hello", "<p>Hi</p>", [emails[:20], emails[20:]])
+    db = Session()
+    try:
+        assert len(outbox._claim(db)) == 30
+        assert len(outbox._claim(db)) == 15
+        assert outbox._claim(db) == []
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_bulk_send_reuses_connections()
+    test_rejected_recipient_does_not_stop_batch()
+    test_reconnects_after_dropped_connection()
+    test_outbox_claims_fit_inside_the_lease()
+    print("✅ Email pool tests passed!")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Test script for provider failover and hedging with local stub providers
+Run: python test_engine_failover.py
+"""
+
+import os
+import sys
+import time
+import asyncio
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from services.content_engine_composite import CompositeContentEngine
+
+
+class StubEngine:
+    """Stands in for a provider: waits, then streams a token and a post, or fails"""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, cached: bool = False):
+        self.provider = name
+        self.delay = delay
+        self.fail = fail
+        self.cached = cached
+        self.calls = 0
+        self.cancelled = 0
+        self.closed = 0
+
+    async def stream_blog_post(self, topic, niche, target_market, region, bypass_cache=False):
+        self.calls += 1
+        try:
+            if self.cached:
+                yield {"type": "post", "post": {"title": topic, "provider": self.provider}, "cached": True}
+                return
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            if self.fail:
+                raise Exception(f"{self.provider} is down")
+            yield {"type": "token", "text": "{"}
+            yield {"type": "post", "post": {"title": topic, "provider": self.provider}}
+        finally:
+            self.closed += 1
+
+
+def generate(engine: CompositeContentEngine) -> dict:
+    return asyncio.run(engine.generate_blog_post("Kruger", "luxury", "US", "Mpumalanga"))
+
+
+def test_fails_over_to_next_provider():
+    """A failing provider is skipped and the next one answers"""
+    down, up = StubEngine("gemini", fail=True), StubEngine("anthropic")
+    engine = CompositeContentEngine({"gemini": down, "anthropic": up}, hedge=False)
+
+    assert generate(engine)["provider"] == "anthropic"
+    assert engine.get_health()["gemini"]["error_rate"] == 1.0
+
+
+def test_circuit_opens_and_recovers():
+    """An open circuit keeps a provider out until a half-open probe succeeds"""
+    down, up = StubEngine("gemini", fail=True), StubEngine("anthropic")
+    engine = CompositeContentEngine(
+        {"gemini": down, "anthropic": up}, hedge=False, failure_threshold=1, reset_timeout=0.2
+    )
+
+    assert generate(engine)["provider"] == "anthropic"
+    assert engine.get_health()["gemini"]["state"] == "open"
+
+    # While open, gemini is not tried even when the other provider fails
+    up.fail = True
+    try:
+        generate(engine)
+        assert False, "expected every provider to fail"
+    except RuntimeError:
+        pass
+    assert down.calls == 1
+
+    time.sleep(0.25)
+    down.fail = False
+    assert engine.get_health()["gemini"]["state"] == "half_open"
+    assert generate(engine)["provider"] == "gemini"
+    assert engine.get_health()["gemini"]["state"] == "closed"
+
+
+def test_half_open_circuit_lets_one_probe_through():
+    """Only one request at a time tests a recovering provider; the rest go elsewhere"""
+    slow, up = StubEngine("gemini", delay=0.2), StubEngine("anthropic")
+    engine = CompositeContentEngine(
+        {"gemini": slow, "anthropic": up}, hedge=False, failure_threshold=1, reset_timeout=0.1
+    )
+    engine.health["gemini"].record_failure()
+    # Same error rate, so gemini keeps its place at the head of the routing order
+    engine.health["anthropic"].outcomes.append(False)
+    time.sleep(0.15)
+    assert engine.get_health()["gemini"]["state"] == "half_open"
+
+    async def run():
+        names = ("Kruger", "luxury", "US", "Mpumalanga")
+        probe = asyncio.ensure_future(engine.generate_blog_post(*names))
+        await asyncio.sleep(0.05)
+        # The probe is in flight, so these skip gemini
+        others = await asyncio.gather(*(engine.generate_blog_post(*names) for _ in range(3)))
+        assert [post["provider"] for post in others] == ["anthropic"] * 3
+        assert (await probe)["provider"] == "gemini"
+
+    asyncio.run(run())
+    assert slow.calls == 1
+    assert engine.get_health()["gemini"]["state"] == "closed"
+
+
+def test_routes_to_faster_provider():
+    """With equal error rates the lower-latency provider goes first"""
+    slow, fast = StubEngine("gemini", delay=0.05), StubEngine("openai")
+    engine = CompositeContentEngine({"gemini": slow, "openai": fast}, hedge=False)
+    engine.health["gemini"].latencies.extend([0.05] * 5)
+    engine.health["openai"].latencies.extend([0.001] * 5)
+
+    assert engine.ranked() == ["openai", "gemini"]
+    assert generate(engine)["provider"] == "openai"
+    assert slow.calls == 0
+
+
+def test_hedges_when_first_token_is_late():
+    """A second request goes out past the p95 deadline and the faster one wins"""
+    stuck, backup = StubEngine("gemini", delay=5), StubEngine("anthropic", delay=0.01)
+    engine = CompositeContentEngine({"gemini": stuck, "anthropic": backup}, hedge=True)
+    # Gemini's history says the first token normally arrives within ~0.5s
+    engine.health["gemini"].latencies.extend([0.1, 0.2, 0.2, 0.3, 0.4])
+    engine.health["anthropic"].latencies.extend([1.0] * 5)
+
+    async def run():
+        events = [e async for e in engine.stream_blog_post("Kruger", "luxury", "US", "Mpumalanga")]
+        return events
+
+    events = asyncio.run(asyncio.wait_for(run(), timeout=3))
+
+    assert events[-1]["post"]["provider"] == "anthropic"
+    assert stuck.calls == 1 and stuck.cancelled == 1
+    assert engine.get_health()["gemini"]["state"] == "closed"
+
+
+def test_cache_hits_stay_out_of_health_stats():
+    engine = CompositeContentEngine({"openai": StubEngine("openai", cached=True)})
+    assert generate(engine)["provider"] == "openai"
+    health = engine.get_health()["openai"]
+    assert health["samples"] == 0 and health["p50_first_token"] is None
+    assert not engine.health["openai"].outcomes
+
+
+def test_streams_are_closed_when_abandoned():
+    provider = StubEngine("openai")
+    engine = CompositeContentEngine({"openai": provider})
+
+    async def run():
+        # The post arrives before the stream ends; the stream is closed right away, not at loop shutdown
+        await engine.generate_blog_post("Kruger", "luxury", "US", "Mpumalanga")
+        assert provider.closed == 1
+
+        stream = engine.stream_blog_post("Kruger", "luxury", "US", "Mpumalanga")
+        assert (await stream.__anext__())["type"] == "token"
+        await stream.aclose()
+        assert provider.closed == 2
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_cancels_provider_requests():
+    """Cancelling a generation while it waits for a first token stops and closes every open request"""
+    stuck, backup = StubEngine("gemini", delay=5), StubEngine("anthropic", delay=5)
+    engine = CompositeContentEngine({"gemini": stuck, "anthropic": backup}, hedge=True, hedge_after=0.01)
+
+    async def run():
+        task = asyncio.ensure_future(engine.generate_blog_post("Kruger", "luxury", "US", "Mpumalanga"))
+        # Long enough for the hedge to start the second provider
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+        assert (stuck.calls, stuck.cancelled, stuck.closed) == (1, 1, 1)
+        assert (backup.calls, backup.cancelled, backup.closed) == (1, 1, 1)
+
+    asyncio.run(asyncio.wait_for(run(), timeout=3))
+
+
+if __name__ == "__main__":
+    test_fails_over_to_next_provider()
+    test_circuit_opens_and_recovers()
+    test_half_open_circuit_lets_one_probe_through()
+    test_routes_to_faster_provider()
+    test_hedges_when_first_token_is_late()
+    test_cache_hits_stay_out_of_health_stats()
+    test_streams_are_closed_when_abandoned()
+    test_cancelled_caller_cancels_provider_requests()
+    print("✅ Provider failover tests passed!")
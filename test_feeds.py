@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed, chunked sitemaps and the RSS feed
+Install: pip install aiosqlite
+Run: python test_feeds.py
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from sqlalchemy import update
+
+from models import BlogPost
+from services.feeds import FeedService
+
+
+async def read(body) -> str:
+    if isinstance(body, bytes):
+        return body.decode()
+    return b"".join([chunk async for chunk in body]).decode()
+
+
+def test_sitemap_chunks_stream_then_cache():
+    init_db()
+    db = SessionLocal()
+    # Older than anything other tests publish, so these fill the first chunks
+    start = datetime(2001, 1, 1)
+    for i in range(7):
+        db.add(BlogPost(
+            id=f"feed-{i}", slug=f"feed-post-{i}", title=f"Feed & post {i}", content="<p>Body</p>",
+            status="published", published_at=start + timedelta(days=i)
+        ))
+    db.commit()
+
+    feeds = FeedService(AsyncSessionLocal, chunk_size=3, base_url="https://blog.example", check_interval=0)
+
+    async def run():
+        index = await read(await feeds.sitemap_index())
+        assert "<loc>https://blog.example/sitemaps/posts-1.xml</loc>" in index
+        assert "<loc>https://blog.example/sitemaps/posts-3.xml</loc>" in index
+
+        # First request streams from the cursor; the next is served from cache
+        first = await feeds.sitemap_chunk(1)
+        assert not isinstance(first, bytes)
+        text = await read(first)
+        assert text.count("<url>") == 3 and "feed-post-0/" in text and "feed-post-3/" not in text
+        assert isinstance(await feeds.sitemap_chunk(1), bytes)
+        assert await read(await feeds.sitemap_chunk(2))
+
+        # Editing a post invalidates its chunk only
+        post = db.get(BlogPost, "feed-4")
+        post.title = "Edited"
+        db.commit()
+        assert isinstance(await feeds.sitemap_chunk(1), bytes)
+        assert not isinstance(await feeds.sitemap_chunk(2), bytes)
+
+        assert await feeds.sitemap_chunk(999) is None
+
+        rss = await read(await feeds.rss())
+        assert "<title>Feed &amp; post 0</title>" in rss
+        assert isinstance(await feeds.rss(), bytes)
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    db.close()
+
+
+def test_chunk_is_rebuilt_when_its_boundaries_move():
+    init_db()
+    db = SessionLocal()
+    # Older than the posts above, with one shared updated_at and a tie on published_at
+    start, edited = datetime(1990, 1, 1), datetime(1990, 6, 1)
+    for i in range(4):
+        db.add(BlogPost(
+            id=f"bound-{i}", slug=f"bound-post-{i}", title=f"Bound {i}", content="<p>Body</p>",
+            status="published", published_at=start + timedelta(days=min(i, 2)), updated_at=edited
+        ))
+    db.commit()
+
+    feeds = FeedService(AsyncSessionLocal, chunk_size=3, base_url="https://blog.example", check_interval=0)
+
+    async def run():
+        async with AsyncSessionLocal() as session:
+            first = (await feeds.chunks(session))[0]
+        assert first[:3] == (1, 3, edited)
+        assert first[3] == (start, "bound-0") and first[4] == (start + timedelta(days=2), "bound-2")
+
+        text = await read(await feeds.sitemap_chunk(1))
+        assert [f"bound-post-{i}/" in text for i in range(4)] == [True, True, True, False]
+
+        # Same count and latest updated_at, but every post after bound-0 moves up a chunk
+        db.execute(update(BlogPost).where(BlogPost.id == "bound-0").values(status="draft", updated_at=edited))
+        db.commit()
+        rebuilt = await feeds.sitemap_chunk(1)
+        assert not isinstance(rebuilt, bytes)
+        text = await read(rebuilt)
+        assert [f"bound-post-{i}/" in text for i in range(4)] == [False, True, True, True]
+        assert text.count("<url>") == 3
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    db.close()
+
+
+if __name__ == "__main__":
+    test_sitemap_chunks_stream_then_cache()
+    test_chunk_is_rebuilt_when_its_boundaries_move()
+    print("✅ Feed tests passed!")
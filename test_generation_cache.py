@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk generation cache and how the engines use it
+Run: python test_generation_cache.py
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from services.generation_cache import GenerationCache
+
+
+def post(title: str) -> dict:
+    return {
+        "title": title, "slug": "cape-winelands", "meta_description": "", "content": "<p>Vines</p>",
+        "keywords": [], "affiliate_suggestions": []
+    }
+
+
+def make_engine(cache: GenerationCache):
+    """OpenAI engine whose completion is local, counting calls; no network involved"""
+    from services.content_engine_openai import ContentEngine
+
+    class CountingEngine(ContentEngine):
+        calls = 0
+
+        async def _complete(self, prompt):
+            self.calls += 1
+            return (
+                f'{{"title": "Winelands {self.calls}", "slug": "cape-winelands", "content": "<p>Vines</p>", '
+                '"meta_description": "", "keywords": [], "affiliate_suggestions": []}'
+            )
+
+        async def _stream(self, prompt):
+            yield await self._complete(prompt)
+
+    saved = os.environ.get("OPENAI_API_KEY")
+    os.environ["OPENAI_API_KEY"] = "test-key"
+    try:
+        return CountingEngine(cache)
+    finally:
+        if saved is None:
+            os.environ.pop("OPENAI_API_KEY")
+        else:
+            os.environ["OPENAI_API_KEY"] = saved
+
+
+def test_keys_separate_provider_model_and_prompt():
+    cache = GenerationCache(directory=tempfile.mkdtemp())
+    cache.set("openai", "gpt-4", "Write about Stellenbosch", post("base"))
+
+    assert cache.get("openai", "gpt-4", "Write about Stellenbosch")["title"] == "base"
+    assert cache.get("anthropic", "gpt-4", "Write about Stellenbosch") is None
+    assert cache.get("openai", "gpt-4o", "Write about Stellenbosch") is None
+    assert cache.get("openai", "gpt-4", "Write about Franschhoek") is None
+
+    keys = {
+        GenerationCache.key("openai", "gpt-4", "Write about Stellenbosch"),
+        GenerationCache.key("anthropic", "gpt-4", "Write about Stellenbosch"),
+        GenerationCache.key("openai", "gpt-4o", "Write about Stellenbosch"),
+        GenerationCache.key("openai", "gpt-4", "Write about Franschhoek"),
+        # Fields are not simply concatenated
+        GenerationCache.key("openai", "gpt-4Write", " about Stellenbosch"),
+    }
+    assert len(keys) == 5
+
+
+def test_entries_expire_after_ttl():
+    directory = tempfile.mkdtemp()
+    cache = GenerationCache(directory=directory, ttl=0.05)
+    cache.set("openai", "gpt-4", "Write about Stellenbosch", post("base"))
+    assert cache.get("openai", "gpt-4", "Write about Stellenbosch") is not None
+
+    time.sleep(0.06)
+    assert cache.get("openai", "gpt-4", "Write about Stellenbosch") is None
+    # The expired file is removed, not just skipped
+    assert not [name for name in os.listdir(directory) if name.endswith(".json")]
+
+
+def test_bypass_skips_the_read_but_refreshes_the_entry():
+    cache = GenerationCache(directory=tempfile.mkdtemp())
+    engine = make_engine(cache)
+    args = ("Cape Winelands", "luxury", "US", "Western Cape")
+
+    async def run():
+        first = await engine.generate_blog_post(*args)
+        assert first["title"] == "Winelands 1"
+        assert (await engine.generate_blog_post(*args))["title"] == "Winelands 1"
+        assert engine.calls == 1
+
+        # Regenerating calls the model even though an entry exists, and replaces it
+        assert (await engine.generate_blog_post(*args, bypass_cache=True))["title"] == "Winelands 2"
+        assert (await engine.generate_blog_post(*args))["title"] == "Winelands 2"
+        assert engine.calls == 2
+
+        # The streaming path follows the same rules
+        events = [e async for e in engine.stream_blog_post(*args)]
+        assert events == [{"type": "post", "post": events[0]["post"], "cached": True}]
+        assert events[0]["post"]["title"] == "Winelands 2"
+
+        events = [e async for e in engine.stream_blog_post(*args, bypass_cache=True)]
+        assert events[0]["type"] == "token" and not events[-1].get("cached")
+        assert events[-1]["post"]["title"] == "Winelands 3"
+        assert (await engine.generate_blog_post(*args))["title"] == "Winelands 3"
+        assert engine.calls == 3
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_keys_separate_provider_model_and_prompt()
+    test_entries_expire_after_ttl()
+    test_bypass_skips_the_read_but_refreshes_the_entry()
+    print("✅ Generation cache tests passed!")
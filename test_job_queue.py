@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the background generation job queue
+Run: python test_job_queue.py
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy import inspect
+
+from database import SessionLocal, init_db
+from models import GenerationJob
+from services.job_queue import GenerationQueue
+
+
+def test_jobs_run_without_holding_a_session():
+    init_db()
+    seen = []
+
+    async def handler(job):
+        # The job is a detached copy; its row already says running
+        assert inspect(job).detached
+        db = SessionLocal()
+        try:
+            seen.append(db.get(GenerationJob, job.id).status)
+        finally:
+            db.close()
+        if "fail" in job.topic:
+            raise Exception("model error")
+        return "post-123"
+
+    async def run():
+        queue = GenerationQueue(SessionLocal, handler, workers=2)
+        await queue.start()
+        ok = await queue.submit_async("Hermanus whales", "travel", "US", "Western Cape")
+        bad = await queue.submit_async("will fail", "travel", "US", "Western Cape")
+        await queue._queue.join()
+        await queue.stop()
+        return await queue.get_async(ok.id), await queue.get_async(bad.id)
+
+    ok, bad = asyncio.run(run())
+    assert seen == ["running", "running"]
+    assert ok["status"] == "succeeded" and ok["post_id"] == "post-123" and ok["attempts"] == 1
+    assert bad["status"] == "failed" and bad["error"] == "model error"
+
+
+def test_jobs_interrupted_by_shutdown_are_requeued():
+    async def run():
+        running = asyncio.Event()
+
+        async def handler(job):
+            running.set()
+            await asyncio.sleep(60)
+
+        queue = GenerationQueue(SessionLocal, handler, workers=1)
+        await queue.start()
+        job = await queue.submit_async("Tsitsikamma", "travel", "US", "Eastern Cape")
+        await asyncio.wait_for(running.wait(), timeout=5)
+        assert (await queue.get_async(job.id))["status"] == "running"
+        await queue.stop()
+        state = await queue.get_async(job.id)
+        assert state["status"] == "queued" and state["started_at"] is None
+
+        # The next start picks it up straight away, without waiting for the stale timeout
+        done = []
+
+        async def finish(job):
+            done.append(job.id)
+            return "post-456"
+
+        queue = GenerationQueue(SessionLocal, finish, workers=1)
+        await queue.start()
+        await queue._queue.join()
+        await queue.stop()
+        assert job.id in done
+        assert (await queue.get_async(job.id))["status"] == "succeeded"
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_jobs_run_without_holding_a_session()
+    test_jobs_interrupted_by_shutdown_are_requeued()
+    print("✅ Job queue tests passed!")
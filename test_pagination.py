@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for keyset pagination of the published listing
+Install: pip install httpx
+Run: python test_pagination.py
+"""
+
+import os
+import sys
+import base64
+import tempfile
+from datetime import datetime
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from fastapi.testclient import TestClient
+
+from database import SessionLocal, init_db
+from models import BlogPost
+from services.pagination import decode_cursor, encode_cursor, published_page
+
+
+def seed_ties():
+    init_db()
+    db = SessionLocal()
+    try:
+        # Five posts published at the same instant: only the id orders them
+        tied = datetime(1980, 1, 1)
+        for i in range(5):
+            db.add(BlogPost(
+                id=f"page-tie-{i}", title=f"Tie {i}", slug=f"page-tie-{i}", content="<p>Body</p>",
+                status="published", published_at=tied
+            ))
+        db.add(BlogPost(id="page-draft", title="Draft", slug="page-draft", content="<p>Body</p>", status="draft"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_ties_are_neither_skipped_nor_repeated():
+    seed_ties()
+    db = SessionLocal()
+    try:
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = published_page(db, cursor=cursor, limit=2)
+            seen.extend(post["id"] for post in page["posts"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        published = db.query(BlogPost).filter(
+            BlogPost.status == "published", BlogPost.published_at.isnot(None)
+        ).count()
+        assert len(seen) == len(set(seen)) == published
+        assert pages == -(-published // 2)
+        # Newest first, ties broken by id descending
+        assert [i for i in seen if i.startswith("page-tie-")] == [f"page-tie-{i}" for i in range(4, -1, -1)]
+        assert "page-draft" not in seen
+    finally:
+        db.close()
+
+
+def test_last_page_has_no_next_cursor():
+    db = SessionLocal()
+    try:
+        # Resume just after page-tie-2: the two older ties are the last rows of the listing
+        page = published_page(db, cursor=encode_cursor(datetime(1980, 1, 1), "page-tie-2"), limit=2)
+        assert [post["id"] for post in page["posts"]] == ["page-tie-1", "page-tie-0"]
+        assert page["next_cursor"] is None
+
+        page = published_page(db, cursor=encode_cursor(datetime(1980, 1, 1), "page-tie-0"), limit=2)
+        assert page == {"posts": [], "next_cursor": None}
+    finally:
+        db.close()
+
+
+def test_invalid_cursors_are_rejected():
+    cursor = encode_cursor(datetime(1980, 1, 1), "page-tie-2")
+    assert decode_cursor(cursor) == (datetime(1980, 1, 1), "page-tie-2")
+
+    tampered = [
+        "not-a-cursor",
+        cursor[:-3],
+        base64.urlsafe_b64encode(b'["yesterday", "page-tie-2"]').decode(),
+        base64.urlsafe_b64encode(b'{"id": "page-tie-2"}').decode(),
+    ]
+    for bad in tampered:
+        try:
+            decode_cursor(bad)
+            assert False, f"expected {bad!r} to be rejected"
+        except ValueError:
+            pass
+
+    from main import app
+    client = TestClient(app)
+    for bad in tampered:
+        response = client.get("/api/posts", params={"cursor": bad})
+        assert response.status_code == 400, (bad, response.status_code)
+        assert response.json()["detail"].startswith("Invalid cursor")
+
+
+if __name__ == "__main__":
+    test_ties_are_neither_skipped_nor_repeated()
+    test_last_page_has_no_next_cursor()
+    test_invalid_cursors_are_rejected()
+    print("✅ Pagination tests passed!")
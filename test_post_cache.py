@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the post and listing cache
+Run: python test_post_cache.py
+"""
+
+import os
+import sys
+import time
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, BlogPost
+from services.post_cache import PostCache
+
+
+class Loader:
+    """Counts how often the cache falls through to the database"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_entries_expire_after_ttl():
+    cache = PostCache(ttl=0.05)
+    load = Loader({"slug": "kruger"})
+    cache.get_post("kruger", load)
+    cache.get_post("kruger", load)
+    assert load.calls == 1
+
+    time.sleep(0.06)
+    cache.get_post("kruger", load)
+    assert load.calls == 2
+
+
+def test_least_recently_used_post_is_evicted():
+    cache = PostCache(max_size=2)
+    loads = {slug: Loader({"slug": slug}) for slug in ("a", "b", "c")}
+    cache.get_post("a", loads["a"])
+    cache.get_post("b", loads["b"])
+    cache.get_post("a", loads["a"])
+    cache.get_post("c", loads["c"])
+
+    cache.get_post("a", loads["a"])
+    cache.get_post("b", loads["b"])
+    assert (loads["a"].calls, loads["b"].calls) == (1, 2)
+    assert cache.stats()["size"] == 2
+
+
+def test_listings_are_bounded_apart_from_posts():
+    cache = PostCache(max_size=10, max_listings=2)
+    post = Loader({"slug": "kruger"})
+    cache.get_post("kruger", post)
+
+    # Every client-supplied cursor is a new key; they only push out each other
+    for cursor in ("c1", "c2", "c3"):
+        cache.get_listing(cursor, 20, Loader({"posts": []}))
+    stats = cache.stats()
+    assert stats["listings"] == 2 and stats["size"] == 1
+    cache.get_post("kruger", post)
+    assert post.calls == 1
+
+    # Page sizes outside the standard set are never cached
+    odd = Loader({"posts": []})
+    cache.get_listing(None, 7, odd)
+    cache.get_listing(None, 7, odd)
+    assert odd.calls == 2 and cache.stats()["listings"] == 2
+
+
+def test_hit_and_miss_counters():
+    cache = PostCache()
+    load = Loader({"slug": "kruger"})
+    cache.get_post("kruger", load)
+    cache.get_post("kruger", load)
+    cache.get_post("kruger", load)
+    # Missing posts count as misses and are not cached
+    cache.get_post("missing", Loader(None))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 2, 0.5)
+
+
+def test_commits_invalidate_and_rollbacks_do_not():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    commits = []
+    cache = PostCache()
+    cache.watch(Session, on_invalidate=lambda: commits.append(True))
+
+    db = Session()
+    try:
+        db.add(BlogPost(id="cache-1", title="Kruger", slug="cache-kruger", content="<p>One</p>"))
+        db.commit()
+        commits.clear()
+
+        load, listing = Loader({"slug": "cache-kruger"}), Loader({"posts": []})
+        cache.get_post("cache-kruger", load)
+        cache.get_listing(None, 20, listing)
+
+        # A rolled-back edit leaves the cache alone
+        db.get(BlogPost, "cache-1").content = "<p>Draft</p>"
+        db.flush()
+        db.rollback()
+        cache.get_post("cache-kruger", load)
+        cache.get_listing(None, 20, listing)
+        assert (load.calls, listing.calls) == (1, 1) and not commits
+
+        # A committed edit drops the post and every listing page
+        db.get(BlogPost, "cache-1").content = "<p>Two</p>"
+        db.commit()
+        cache.get_post("cache-kruger", load)
+        cache.get_listing(None, 20, listing)
+        assert (load.calls, listing.calls) == (2, 2) and commits == [True]
+
+        # Views are not a watched field
+        db.get(BlogPost, "cache-1").views = 10
+        db.commit()
+        cache.get_post("cache-kruger", load)
+        assert load.calls == 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_entries_expire_after_ttl()
+    test_least_recently_used_post_is_evicted()
+    test_listings_are_bounded_apart_from_posts()
+    test_hit_and_miss_counters()
+    test_commits_invalidate_and_rollbacks_do_not()
+    print("✅ Post cache tests passed!")
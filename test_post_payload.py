@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for pre-compressed post payloads and conditional GETs
+Run: python test_post_payload.py
+"""
+
+import os
+import sys
+import gzip
+import json
+import asyncio
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from database import SessionLocal, init_db
+from models import BlogPost, PostPayload
+from services.post_payload import RenderedPost, preferred_encoding
+from services.publishing import Publisher
+
+
+def test_publish_stores_compressed_payload():
+    init_db()
+    db = SessionLocal()
+    try:
+        db.add(BlogPost(id="payload-post", title="Karoo Stars", slug="payload-karoo", content="<p>Night sky</p>" * 500))
+        db.commit()
+
+        post = Publisher().publish(db, "payload-post")
+        row = db.get(PostPayload, "payload-post")
+        assert row.source_updated_at == post.updated_at
+
+        rendered = RenderedPost.from_row(row, post.slug)
+        document = json.loads(gzip.decompress(rendered.bodies["gzip"]))
+        assert document["slug"] == "payload-karoo" and document["content"] == post.content
+        assert len(rendered.bodies["gzip"]) < len(rendered.bodies[None]) / 10
+    finally:
+        db.close()
+
+
+def test_conditional_requests():
+    db = SessionLocal()
+    try:
+        rendered = RenderedPost.from_row(db.get(PostPayload, "payload-post"), "payload-karoo")
+    finally:
+        db.close()
+
+    body, headers = rendered.select("gzip, deflate, br")
+    assert headers["Content-Encoding"] == ("br" if "br" in rendered.bodies else "gzip")
+    assert body is rendered.bodies[headers["Content-Encoding"]]
+    assert headers["Vary"] == "Accept-Encoding"
+    assert preferred_encoding("gzip;q=0, identity", rendered.bodies) is None
+
+    # Any encoding's tag for this version revalidates; another version's does not
+    assert rendered.not_modified(headers["ETag"], None)
+    assert rendered.not_modified(f'W/"{rendered.etag}-gz", "other"', None)
+    assert not rendered.not_modified('"0123456789abcdef0123"', None)
+
+    assert rendered.not_modified(None, headers["Last-Modified"])
+    assert not rendered.not_modified(None, "Mon, 01 Jan 2001 00:00:00 GMT")
+    # If-None-Match wins over If-Modified-Since
+    assert not rendered.not_modified('"stale"', headers["Last-Modified"])
+
+
+def test_view_count_travels_in_a_header():
+    import httpx
+    from database import async_engine
+    from main import app, view_counter
+
+    init_db()
+    db = SessionLocal()
+    try:
+        db.add(BlogPost(id="payload-views", title="Cederberg", slug="payload-cederberg", content="<p>Rock art</p>", views=4))
+        db.commit()
+        Publisher().publish(db, "payload-views")
+    finally:
+        db.close()
+
+    async def run():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            first = await client.get("/api/posts/payload-cederberg")
+            assert first.status_code == 200
+            # The body is the cacheable document, without the ever-changing count
+            assert "views" not in first.json()
+            assert first.headers["X-View-Count"] == "5"
+
+            second = await client.get("/api/posts/payload-cederberg", headers={"If-None-Match": first.headers["ETag"]})
+            assert second.status_code == 304 and second.headers["X-View-Count"] == "6"
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    view_counter.flush()
+
+if __name__ == "__main__":
+    test_publish_stores_compressed_payload()
+    test_conditional_requests()
+    test_view_count_travels_in_a_header()
+    print("✅ Post payload tests passed!")
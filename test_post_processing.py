@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the post-processing pipeline run at generation and publish time
+Run: python test_post_processing.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from database import SessionLocal, init_db
+from models import BlogPost
+from services.affiliate_service import link_id
+from services.batch_generation import post_values
+from services.click_tracker import click_path
+from services.post_processing import ContentPipeline
+from services.publishing import Publisher
+
+HTML = """
+<html><body>
+<h2>Where to stay</h2>
+<p onclick="steal()">Stay in <a href="https://www.booking.com/hotel/za/karoo.html?a=1&amp;b=2">a Karoo farmhouse</a>
+for a few quiet nights under the stars.</p>
+<script>alert("x")</script>
+<img src="https://cdn.example/karoo.jpg" alt="Karoo" onerror="steal()">
+<h3>Where to stay</h3>
+<p>Read <a href="/posts/route-62/">Route 62</a> or <a href="javascript:steal()">this</a>,
+or see <a href="https://www.sanparks.org/">SANParks</a>.</p>
+<iframe src="https://www.youtube.com/embed/abc123"></iframe>
+<iframe src="https://evil.example/frame"><p>hidden</p></iframe>
+<h2 id="getting-there">Getting <em>there</em></h2>
+<p>Unclosed <strong>bold
+</body></html>
+"""
+
+
+def test_single_pass_processing():
+    result = ContentPipeline().process(HTML)
+    content, metadata = result["content"], result["metadata"]
+
+    # Sanitized
+    assert "<script" not in content and "alert" not in content
+    assert "onclick" not in content and "onerror" not in content
+    assert "javascript:" not in content and "evil.example" not in content and "hidden" not in content
+    assert "<html>" not in content and "<body>" not in content
+    assert "<strong>bold\n</strong></p>" in content
+    assert 'href="https://www.booking.com/hotel/za/karoo.html?a=1&amp;b=2"' in content
+
+    # Headings get anchors, duplicates stay unique, existing ids are kept
+    assert metadata["toc"] == [
+        {"level": 2, "id": "where-to-stay", "title": "Where to stay"},
+        {"level": 3, "id": "where-to-stay-2", "title": "Where to stay"},
+        {"level": 2, "id": "getting-there", "title": "Getting there"},
+    ]
+    assert '<h3 id="where-to-stay-2">' in content
+
+    assert metadata["word_count"] > 20 and metadata["reading_time"] == 1
+    links = metadata["links"]
+    assert links["outbound"] == ["https://www.sanparks.org/"]
+    assert links["internal"] == 1
+    assert links["affiliate"] == [{
+        "id": link_id("https://www.booking.com/hotel/za/karoo.html?a=1&b=2"),
+        "url": "https://www.booking.com/hotel/za/karoo.html?a=1&b=2", "provider": "booking", "text": "a Karoo farmhouse"
+    }]
+    assert 'rel="noopener sponsored"' in content
+
+    assert result["image_urls"] == ["https://cdn.example/karoo.jpg"]
+    assert result["video_urls"] == ["https://www.youtube.com/embed/abc123"]
+    assert result["summary"].startswith("Stay in a Karoo farmhouse for a few quiet nights")
+
+
+def test_generation_and_publish_store_derived_fields():
+    init_db()
+    values = post_values("Karoo stays", {"title": "Karoo stays", "slug": "processing-karoo", "content": HTML})
+    assert values["excerpt"].startswith("Stay in a Karoo farmhouse")
+    assert values["post_metadata"]["reading_time"] == 1
+    assert "<script" not in values["content"]
+
+    db = SessionLocal()
+    db.add(BlogPost(**values))
+    db.commit()
+
+    post = Publisher().publish(db, values["id"])
+    assert post.status == "published"
+    # Recomputed after the affiliate rewrite; body links go through the click redirect
+    affiliate = post.post_metadata["links"]["affiliate"]
+    assert len(affiliate) == 1 and "aid=" in affiliate[0]["url"]
+    assert f'href="{click_path(post.id, affiliate[0]["id"])}"' in post.content
+    assert post.image_urls == ["https://cdn.example/karoo.jpg"]
+    db.close()
+
+
+if __name__ == "__main__":
+    test_single_pass_processing()
+    test_generation_and_publish_store_derived_fields()
+    print("✅ Post processing tests passed!")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for read-replica routing with SQLite files standing in for Postgres
+Install: pip install aiosqlite
+Run: python test_replica_router.py
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'app.db')}")
+
+from sqlalchemy import select
+
+from database import ReplicaRouter, build_async_engine
+from models import Base, ReplicaHeartbeat
+
+
+async def make_router():
+    primary = build_async_engine(f"sqlite:///{os.path.join(workdir, 'primary.db')}")
+    replica = build_async_engine(f"sqlite:///{os.path.join(workdir, 'replica.db')}")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    return ReplicaRouter(primary, {"replica1": replica}, max_lag=5, check_interval=60), replica
+
+
+async def replicate(replica, beat_at: datetime) -> None:
+    """Stand-in for replication: copy the heartbeat as of `beat_at`"""
+    table = ReplicaHeartbeat.__table__
+    async with replica.begin() as conn:
+        await conn.execute(table.delete())
+        await conn.execute(table.insert().values(id="primary", beat_at=beat_at))
+
+
+async def bound_to(router: ReplicaRouter) -> str:
+    async with router.read_session() as db:
+        url = str(db.bind.url)
+    return "replica" if "replica.db" in url else "primary"
+
+
+def test_reads_follow_replica_lag():
+    async def run():
+        router, replica = await make_router()
+
+        # Replica has never seen a heartbeat: reads stay on the primary
+        await router.check()
+        assert router.lag["replica1"] is None
+        assert await bound_to(router) == "primary"
+        assert router.fallbacks == 1
+
+        # Caught up: reads move to the replica
+        async with router._sessions["primary"]() as db:
+            beat = await db.scalar(select(ReplicaHeartbeat.beat_at))
+        await replicate(replica, beat)
+        await router.check()
+        assert await bound_to(router) == "replica"
+
+        # Falls too far behind: back to the primary
+        await replicate(replica, datetime.utcnow() - timedelta(seconds=30))
+        await router.check()
+        assert router.lag["replica1"] > 5
+        assert await bound_to(router) == "primary"
+
+        # Just after a write, caught-up replicas are skipped until max_lag has passed
+        await replicate(replica, datetime.utcnow())
+        await router.check()
+        router.prefer_primary()
+        assert await bound_to(router) == "primary"
+        router._primary_until = 0.0
+        assert await bound_to(router) == "replica"
+
+        stats = router.stats()
+        assert stats["replica1"]["routed_reads"] == 2
+        assert stats["primary"]["routed_reads"] == 3
+        assert stats["primary_after_write"] == 1
+        assert "checked_out" in stats["primary"]["pool"]
+        await router.stop()
+        await router.primary.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_reads_follow_replica_lag()
+    print("✅ Replica routing tests passed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for validating generated posts
+Run: python test_response_parser.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from services.response_parser import (
+    JSONObjectScanner, extract_post_fields, missing_fields, parse_post_response, validate_post
+)
+
+POST = {
+    "title": "Garden Route", "slug": "garden-route", "meta_description": "Coast road",
+    "content": '<p>Pack {snacks} and "layers" for the {coast}}</p>', "keywords": ["knysna"],
+    "affiliate_suggestions": []
+}
+
+
+def test_post_is_found_in_fences_and_prose():
+    body = json.dumps(POST, indent=2)
+    for text in (
+        f"```json\n{body}\n```",
+        f"Sure! Here is your post:\n{body}\nLet me know if you want changes {{or not}}.",
+    ):
+        assert extract_post_fields(text) == POST, text
+
+    assert extract_post_fields("no JSON here") == {}
+
+
+def test_braces_inside_strings_do_not_close_the_object():
+    scanner = JSONObjectScanner()
+    text = json.dumps(POST)
+    # Fed in small pieces, as a stream arrives
+    closed = [scanner.feed(text[i:i + 7]) for i in range(0, len(text), 7)]
+    assert closed[-1] and not any(closed[:-1])
+    assert json.loads(scanner.text) == POST
+
+    scanner = JSONObjectScanner()
+    scanner.feed('{"content": "a \\"quoted\\" } brace", "slug": "x"} trailing }')
+    assert scanner.complete and json.loads(scanner.text) == {"content": 'a "quoted" } brace', "slug": "x"}
+
+
+def test_truncated_response_keeps_complete_fields():
+    text = json.dumps(POST)
+    cut = text[:text.index('"content"') + 20]
+    fields = extract_post_fields(f"```json\n{cut}")
+    assert fields == {"title": "Garden Route", "slug": "garden-route", "meta_description": "Coast road"}
+    assert missing_fields(fields) == ["content", "keywords", "affiliate_suggestions"]
+
+
+def test_missing_fields_are_requested_once():
+    text = json.dumps(POST)
+    cut = text[:text.index('"keywords"')]
+    prompts = []
+
+    async def complete(prompt):
+        prompts.append(prompt)
+        # Fields it was not asked for are ignored
+        return json.dumps({"keywords": ["plett"], "affiliate_suggestions": [], "title": "Other"})
+
+    post = asyncio.run(parse_post_response(cut, "Write about the Garden Route", complete))
+    assert len(prompts) == 1
+    assert prompts[0].startswith("Write about the Garden Route")
+    assert 'titled "Garden Route"' in prompts[0] and "keywords, affiliate_suggestions" in prompts[0]
+    assert post["title"] == "Garden Route" and post["keywords"] == ["plett"]
+
+    # Nothing usable is a failure, not a follow-up
+    async def unexpected(prompt):
+        raise AssertionError("no follow-up expected")
+
+    try:
+        asyncio.run(parse_post_response("I cannot help with that.", "prompt", unexpected))
+        assert False, "expected a validation error"
+    except ValueError:
+        pass
+
+    # A follow-up that still lacks required fields fails validation
+    async def unhelpful(prompt):
+        return "Sorry."
+
+    try:
+        asyncio.run(parse_post_response(text[:text.index('"content"')], "prompt", unhelpful))
+        assert False, "expected a validation error"
+    except ValueError as e:
+        assert "content" in str(e)
+
+
+def test_bad_suggestions_do_not_fail_the_post():
+    post = validate_post({
+        "title": "Garden Route", "slug": "garden-route", "content": "<p>Coast</p>",
+        "affiliate_suggestions": [
+            {"platform": "Viator", "link": "https://www.viator.com/tours/x"},
+            {"name": "Lodge", "platform": "booking.com"},
+            "not an object",
+            {"name": ["wrong", "type"]},
+        ]
+    })
+    assert [s["platform"] for s in post["affiliate_suggestions"]] == ["Viator", "booking.com"]
+    assert post["affiliate_suggestions"][0]["name"] == ""
+
+    assert validate_post({
+        "title": "Karoo", "slug": "karoo", "content": "<p>Stars</p>", "affiliate_suggestions": "none"
+    })["affiliate_suggestions"] == []
+
+
+if __name__ == "__main__":
+    test_bad_suggestions_do_not_fail_the_post()
+    test_post_is_found_in_fences_and_prose()
+    test_braces_inside_strings_do_not_close_the_object()
+    test_truncated_response_keeps_complete_fields()
+    test_missing_fields_are_requested_once()
+    print("✅ Response parser tests passed!")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for post search: the in-process index on SQLite and the Postgres query
+Install: pip install aiosqlite
+Run: python test_search.py
+"""
+
+import os
+import sys
+import asyncio
+import tempfile
+from datetime import datetime, timedelta
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy.dialects import postgresql
+
+from database import SessionLocal, AsyncSessionLocal, async_engine, init_db
+from models import BlogPost
+from services.search import PostSearch, search_query
+
+
+def add_post(db, slug: str, title: str, content: str, keywords=None, status="published", age=0):
+    post = BlogPost(
+        id=f"search-{slug}", slug=f"search-{slug}", title=title, content=content, keywords=keywords or [],
+        status=status, published_at=datetime.utcnow() - timedelta(days=age)
+    )
+    db.add(post)
+    return post
+
+
+def test_fallback_ranks_and_highlights():
+    init_db()
+    db = SessionLocal()
+    add_post(db, "safari-guide", "Kruger Safari Guide", "<p>Spotting the big five on a self-drive safari.</p>")
+    add_post(db, "cape-town", "Cape Town in Winter", "<p>Rainy days, wine and a short safari nearby.</p>", age=1)
+    add_post(db, "garden-route", "Garden Route", "<p>Whales and forests.</p>", keywords=["safari"], age=2)
+    add_post(db, "draft-safari", "Safari Draft", "<p>safari safari</p>", status="draft")
+    db.commit()
+
+    search = PostSearch()
+
+    async def run():
+        async with AsyncSessionLocal() as adb:
+            found = await search.search(adb, "safari")
+            slugs = [r["slug"] for r in found["results"] if r["slug"].startswith("search-")]
+            # Title beats keywords beats body text; drafts never match
+            assert slugs == ["search-safari-guide", "search-garden-route", "search-cape-town"]
+            assert "<mark>safari</mark>" in found["results"][0]["snippet"]
+
+            assert [r["slug"] for r in (await search.search(adb, "Safari wine"))["results"]] == ["search-cape-town"]
+            assert (await search.search(adb, "penguins"))["results"] == []
+
+            # Publishing and edits are picked up on the next search
+            post = db.get(BlogPost, "search-draft-safari")
+            post.status = "published"
+            post.content = "<p>Penguins at Boulders Beach.</p>"
+            db.commit()
+            assert [r["slug"] for r in (await search.search(adb, "penguins"))["results"]] == ["search-draft-safari"]
+        await async_engine.dispose()
+
+    asyncio.run(run())
+    db.close()
+
+
+def test_postgres_query_uses_tsvector_index():
+    sql = str(search_query("kruger safari", limit=5).compile(dialect=postgresql.dialect()))
+    assert "blog_posts.search_vector @@ websearch_to_tsquery" in sql
+    assert "ts_rank_cd(blog_posts.search_vector" in sql
+    # Snippets are computed over the ranked page only
+    assert sql.index("ts_headline") < sql.index("LIMIT")
+
+
+if __name__ == "__main__":
+    test_fallback_ranks_and_highlights()
+    test_postgres_query_uses_tsvector_index()
+    print("✅ Search tests passed!")
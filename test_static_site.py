@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for static pre-rendering of the public site
+Run: python test_static_site.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from database import SessionLocal, init_db
+from models import BlogPost
+from services.batch_generation import post_slug
+from services.static_site import StaticSiteBuilder, post_dir
+
+
+def test_incremental_builds():
+    init_db()
+    db = SessionLocal()
+    now = datetime.utcnow()
+    for i in range(5):
+        db.add(BlogPost(
+            id=f"static-{i}", slug=f"static-post-{i}", title=f"Route 62 <part {i}>", content=f"<p>Stop {i}</p>",
+            status="published", published_at=now - timedelta(hours=i)
+        ))
+    db.commit()
+
+    out = tempfile.mkdtemp()
+    builder = StaticSiteBuilder(SessionLocal, out_dir=out, base_url="https://blog.example", workers=2, page_size=2)
+
+    first = builder.build()
+    assert first["rendered"] >= 5
+    with open(os.path.join(out, "posts", "static-post-0", "index.html")) as f:
+        page = f.read()
+    assert "<h1>Route 62 &lt;part 0&gt;</h1>" in page and "<p>Stop 0</p>" in page
+    assert '<link rel="canonical" href="https://blog.example/posts/static-post-0/">' in page
+    for path in ("index.html", "rss.xml", "sitemap.xml"):
+        assert os.path.exists(os.path.join(out, path))
+    with open(os.path.join(out, "sitemap.xml")) as f:
+        assert "<loc>https://blog.example/sitemaps/posts-1.xml</loc>" in f.read()
+    with open(os.path.join(out, "sitemaps", "posts-1.xml")) as f:
+        assert "<loc>https://blog.example/posts/static-post-4/</loc>" in f.read()
+
+    assert builder.build()["rendered"] == 0
+
+    # One edit, one unpublish: only the edited page is rendered again
+    post = db.get(BlogPost, "static-1")
+    post.content = "<p>Stop 1, revised</p>"
+    db.get(BlogPost, "static-2").status = "draft"
+    db.commit()
+    db.close()
+
+    second = builder.build()
+    assert second["rendered"] == 1 and second["removed"] == 1
+    with open(os.path.join(out, "posts", "static-post-1", "index.html")) as f:
+        assert "revised" in f.read()
+    assert not os.path.exists(os.path.join(out, "posts", "static-post-2"))
+
+
+def test_slugs_cannot_escape_the_output_tree():
+    assert post_slug("Karoo", {"slug": "../../etc"}) == "etc"
+    assert post_slug("Karoo Stars", {"slug": "/"}) == "karoo-stars"
+    assert post_slug("Route 62", {"slug": "Route 62: Wine & Ostriches!"}) == "route-62-wine-ostriches"
+
+    out = tempfile.mkdtemp()
+    for slug in ("..", "../..", "", "/etc", "a/b"):
+        try:
+            post_dir(out, slug)
+        except ValueError:
+            continue
+        raise AssertionError(f"{slug!r} was accepted")
+    assert post_dir(out, "karoo").endswith(os.path.join("posts", "karoo"))
+
+    # Legacy rows with unsafe slugs are skipped, and nothing outside posts/ is touched
+    db = SessionLocal()
+    db.add(BlogPost(id="static-bad", slug="..", title="Bad", content="<p>x</p>",
+                    status="published", published_at=datetime.utcnow()))
+    db.commit()
+    builder = StaticSiteBuilder(SessionLocal, out_dir=out, base_url="https://blog.example", workers=1)
+    builder.build()
+    # ".." would have written the post over the site's own index.html
+    with open(os.path.join(out, "index.html")) as f:
+        assert "<h1>Bad</h1>" not in f.read()
+    assert os.path.isdir(os.path.join(out, "posts"))
+    db.get(BlogPost, "static-bad").status = "draft"
+    db.commit()
+    db.close()
+    builder.build()
+    assert os.path.isdir(os.path.join(out, "posts")) and os.path.exists(os.path.join(out, "index.html"))
+
+
+if __name__ == "__main__":
+    test_incremental_builds()
+    test_slugs_cannot_escape_the_output_tree()
+    print("✅ Static site tests passed!")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the dashboard stats rollup
+Run: python test_stats.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import SessionLocal, init_db
+from models import Analytics, Base, BlogPost, EmailSubscriber, Monetization, StatsRollup
+from services.stats import ROLLUP_ID, StatsService, compute_stats
+
+
+def empty_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_empty_database_is_all_zeros():
+    db = empty_session()
+    try:
+        assert compute_stats(db) == {
+            "total_posts": 0, "total_views": 0, "total_subscribers": 0,
+            "affiliate_clicks": 0, "affiliate_conversions": 0,
+            "affiliate_revenue": 0.0, "estimated_revenue": 0.0, "daily_views": []
+        }
+    finally:
+        db.close()
+
+
+def test_figures_match_the_seeded_rows():
+    db = empty_session()
+    now = datetime.utcnow()
+    try:
+        db.add_all([
+            BlogPost(id="s-1", title="One", slug="s-1", content="<p>1</p>", status="published", views=120),
+            BlogPost(id="s-2", title="Two", slug="s-2", content="<p>2</p>", status="published", views=30),
+            # Drafts count towards neither posts nor views
+            BlogPost(id="s-3", title="Three", slug="s-3", content="<p>3</p>", status="draft", views=999),
+            BlogPost(id="s-4", title="Four", slug="s-4", content="<p>4</p>", status="draft"),
+            EmailSubscriber(email="a@example.com"),
+            EmailSubscriber(email="b@example.com"),
+            EmailSubscriber(email="c@example.com", is_active=False),
+            Monetization(blog_post_id="s-1", clicks=10, conversions=2, actual_revenue=12.5, estimated_revenue=20),
+            Monetization(blog_post_id="s-3", clicks=5, conversions=1, actual_revenue=2.25, estimated_revenue=4.5),
+            Analytics(blog_post_id="s-1", date=now - timedelta(days=2), views=7),
+            Analytics(blog_post_id="s-2", date=now - timedelta(days=2), views=3),
+            Analytics(blog_post_id="s-1", date=now - timedelta(days=1), views=4),
+            # Outside the 30-day window
+            Analytics(blog_post_id="s-1", date=now - timedelta(days=45), views=50),
+        ])
+        db.commit()
+
+        stats = compute_stats(db)
+        assert stats["total_posts"] == 2
+        assert stats["total_views"] == 150
+        assert stats["total_subscribers"] == 2
+        assert (stats["affiliate_clicks"], stats["affiliate_conversions"]) == (15, 3)
+        assert (stats["affiliate_revenue"], stats["estimated_revenue"]) == (14.75, 24.5)
+        assert stats["daily_views"] == [
+            {"date": str((now - timedelta(days=2)).date()), "views": 10},
+            {"date": str((now - timedelta(days=1)).date()), "views": 4},
+        ]
+        assert compute_stats(db, days=60)["daily_views"][0] == {
+            "date": str((now - timedelta(days=45)).date()), "views": 50
+        }
+    finally:
+        db.close()
+
+
+def test_concurrent_first_refresh():
+    init_db()
+    db = SessionLocal()
+    db.query(StatsRollup).delete()
+    db.commit()
+    db.close()
+
+    def racing_session():
+        session = SessionLocal()
+
+        # Another worker inserts the rollup row just before this one commits
+        @event.listens_for(session, "before_commit", once=True)
+        def insert_first(s):
+            other = SessionLocal()
+            other.add(StatsRollup(id=ROLLUP_ID, total_posts=-1))
+            other.commit()
+            other.close()
+
+        return session
+
+    stats = StatsService(racing_session).refresh()
+    db = SessionLocal()
+    try:
+        rollup = db.get(StatsRollup, ROLLUP_ID)
+        assert rollup.total_posts == stats["total_posts"] >= 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_empty_database_is_all_zeros()
+    test_figures_match_the_seeded_rows()
+    test_concurrent_first_refresh()
+    print("✅ Stats tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the Server-Sent Events generation endpoint
+Install: pip install httpx
+Run: python test_streaming.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from fastapi.testclient import TestClient
+
+import main
+from database import SessionLocal, init_db
+from models import BlogPost
+
+
+class StubEngine:
+    """Streams the given token texts, then the post or the error"""
+
+    provider = "stub"
+
+    def __init__(self, tokens, post=None, error=None):
+        self.tokens = tokens
+        self.post = post
+        self.error = error
+        self.bypass_cache = None
+
+    async def stream_blog_post(self, topic, niche, target_market, region, bypass_cache=False):
+        self.bypass_cache = bypass_cache
+        for text in self.tokens:
+            await asyncio.sleep(0)
+            yield {"type": "token", "text": text}
+        if self.error:
+            raise self.error
+        yield {"type": "post", "post": self.post}
+
+
+def read_events(engine, **params):
+    """Call the endpoint with `engine` in place and split the body into (event, data) frames"""
+    saved = main.content_engine
+    main.content_engine = engine
+    try:
+        response = TestClient(main.app).get("/api/posts/generate/stream", params={"topic": "Tsitsikamma", **params})
+    finally:
+        main.content_engine = saved
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    body = response.text
+    assert body.endswith("\n\n")
+
+    frames = []
+    for frame in body[:-2].split("\n\n"):
+        event, data = frame.split("\n")
+        assert event.startswith("event: ") and data.startswith("data: ")
+        frames.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return frames
+
+
+def test_tokens_then_done_with_the_saved_post():
+    init_db()
+    post = {
+        "title": "Tsitsikamma canopy", "slug": "sse-tsitsikamma", "content": "<p>Forest\n\nand sea</p>",
+        "affiliate_suggestions": []
+    }
+    engine = StubEngine(['{"title": ', '"Tsitsikamma\\n\\ncanopy"'], post=post)
+    frames = read_events(engine, regenerate="true")
+
+    # Newlines in token text stay inside the JSON and never break the framing
+    assert frames[:2] == [("token", {"text": '{"title": '}), ("token", {"text": '"Tsitsikamma\\n\\ncanopy"'})]
+    assert [name for name, _ in frames] == ["token", "token", "done"]
+    assert engine.bypass_cache is True
+
+    done = frames[-1][1]
+    assert done["title"] == "Tsitsikamma canopy" and done["slug"] == "sse-tsitsikamma"
+    db = SessionLocal()
+    try:
+        saved = db.get(BlogPost, done["post_id"])
+        assert saved is not None and saved.slug == "sse-tsitsikamma"
+    finally:
+        db.close()
+
+
+def test_mid_stream_failure_ends_with_an_error_event():
+    engine = StubEngine(["{", '"title"'], error=RuntimeError("provider dropped the connection"))
+    frames = read_events(engine)
+
+    assert [name for name, _ in frames] == ["token", "token", "error"]
+    assert frames[-1][1] == {"detail": "provider dropped the connection"}
+    assert engine.bypass_cache is False
+
+
+if __name__ == "__main__":
+    test_tokens_then_done_with_the_saved_post()
+    test_mid_stream_failure_ends_with_an_error_event()
+    print("✅ Streaming endpoint tests passed!")
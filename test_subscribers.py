@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming subscriber emails in chunks
+Run: python test_subscribers.py
+"""
+
+import os
+import sys
+from datetime import datetime
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models import Base, EmailSubscriber
+from services.subscribers import stream_active_emails
+
+
+def test_every_active_subscriber_once_across_chunks():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+
+    # Everyone signed up at the same instant, so no column but the email tells rows apart
+    signed_up = datetime(2024, 1, 1)
+    active = [f"reader{i:02d}@example.com" for i in range(23)]
+    db.add_all(EmailSubscriber(email=email, subscribed_at=signed_up) for email in active)
+    db.add_all(
+        EmailSubscriber(email=f"gone{i}@example.com", subscribed_at=signed_up, is_active=False)
+        for i in range(5)
+    )
+    db.commit()
+
+    try:
+        chunks = list(stream_active_emails(db, chunk_size=4))
+        assert [len(chunk) for chunk in chunks] == [4] * 5 + [3]
+        emails = [email for chunk in chunks for email in chunk]
+        assert len(emails) == len(set(emails)) == 23
+        assert set(emails) == set(active)
+
+        # A chunk size that divides the list exactly leaves no empty trailing chunk
+        assert [len(chunk) for chunk in stream_active_emails(db, chunk_size=23)] == [23]
+        (whole,) = stream_active_emails(db, chunk_size=1000)
+        assert sorted(whole) == sorted(active)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_every_active_subscriber_once_across_chunks()
+    print("✅ Subscriber streaming tests passed!")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for buffered view counting
+Run: python test_view_counter.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Repo root for the top-level modules, backend for the services package
+root_path = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [root_path, os.path.join(root_path, 'backend')]
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from database import SessionLocal, init_db
+from models import BlogPost, PostPayload
+from services.publishing import Publisher
+from services.view_counter import ViewCounter
+
+
+def test_flush_keeps_updated_at():
+    init_db()
+    db = SessionLocal()
+    try:
+        db.add(BlogPost(id="views-post", title="Cederberg", slug="views-cederberg", content="<p>Rock art</p>"))
+        db.commit()
+        post = Publisher().publish(db, "views-post")
+        published_at = post.updated_at
+
+        counter = ViewCounter(SessionLocal)
+        counter.increment("views-cederberg", 3)
+        assert counter.flush() == 3
+
+        db.expire_all()
+        post = db.get(BlogPost, "views-post")
+        assert post.views == 3
+        # A view is not an edit: the stored payload still matches the row
+        assert post.updated_at == published_at
+        assert db.get(PostPayload, "views-post").source_updated_at == post.updated_at
+    finally:
+        db.close()
+
+
+def test_total_never_goes_backwards():
+    counter = ViewCounter(SessionLocal)
+    counter.observe("views-cederberg", 3)
+    counter.increment("views-cederberg", 2)
+    assert counter.total("views-cederberg") == 5
+
+    # While a flush is in progress the drained views still count
+    drained = counter._drain()
+    assert counter.pending("views-cederberg") == 0 and counter.total("views-cederberg") == 5
+    counter._settle(drained, committed=True)
+    assert counter.total("views-cederberg") == 5
+
+    # A reload from a lagging replica does not lower the count
+    counter.observe("views-cederberg", 3)
+    assert counter.total("views-cederberg") == 5
+
+    # A real flush is folded into the stored total
+    counter.increment("views-cederberg")
+    assert counter.flush() == 1
+    assert counter.total("views-cederberg") == 6
+
+
+if __name__ == "__main__":
+    test_flush_keeps_updated_at()
+    test_total_never_goes_backwards()
+    print("✅ View counter tests passed!")